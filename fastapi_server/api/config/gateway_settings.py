@@ -0,0 +1,238 @@
+# File: api/config/gateway_settings.py
+
+import os
+from dataclasses import dataclass
+
+
+def container_setting(name: str, model_id: str, default: str) -> str:
+    """
+    Per-container override first (e.g. ADMISSION_MAX_IN_FLIGHT_LOCAL_GPU),
+    then the global setting (ADMISSION_MAX_IN_FLIGHT), then the default.
+    """
+    return os.getenv(f"{name}_{model_id.upper()}", os.getenv(name, default))
+
+
+# ────────────────
+# Admission control (per model_container)
+# ────────────────
+
+
+@dataclass(frozen=True)
+class AdmissionSettings:
+    max_in_flight: int  # concurrent upstream requests
+    max_queue: int  # requests allowed to wait for a slot
+    queue_timeout: float  # seconds a request may wait before being shed
+    retry_after: int  # seconds, sent back in the Retry-After header
+
+
+def admission_settings(model_id: str) -> AdmissionSettings:
+    return AdmissionSettings(
+        max_in_flight=int(container_setting("ADMISSION_MAX_IN_FLIGHT", model_id, "4")),
+        max_queue=int(container_setting("ADMISSION_MAX_QUEUE", model_id, "16")),
+        queue_timeout=float(container_setting("ADMISSION_QUEUE_TIMEOUT", model_id, "30")),
+        retry_after=int(container_setting("ADMISSION_RETRY_AFTER", model_id, "2")),
+    )
+
+
+# ────────────────
+# Adaptive concurrency (per model_container)
+# ────────────────
+
+
+@dataclass(frozen=True)
+class AdaptiveLimitSettings:
+    enabled: bool
+    min_limit: int
+    max_limit: int
+    ttft_tolerance: float  # EWMA / baseline ratio treated as degraded
+    total_tolerance: float
+    backoff: float  # multiplicative decrease
+    smoothing: float  # EWMA weight of the newest sample
+    baseline_drift: float  # per-sample upward drift of the baseline minimum
+
+
+def adaptive_limit_settings(model_id: str) -> AdaptiveLimitSettings:
+    return AdaptiveLimitSettings(
+        enabled=container_setting("ADAPTIVE_CONCURRENCY", model_id, "true").lower() == "true",
+        min_limit=int(container_setting("ADAPTIVE_MIN_IN_FLIGHT", model_id, "1")),
+        max_limit=int(container_setting("ADAPTIVE_MAX_IN_FLIGHT", model_id, "32")),
+        ttft_tolerance=float(container_setting("ADAPTIVE_TTFT_TOLERANCE", model_id, "2.0")),
+        total_tolerance=float(container_setting("ADAPTIVE_TOTAL_TOLERANCE", model_id, "3.0")),
+        backoff=float(container_setting("ADAPTIVE_BACKOFF", model_id, "0.75")),
+        smoothing=float(container_setting("ADAPTIVE_SMOOTHING", model_id, "0.2")),
+        baseline_drift=float(container_setting("ADAPTIVE_BASELINE_DRIFT", model_id, "0.01")),
+    )
+
+
+# ────────────────
+# Background health probes
+# ────────────────
+
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))  # seconds between rounds
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))  # per-replica timeout
+
+
+# ────────────────
+# Circuit breakers (per upstream replica)
+# ────────────────
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # consecutive failures
+CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30"))  # seconds open
+CIRCUIT_HALF_OPEN_MAX_CALLS = int(os.getenv("CIRCUIT_HALF_OPEN_MAX_CALLS", "1"))  # trial calls
+
+
+# ────────────────
+# Request hedging
+# ────────────────
+
+HEDGE_DELAY_PERCENTILE = float(os.getenv("HEDGE_DELAY_PERCENTILE", "95"))  # of primary latency
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))  # before trusting the percentile
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "2.0"))  # seconds, until then
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))  # seconds
+
+
+# ────────────────
+# Request deadlines
+# ────────────────
+
+DEADLINE_MIN_SYNTHESIS_BUDGET = float(os.getenv("DEADLINE_MIN_SYNTHESIS_BUDGET", "0.5"))  # seconds
+DEADLINE_MIN_SYNTHESIS_TOKENS = int(os.getenv("DEADLINE_MIN_SYNTHESIS_TOKENS", "32"))  # or skip it
+
+
+# ────────────────
+# Upstream retries (idempotent phases only)
+# ────────────────
+
+RETRY_PHASES = frozenset(
+    p.strip() for p in os.getenv("RETRY_PHASES", "chat,tool_selection").split(",") if p.strip()
+)
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))  # including the first call
+RETRY_BACKOFF_BASE = float(os.getenv("RETRY_BACKOFF_BASE", "0.1"))  # seconds, full jitter
+RETRY_BACKOFF_MAX = float(os.getenv("RETRY_BACKOFF_MAX", "2.0"))  # seconds
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.1"))  # retries per request
+RETRY_BUDGET_CAPACITY = float(os.getenv("RETRY_BUDGET_CAPACITY", "10"))  # burst of retries
+
+
+# ────────────────
+# Startup warm-up
+# ────────────────
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_MODELS = [m.strip() for m in os.getenv("WARMUP_MODELS", "").split(",") if m.strip()]
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "180"))  # seconds; covers a cold model load
+# The system_prompt clients usually send; warm-up prefixes it to the tool prompt like requests do
+WARMUP_SYSTEM_PROMPT = os.getenv("WARMUP_SYSTEM_PROMPT", "")
+
+
+# ────────────────
+# Shared host cache (SQLite in WAL mode, for caches whose backend is "sqlite")
+# ────────────────
+
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "/tmp/api_gateway/cache.sqlite3")
+CACHE_SQLITE_MMAP_BYTES = int(os.getenv("CACHE_SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+
+
+# ────────────────
+# Shared fleet cache (Redis protocol, for caches whose backend is "redis")
+# ────────────────
+
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_REDIS_POOL_SIZE = int(os.getenv("CACHE_REDIS_POOL_SIZE", "8"))
+CACHE_REDIS_TIMEOUT = float(os.getenv("CACHE_REDIS_TIMEOUT", "0.25"))  # seconds per command
+CACHE_REDIS_RETRY_AFTER = float(os.getenv("CACHE_REDIS_RETRY_AFTER", "5"))  # skip after a failure
+
+
+# ────────────────
+# In-process L1 in front of shared backends (sqlite, redis)
+# ────────────────
+
+CACHE_L1_TTL = float(os.getenv("CACHE_L1_TTL", "10"))  # seconds; 0 disables the L1 tier
+CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", "256"))
+CACHE_L1_MAX_BYTES = int(os.getenv("CACHE_L1_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+# ────────────────
+# Stampede protection (one recompute per missing key across processes)
+# ────────────────
+
+CACHE_LOCK_TTL = float(os.getenv("CACHE_LOCK_TTL", "60"))  # seconds; frees a crashed holder's key
+CACHE_LOCK_WAIT = float(os.getenv("CACHE_LOCK_WAIT", "30"))  # seconds to wait for another fill
+CACHE_LOCK_POLL_INTERVAL = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.05"))  # seconds
+
+
+# ────────────────
+# Response cache (deterministic /completion requests)
+# ────────────────
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # memory | sqlite | redis
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))  # seconds
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+# ────────────────
+# Stream replay cache (deterministic /stream requests)
+# ────────────────
+
+STREAM_CACHE_ENABLED = os.getenv("STREAM_CACHE_ENABLED", "true").lower() == "true"
+STREAM_CACHE_BACKEND = os.getenv("STREAM_CACHE_BACKEND", "memory")  # memory | sqlite | redis
+STREAM_CACHE_TTL = float(os.getenv("STREAM_CACHE_TTL", "300"))  # seconds
+STREAM_CACHE_MAX_ENTRIES = int(os.getenv("STREAM_CACHE_MAX_ENTRIES", "256"))
+STREAM_CACHE_MAX_BYTES = int(os.getenv("STREAM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+STREAM_CACHE_REPLAY_MODE = os.getenv("STREAM_CACHE_REPLAY_MODE", "fast")  # fast | realtime
+
+
+# ────────────────
+# Idempotency keys (Idempotency-Key header on /completion and /stream)
+# ────────────────
+
+IDEMPOTENCY_ENABLED = os.getenv("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+IDEMPOTENCY_BACKEND = os.getenv("IDEMPOTENCY_BACKEND", "memory")  # memory | sqlite | redis
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "600"))  # seconds a result is kept for retries
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "4096"))
+IDEMPOTENCY_MAX_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+# ────────────────
+# Semantic response cache (near-duplicate user prompts on /completion)
+# ────────────────
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))  # cosine similarity
+SEMANTIC_CACHE_NEAR_MISS_MARGIN = float(os.getenv("SEMANTIC_CACHE_NEAR_MISS_MARGIN", "0.05"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2048"))  # per container
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "600"))  # seconds
+SEMANTIC_CACHE_EMBED_MODEL = os.getenv("SEMANTIC_CACHE_EMBED_MODEL", "")  # "": the chat model
+SEMANTIC_CACHE_EMBED_TIMEOUT = float(os.getenv("SEMANTIC_CACHE_EMBED_TIMEOUT", "2.0"))  # seconds
+
+
+# ────────────────
+# Tool result cache (tools that declare a cache_policy)
+# ────────────────
+
+TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+TOOL_CACHE_BACKEND = os.getenv("TOOL_CACHE_BACKEND", "memory")  # memory | sqlite | redis
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "4096"))
+TOOL_CACHE_MAX_BYTES = int(os.getenv("TOOL_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+# ────────────────
+# Tool execution (concurrent calls; tools without an async path use a bounded thread pool)
+# ────────────────
+
+TOOL_THREAD_POOL_SIZE = int(os.getenv("TOOL_THREAD_POOL_SIZE", "8"))
+# Cap per call for tools that declare no timeout; calls in one turn run concurrently.
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", "10"))  # seconds
+
+
+# ────────────────
+# Toolchain phase caches (tool-call plans and synthesis text on /completion)
+# ────────────────
+
+PHASE_CACHE_ENABLED = os.getenv("PHASE_CACHE_ENABLED", "true").lower() == "true"
+PHASE_CACHE_BACKEND = os.getenv("PHASE_CACHE_BACKEND", "memory")  # memory | sqlite | redis
+PHASE_CACHE_PLAN_TTL = float(os.getenv("PHASE_CACHE_PLAN_TTL", "3600"))  # seconds
+PHASE_CACHE_SYNTHESIS_TTL = float(os.getenv("PHASE_CACHE_SYNTHESIS_TTL", "600"))  # seconds
+PHASE_CACHE_MAX_ENTRIES = int(os.getenv("PHASE_CACHE_MAX_ENTRIES", "4096"))
+PHASE_CACHE_MAX_BYTES = int(os.getenv("PHASE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
@@ -58,8 +58,33 @@ if ENABLE_LOCAL_GPU_MODEL:
     model_service_map["local_gpu"] = "http://host.docker.internal:11434"
     model_map["local_gpu"] = LOCAL_GPU
 
+# Replica pools: each logical model_container can be served by several Ollama replicas.
+# Set e.g. TRADITIONAL_REPLICAS="http://traditional_model:11434,http://node2:11434".
+# Without an override, the pool is just the base URL above.
+model_replica_map = {
+    model_id: [
+        url.strip().rstrip("/")
+        for url in (os.getenv(f"{model_id.upper()}_REPLICAS") or base_url).split(",")
+        if url.strip()
+    ]
+    for model_id, base_url in model_service_map.items()
+}
+
+# Hedging siblings: a slow primary can be raced against its sibling (opt-in per request).
+# Override with e.g. HEDGE_SIBLINGS="traditional:traditional_alt,reasoning:reasoning_alt".
+hedge_sibling_map = dict(
+    pair.split(":", 1) for pair in os.getenv("HEDGE_SIBLINGS", "").split(",") if ":" in pair
+) or {
+    "traditional": "traditional_alt",
+    "traditional_alt": "traditional",
+    "reasoning": "reasoning_alt",
+    "reasoning_alt": "reasoning",
+}
+
 # Debugging
 print(ENABLE_LOCAL_GPU_MODEL, "ENABLE_LOCAL_GPU_MODEL")
 print("model_service_map:", model_service_map)
+print("model_replica_map:", model_replica_map)
 print("model_map:", model_map)
 print("protocol_map:", protocol_map)
+print("hedge_sibling_map:", hedge_sibling_map)
@@ -0,0 +1,124 @@
+# File: api/core/adaptive_limit.py
+
+from typing import Any, Dict, Optional
+
+from api.config.gateway_settings import AdaptiveLimitSettings
+
+
+class LatencySignal:
+    """
+    Tracks one latency signal as a slow-moving baseline and a fast EWMA.
+
+    The baseline is a minimum that drifts upward a little on every sample, so it
+    follows the backend when a bigger model or slower hardware raises the floor.
+    """
+
+    def __init__(self, smoothing: float, drift: float) -> None:
+        self.smoothing = smoothing
+        self.drift = drift
+        self.baseline: Optional[float] = None
+        self.ewma: Optional[float] = None
+
+    def add(self, seconds: float) -> None:
+        if self.baseline is None or self.ewma is None:
+            self.baseline = self.ewma = seconds
+            return
+        self.baseline = min(self.baseline * (1 + self.drift), seconds)
+        self.ewma = self.smoothing * seconds + (1 - self.smoothing) * self.ewma
+
+    def ratio(self) -> Optional[float]:
+        if not self.baseline or self.ewma is None:
+            return None
+        return self.ewma / self.baseline
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(1000 * value, 2) if value is not None else None
+
+        return {"baseline_ms": ms(self.baseline), "ewma_ms": ms(self.ewma)}
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit driven by time-to-first-token and total latency.
+
+    Every `limit` samples (roughly one round of requests) the limit is re-evaluated:
+      - latency within tolerance of its baseline while the limit was in use → limit + 1
+      - latency degraded past tolerance, or any upstream failure → limit * backoff
+
+    At most one decrease per window, so a burst of concurrent failures backs off once
+    rather than once per failed request.
+
+    TTFT is the primary signal since it reflects queueing inside Ollama
+    (OLLAMA_NUM_PARALLEL) independent of answer length; total latency has a
+    wider tolerance and catches backends that slow down mid-generation.
+    """
+
+    def __init__(self, initial: int, settings: AdaptiveLimitSettings) -> None:
+        self.settings = settings
+        self._limit = float(max(settings.min_limit, min(initial, settings.max_limit)))
+        self.ttft = LatencySignal(settings.smoothing, settings.baseline_drift)
+        self.total = LatencySignal(settings.smoothing, settings.baseline_drift)
+
+        self._pending = 0
+        self._saturated = False
+        self._degraded = False
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_sample(
+        self,
+        ttft: Optional[float],
+        total: float,
+        in_flight: int,
+        failed: bool = False,
+    ) -> None:
+        if failed:
+            # Fast failures would otherwise look like excellent latency; keep them out
+            # of the signals and just mark the window as degraded.
+            self._degraded = True
+        else:
+            if ttft is not None:
+                self.ttft.add(ttft)
+            self.total.add(total)
+            self._degraded = self._degraded or self._is_degraded()
+
+        self._pending += 1
+        self._saturated = self._saturated or in_flight >= self.limit
+
+        if self._pending < self.limit:
+            return
+
+        if self._degraded:
+            self._limit = max(self.settings.min_limit, self._limit * self.settings.backoff)
+            self.decreases += 1
+        elif self._saturated:
+            self._limit = min(self.settings.max_limit, self._limit + 1)
+            self.increases += 1
+        self._reset_window()
+
+    def _is_degraded(self) -> bool:
+        ttft_ratio = self.ttft.ratio()
+        total_ratio = self.total.ratio()
+        return bool(
+            (ttft_ratio is not None and ttft_ratio > self.settings.ttft_tolerance)
+            or (total_ratio is not None and total_ratio > self.settings.total_tolerance)
+        )
+
+    def _reset_window(self) -> None:
+        self._pending = 0
+        self._saturated = False
+        self._degraded = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "ttft": self.ttft.snapshot(),
+            "total": self.total.snapshot(),
+        }
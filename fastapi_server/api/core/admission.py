@@ -0,0 +1,225 @@
+# File: api/core/admission.py
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from api.config.gateway_settings import (
+    AdaptiveLimitSettings,
+    AdmissionSettings,
+    adaptive_limit_settings,
+    admission_settings,
+)
+from api.core.adaptive_limit import AdaptiveLimit
+from api.core.latency import LatencyWindow
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of being queued for a backend."""
+
+    def __init__(self, model_id: str, reason: str, status_code: int, retry_after: int) -> None:
+        super().__init__(f"{model_id}: {reason}")
+        self.model_id = model_id
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionLease:
+    """
+    Holds one in-flight slot on a governor. Release is idempotent and
+    reports the request's latency back to the governor's limiter.
+    """
+
+    def __init__(self, governor: "BackendGovernor", wait_time: float) -> None:
+        self.governor = governor
+        self.wait_time = wait_time
+        self.started = time.monotonic()
+        self.in_flight_at_start = governor.in_flight
+        self.first_token_at: Optional[float] = None
+        self._released = False
+
+    def mark_first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+    def release(self, failed: bool = False) -> None:
+        if self._released:
+            return
+        self._released = True
+        self.governor._complete(self, failed)
+
+    def abandon(self) -> None:
+        # Give the slot back without a latency sample (e.g. a cancelled hedge).
+        if self._released:
+            return
+        self._released = True
+        self.governor._release()
+
+
+class BackendGovernor:
+    """
+    Concurrency governor in front of one model_container.
+
+    Up to `limit` requests run at once; up to `max_queue` more wait (FIFO) for a slot.
+    Anything beyond that, or anything that waits longer than `queue_timeout`, is rejected.
+    With adaptive concurrency enabled, `limit` starts at `max_in_flight` and is then
+    learned from the backend's observed latency.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        settings: AdmissionSettings,
+        adaptive_settings: AdaptiveLimitSettings,
+    ) -> None:
+        self.model_id = model_id
+        self.fixed_limit = settings.max_in_flight
+        self.adaptive: Optional[AdaptiveLimit] = (
+            AdaptiveLimit(settings.max_in_flight, adaptive_settings)
+            if adaptive_settings.enabled
+            else None
+        )
+        self.max_queue = settings.max_queue
+        self.queue_timeout = settings.queue_timeout
+        self.retry_after = settings.retry_after
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+        # Stats
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.failures = 0
+        self.ttft_latency = LatencyWindow()
+        self.total_latency = LatencyWindow()
+
+    @property
+    def limit(self) -> int:
+        return self.adaptive.limit if self.adaptive else self.fixed_limit
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> AdmissionLease:
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            return self._admit(0.0)
+
+        if self.queued >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(self.model_id, "admission queue is full", 429, self.retry_after)
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.monotonic()
+
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.rejected_timeout += 1
+            raise AdmissionRejected(
+                self.model_id, "timed out waiting for a backend slot", 503, self.retry_after
+            ) from None
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+        return self._admit(time.monotonic() - start)
+
+    def try_acquire(self) -> Optional[AdmissionLease]:
+        """Admit only if a slot is free right now; never queues."""
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            return self._admit(0.0)
+        return None
+
+    def _admit(self, wait_time: float) -> AdmissionLease:
+        self.admitted += 1
+        self.total_wait += wait_time
+        self.max_wait = max(self.max_wait, wait_time)
+        return AdmissionLease(self, wait_time)
+
+    def _abandon(self, waiter: asyncio.Future[None]) -> None:
+        # A slot may have been handed over just as the waiter gave up; pass it on.
+        if waiter.done() and not waiter.cancelled():
+            self._release()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _complete(self, lease: AdmissionLease, failed: bool) -> None:
+        total = time.monotonic() - lease.started
+        ttft = lease.first_token_at - lease.started if lease.first_token_at else None
+
+        if failed:
+            self.failures += 1
+        else:
+            self.total_latency.add(total)
+            if ttft is not None:
+                self.ttft_latency.add(ttft)
+
+        if self.adaptive:
+            self.adaptive.on_sample(ttft, total, lease.in_flight_at_start, failed)
+
+        self._release()
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_wait_ms": round(1000 * self.total_wait / self.admitted, 2)
+            if self.admitted
+            else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 2),
+            "failures": self.failures,
+            "ttft_latency": self.ttft_latency.snapshot(),
+            "total_latency": self.total_latency.snapshot(),
+            "adaptive": self.adaptive.snapshot() if self.adaptive else None,
+        }
+
+
+class AdmissionController:
+    """Lazily creates one governor per model_container."""
+
+    def __init__(self) -> None:
+        self.governors: Dict[str, BackendGovernor] = {}
+
+    def get(self, model_id: str) -> BackendGovernor:
+        governor: Optional[BackendGovernor] = self.governors.get(model_id)
+        if governor is None:
+            governor = BackendGovernor(
+                model_id, admission_settings(model_id), adaptive_limit_settings(model_id)
+            )
+            self.governors[model_id] = governor
+        return governor
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {model_id: g.snapshot() for model_id, g in self.governors.items()}
+
+
+admission_controller = AdmissionController()
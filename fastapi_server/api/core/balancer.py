@@ -0,0 +1,102 @@
+# File: api/core/balancer.py
+
+from typing import Any, Dict, List, Mapping, Sequence
+
+from api.config.model_routes import model_replica_map
+from api.core.circuit_breaker import breakers
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.outstanding = 0
+        self.healthy = True
+        self.dispatched = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "outstanding": self.outstanding,
+            "healthy": self.healthy,
+            "circuit": breakers.state(self.url),
+            "dispatched": self.dispatched,
+        }
+
+
+class ReplicaLease:
+    """One outstanding request on a replica. Release is idempotent."""
+
+    def __init__(self, replica: Replica) -> None:
+        self.replica = replica
+        self._released = False
+
+    @property
+    def url(self) -> str:
+        return self.replica.url
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self.replica.outstanding -= 1
+
+
+class ReplicaPool:
+    """
+    Least-outstanding-requests balancing across the replicas of one model_container.
+
+    Replicas marked down by health probes, or whose circuit breaker is open, are skipped.
+    If no replica is available the pool fails open and balances over all of them, since
+    health data can lag (an open breaker will then fail the request fast).
+    """
+
+    def __init__(self, model_id: str, urls: Sequence[str]) -> None:
+        self.model_id = model_id
+        self.replicas: List[Replica] = [Replica(url) for url in urls]
+        self._next = 0
+
+    def acquire(self) -> ReplicaLease:
+        if not self.replicas:
+            raise LookupError(f"No replicas configured for model: {self.model_id}")
+
+        candidates = [
+            r for r in self.replicas if r.healthy and breakers.allows_request(r.url)
+        ] or self.replicas
+
+        # Rotate the starting point so ties are spread round-robin.
+        start = self._next % len(candidates)
+        self._next += 1
+        rotated = candidates[start:] + candidates[:start]
+        replica = min(rotated, key=lambda r: r.outstanding)
+
+        replica.outstanding += 1
+        replica.dispatched += 1
+        return ReplicaLease(replica)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {r.url: r.snapshot() for r in self.replicas}
+
+
+class ReplicaBalancer:
+    def __init__(self, replica_map: Mapping[str, Sequence[str]]) -> None:
+        self.pools: Dict[str, ReplicaPool] = {
+            model_id: ReplicaPool(model_id, urls) for model_id, urls in replica_map.items()
+        }
+
+    def pool(self, model_id: str) -> ReplicaPool:
+        return self.pools[model_id]
+
+    def all_urls(self) -> List[str]:
+        return list(dict.fromkeys(r.url for p in self.pools.values() for r in p.replicas))
+
+    def mark(self, url: str, healthy: bool) -> None:
+        # The same Ollama host may back several pools (e.g. shared remote endpoints).
+        for pool in self.pools.values():
+            for replica in pool.replicas:
+                if replica.url == url:
+                    replica.healthy = healthy
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {model_id: p.snapshot() for model_id, p in self.pools.items()}
+
+
+balancer = ReplicaBalancer(model_replica_map)
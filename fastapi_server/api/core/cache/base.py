@@ -0,0 +1,32 @@
+# File: api/core/cache/base.py
+
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+
+class CacheBackend(Protocol):
+    """
+    Byte-valued key/value store used by the gateway's caches.
+
+    Methods are async so backends may do I/O; callers own serialization.
+    `ttl` is in seconds (None: the backend's default).
+    """
+
+    name: str
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def get_with_ttl(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        """`get`, plus the seconds the value has left (None: no expiry known)."""
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None: ...
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Set only if `key` is absent (or expired); True when this call stored it."""
+        ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+    def snapshot(self) -> Dict[str, Any]: ...
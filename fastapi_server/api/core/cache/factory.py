@@ -0,0 +1,73 @@
+# File: api/core/cache/factory.py
+
+from typing import Optional
+
+from api.config.gateway_settings import (
+    CACHE_L1_MAX_BYTES,
+    CACHE_L1_MAX_ENTRIES,
+    CACHE_L1_TTL,
+    CACHE_REDIS_POOL_SIZE,
+    CACHE_REDIS_RETRY_AFTER,
+    CACHE_REDIS_TIMEOUT,
+    CACHE_REDIS_URL,
+    CACHE_SQLITE_MMAP_BYTES,
+    CACHE_SQLITE_PATH,
+)
+from api.core.cache.base import CacheBackend
+from api.core.cache.memory import MemoryCache
+from api.core.cache.redis import RedisCache
+from api.core.cache.resp import RespClient
+from api.core.cache.sqlite import SQLiteCache
+from api.core.cache.tiered import TieredCache
+
+# One connection pool per process, shared by every Redis-backed cache.
+_resp_client: Optional[RespClient] = None
+
+
+def _shared_resp_client() -> RespClient:
+    global _resp_client
+    if _resp_client is None:
+        _resp_client = RespClient(
+            CACHE_REDIS_URL,
+            pool_size=CACHE_REDIS_POOL_SIZE,
+            timeout=CACHE_REDIS_TIMEOUT,
+            retry_after=CACHE_REDIS_RETRY_AFTER,
+        )
+    return _resp_client
+
+
+def build_cache_backend(
+    kind: str, *, namespace: str, max_entries: int, max_bytes: int, default_ttl: float
+) -> CacheBackend:
+    """
+    Backend for one cache, chosen by its *_CACHE_BACKEND setting:
+    "memory" (per process), "sqlite" (one file shared by every worker on the host, one
+    table per namespace) or "redis" (a Redis-protocol server shared by the fleet).
+    Shared backends get an in-process L1 in front unless CACHE_L1_TTL is 0.
+    """
+    if kind == "memory":
+        return MemoryCache(max_entries=max_entries, max_bytes=max_bytes, default_ttl=default_ttl)
+
+    shared: CacheBackend
+    if kind == "sqlite":
+        shared = SQLiteCache(
+            CACHE_SQLITE_PATH,
+            namespace,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            default_ttl=default_ttl,
+            mmap_bytes=CACHE_SQLITE_MMAP_BYTES,
+        )
+    elif kind == "redis":
+        shared = RedisCache(_shared_resp_client(), namespace, default_ttl=default_ttl)
+    else:
+        raise ValueError(f"Unknown cache backend for {namespace}: {kind!r}")
+
+    if CACHE_L1_TTL <= 0:
+        return shared
+    l1 = MemoryCache(
+        max_entries=min(max_entries, CACHE_L1_MAX_ENTRIES),
+        max_bytes=min(max_bytes, CACHE_L1_MAX_BYTES),
+        default_ttl=CACHE_L1_TTL,
+    )
+    return TieredCache(l1, shared, l1_ttl=CACHE_L1_TTL)
@@ -0,0 +1,106 @@
+# File: api/core/cache/memory.py
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+class _Entry(NamedTuple):
+    value: bytes
+    expires_at: float
+    size: int
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with a per-entry TTL, bounded by entry count and total bytes
+    (keys plus values). Expired entries are dropped when touched or when making room.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int, default_ttl: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.bytes = 0
+
+        # Stats
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        found = await self.get_with_ttl(key)
+        return found[0] if found is not None else None
+
+    async def get_with_ttl(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry.expires_at - time.monotonic()
+        if remaining <= 0:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry.value, remaining
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return  # would evict everything else and still not fit
+
+        self._remove(key)
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        self._entries[key] = _Entry(value, expires_at, size)
+        self.bytes += size
+        self._evict()
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return key in self._entries
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    async def close(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def _over_bounds(self) -> bool:
+        return len(self._entries) > self.max_entries or self.bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        if not self._over_bounds():
+            return
+
+        # Reclaim expired entries before evicting live ones.
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            self._remove(key)
+            self.expirations += 1
+
+        # Then least recently used first.
+        while self._over_bounds():
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
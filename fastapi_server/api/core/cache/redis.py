@@ -0,0 +1,69 @@
+# File: api/core/cache/redis.py
+
+from typing import Any, Dict, Optional, Tuple
+
+from api.core.cache.resp import RespClient, RespError
+
+
+class RedisCache:
+    """
+    Cache on a Redis-protocol server shared by every gateway node.
+
+    Keys are prefixed with the namespace so several caches can share one server (and one
+    client). Expiry is left to the server; size bounds are its maxmemory policy.
+    Servers that reject PTTL still serve reads, just without the remaining TTL.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: RespClient, namespace: str, default_ttl: float) -> None:
+        self.client = client
+        self.prefix = f"gw:{namespace}:"
+        self.default_ttl = default_ttl
+        self.pttl_supported = True
+
+    def _ttl_ms(self, ttl: Optional[float]) -> int:
+        return max(1, int(1000 * (self.default_ttl if ttl is None else ttl)))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value: Optional[bytes] = await self.client.execute("GET", self.prefix + key)
+        return value
+
+    async def get_with_ttl(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        if not self.pttl_supported:
+            value = await self.get(key)
+            return (value, None) if value is not None else None
+        try:
+            value, ttl_ms = await self.client.pipeline(
+                ("GET", self.prefix + key), ("PTTL", self.prefix + key)
+            )
+        except RespError:
+            self.pttl_supported = False
+            return await self.get_with_ttl(key)
+        if value is None:
+            return None
+        # PTTL is -1 for a key without expiry (and -2 if it expired in between).
+        return value, ttl_ms / 1000 if ttl_ms >= 0 else None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.client.execute("SET", self.prefix + key, value, "PX", self._ttl_ms(ttl))
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        reply = await self.client.execute(
+            "SET", self.prefix + key, value, "PX", self._ttl_ms(ttl), "NX"
+        )
+        return reply is not None
+
+    async def delete(self, key: str) -> None:
+        await self.client.execute("DEL", self.prefix + key)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "prefix": self.prefix,
+            "pttl_supported": self.pttl_supported,
+            **self.client.snapshot(),
+        }
@@ -0,0 +1,153 @@
+# File: api/core/cache/resp.py
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+Arg = Union[str, bytes, int, float]
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class RespError(Exception):
+    """The server answered a command with an error reply."""
+
+
+def encode_command(*args: Arg) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts += [b"$%d\r\n" % len(data), data, b"\r\n"]
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by the cache server")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode("utf-8")
+    if kind == b"-":
+        raise RespError(rest.decode("utf-8"))
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        count = int(rest)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise ConnectionError(f"Unexpected reply from the cache server: {line!r}")
+
+
+class RespClient:
+    """
+    Minimal Redis-protocol (RESP2) client with a small connection pool.
+
+    Every command (or pipeline) is bounded by `timeout`. On a connection failure the server is treated
+    as unavailable for `retry_after` seconds, so callers fail fast (and fall back to their
+    local tier) instead of paying a connect timeout on every request.
+    """
+
+    def __init__(self, url: str, pool_size: int, timeout: float, retry_after: float) -> None:
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.strip("/") or 0)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle: List[Connection] = []
+        self.unavailable_until = 0.0
+
+        # Stats
+        self.commands = 0
+        self.connects = 0
+        self.errors = 0
+
+    async def execute(self, *args: Arg) -> Any:
+        return (await self.pipeline(args))[0]
+
+    async def pipeline(self, *commands: Tuple[Arg, ...]) -> List[Any]:
+        """Sends `commands` in one write and returns their replies, in order."""
+        if time.monotonic() < self.unavailable_until:
+            raise ConnectionError(f"Cache server {self.host}:{self.port} is marked unavailable")
+
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            try:
+                if conn is None:
+                    conn = await asyncio.wait_for(self._connect(), timeout=self.timeout)
+                replies = await asyncio.wait_for(
+                    self._roundtrip(conn, *commands), timeout=self.timeout
+                )
+            except RespError:
+                self._idle.append(conn)  # type: ignore[arg-type]  # error replies keep it in sync
+                raise
+            except (OSError, EOFError, ConnectionError, asyncio.TimeoutError) as e:
+                self._discard(conn)
+                self.errors += 1
+                self.unavailable_until = time.monotonic() + self.retry_after
+                raise ConnectionError(f"Cache server {self.host}:{self.port} failed: {e!r}") from e
+            except BaseException:
+                self._discard(conn)  # cancelled mid-reply; the stream is out of sync
+                raise
+
+            self.commands += len(commands)
+            self._idle.append(conn)
+            return replies
+
+    async def _connect(self) -> Connection:
+        conn = await asyncio.open_connection(self.host, self.port)
+        self.connects += 1
+        if self.password is not None:
+            await self._roundtrip(conn, ("AUTH", self.password))
+        if self.db:
+            await self._roundtrip(conn, ("SELECT", self.db))
+        return conn
+
+    @staticmethod
+    async def _roundtrip(conn: Connection, *commands: Tuple[Arg, ...]) -> List[Any]:
+        reader, writer = conn
+        writer.write(b"".join(encode_command(*args) for args in commands))
+        await writer.drain()
+
+        # Read every reply before raising, so the connection stays in sync.
+        replies: List[Any] = []
+        error: Optional[RespError] = None
+        for _ in commands:
+            try:
+                replies.append(await read_reply(reader))
+            except RespError as e:
+                replies.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+    @staticmethod
+    def _discard(conn: Optional[Connection]) -> None:
+        if conn is not None:
+            conn[1].close()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "server": f"{self.host}:{self.port}/{self.db}",
+            "available": time.monotonic() >= self.unavailable_until,
+            "idle_connections": len(self._idle),
+            "commands": self.commands,
+            "connects": self.connects,
+            "errors": self.errors,
+        }
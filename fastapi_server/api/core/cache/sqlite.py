@@ -0,0 +1,219 @@
+# File: api/core/cache/sqlite.py
+
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+COMPRESS_MIN_BYTES = 512  # smaller values rarely shrink enough to pay for zlib
+
+EVICT_EVERY = 32  # writes between size checks
+TOUCH_INTERVAL = 30.0  # seconds; coarse LRU so reads do not write on every hit
+
+
+class SQLiteCache:
+    """
+    Cache in a local SQLite file (WAL mode, memory-mapped reads), shared by every
+    gateway worker on the host and kept across restarts.
+
+    Each namespace gets its own table. Values are zlib-compressed when that helps.
+    Expired rows are dropped on read and during eviction. Every EVICT_EVERY writes,
+    the least recently used rows are evicted until the table is back under
+    `max_entries` and `max_bytes`. Blocking sqlite calls run in a worker thread.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int,
+        max_bytes: int,
+        default_ttl: float,
+        mmap_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.table = "cache_" + re.sub(r"\W", "_", namespace)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.mmap_bytes = mmap_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+
+        # Stats (entries/bytes as of the last size check)
+        self.entries = 0
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ────────────────
+    # Async interface
+    # ────────────────
+
+    async def get(self, key: str) -> Optional[bytes]:
+        found = await self.get_with_ttl(key)
+        return found[0] if found is not None else None
+
+    async def get_with_ttl(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        return await asyncio.to_thread(self._run, self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        await asyncio.to_thread(self._run, self._set, key, value, ttl)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        ttl = self.default_ttl if ttl is None else ttl
+        return await asyncio.to_thread(self._run, self._add, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._run, self._delete, key)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close)
+
+    # ────────────────
+    # Blocking implementation (runs in a worker thread, one statement at a time)
+    # ────────────────
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            return fn(self._connect(), *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Autocommit; every statement is its own short transaction.
+        conn = sqlite3.connect(
+            self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " codec INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)"
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_expires ON {self.table} (expires_at)"
+        )
+        self._conn = conn
+        self._evict(conn)  # another worker or an earlier run may have left the table full
+        return conn
+
+    def _get(self, conn: sqlite3.Connection, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        row = conn.execute(
+            f"SELECT value, codec, expires_at, accessed_at FROM {self.table} WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, codec, expires_at, accessed_at = row
+        now = time.time()
+        if expires_at <= now:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self.expirations += 1
+            return None
+        if now - accessed_at > TOUCH_INTERVAL:
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        data = zlib.decompress(value) if codec == CODEC_ZLIB else bytes(value)
+        return data, expires_at - now
+
+    def _set(
+        self, conn: sqlite3.Connection, key: str, value: bytes, ttl: float, verb: str = "REPLACE"
+    ) -> bool:
+        stored, codec = value, CODEC_RAW
+        if len(value) >= COMPRESS_MIN_BYTES:
+            compressed = zlib.compress(value, 6)
+            if len(compressed) < len(value):
+                stored, codec = compressed, CODEC_ZLIB
+
+        size = len(key) + len(stored)
+        if size > self.max_bytes:
+            return False
+
+        now = time.time()
+        written = conn.execute(
+            f"INSERT OR {verb} INTO {self.table}"
+            " (key, value, codec, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, sqlite3.Binary(stored), codec, size, now + ttl, now),
+        ).rowcount
+
+        self._writes_since_evict += 1
+        if self._writes_since_evict >= EVICT_EVERY:
+            self._evict(conn)
+        return written == 1
+
+    def _add(self, conn: sqlite3.Connection, key: str, value: bytes, ttl: float) -> bool:
+        # An expired row still holds the primary key; clear it so the insert can win.
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key = ? AND expires_at <= ?", (key, time.time())
+        )
+        return self._set(conn, key, value, ttl, verb="IGNORE")
+
+    def _delete(self, conn: sqlite3.Connection, key: str) -> None:
+        conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        self._writes_since_evict = 0
+        self.expirations += conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+
+        while True:
+            entries, total = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+            self.entries, self.bytes = entries, total
+            if entries <= self.max_entries and total <= self.max_bytes:
+                return
+            # Drop roughly a tenth of the overshoot's worth of oldest rows per pass.
+            batch = max(1, entries - self.max_entries, entries // 10)
+            self.evictions += conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN"
+                f" (SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (batch,),
+            ).rowcount
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "table": self.table,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
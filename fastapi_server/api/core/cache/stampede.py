@@ -0,0 +1,147 @@
+# File: api/core/cache/stampede.py
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from api.core.cache.base import CacheBackend
+
+LOCK_PREFIX = "lock:"
+
+
+class _HeldLock:
+    def __init__(self, token: str) -> None:
+        self.token: Optional[str] = token
+        self.acquired = False
+        self.ready = asyncio.Event()
+        self.holders = 0
+
+
+class StampedeGuard:
+    """
+    Makes a missing key get recomputed once across every process sharing the backend.
+
+    The first process to miss takes a fill lock (`add`, i.e. SET NX, with a TTL so a
+    crashed holder cannot wedge the key); other processes poll the backend until the
+    value appears, the lock is released without a value, or `wait` runs out, and then
+    recompute themselves. Requests in the lock holder's own process go straight through,
+    since singleflight already coalesces them.
+    """
+
+    def __init__(self, lock_ttl: float, wait: float, poll_interval: float) -> None:
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self.poll_interval = poll_interval
+        self._held: Dict[str, _HeldLock] = {}
+
+        # Stats
+        self.locks_acquired = 0
+        self.locks_contended = 0
+        self.filled_elsewhere = 0
+        self.wait_timeouts = 0
+        self.errors = 0
+
+    @asynccontextmanager
+    async def fill(self, backend: CacheBackend, key: str) -> AsyncIterator[bool]:
+        """
+        Yields True when another process stored `key` while we waited (read it again),
+        or False when the caller should compute and store it.
+        """
+        held = await self._claim(backend, key)
+        if not held.acquired:
+            yield await self._wait_for_fill(backend, key)
+            return
+        async with self._holding(backend, key, held):
+            yield False
+
+    @asynccontextmanager
+    async def try_fill(self, backend: CacheBackend, key: str) -> AsyncIterator[bool]:
+        """
+        For refreshing a key that still holds a stale value, where waiting gains nothing:
+        yields True when the caller should recompute and store it, or False at once when
+        another process is already doing so.
+        """
+        held = await self._claim(backend, key)
+        if not held.acquired:
+            yield False
+            return
+        async with self._holding(backend, key, held):
+            yield True
+
+    async def _claim(self, backend: CacheBackend, key: str) -> _HeldLock:
+        held = self._held.get(key)
+        if held is None:
+            token = uuid.uuid4().hex
+            held = self._held[key] = _HeldLock(token)
+            try:
+                held.acquired = await backend.add(LOCK_PREFIX + key, token.encode(), self.lock_ttl)
+            except asyncio.CancelledError:
+                del self._held[key]
+                raise
+            except Exception:
+                self.errors += 1
+                held.acquired, held.token = True, None  # fail open: compute without a lock
+            finally:
+                held.ready.set()
+            if held.acquired:
+                self.locks_acquired += 1
+            else:
+                self.locks_contended += 1
+        else:
+            await held.ready.wait()
+
+        if not held.acquired and self._held.get(key) is held:
+            del self._held[key]
+        return held
+
+    @asynccontextmanager
+    async def _holding(
+        self, backend: CacheBackend, key: str, held: _HeldLock
+    ) -> AsyncIterator[None]:
+        held.holders += 1
+        try:
+            yield
+        finally:
+            held.holders -= 1
+            if held.holders == 0:
+                if self._held.get(key) is held:
+                    del self._held[key]
+                if held.token is not None:
+                    await self._release(backend, key, held.token)
+
+    async def _wait_for_fill(self, backend: CacheBackend, key: str) -> bool:
+        give_up_at = time.monotonic() + self.wait
+        while time.monotonic() < give_up_at:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await backend.get(key) is not None:
+                    self.filled_elsewhere += 1
+                    return True
+                if await backend.get(LOCK_PREFIX + key) is None:
+                    return False  # the holder finished without storing anything
+            except Exception:
+                self.errors += 1
+                return False
+        self.wait_timeouts += 1
+        return False
+
+    async def _release(self, backend: CacheBackend, key: str, token: str) -> None:
+        # Check-then-delete is not atomic; at worst it drops a lock that already expired
+        # and was re-taken, which costs one duplicate computation.
+        try:
+            if await backend.get(LOCK_PREFIX + key) == token.encode():
+                await backend.delete(LOCK_PREFIX + key)
+        except Exception:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "locks_held": len(self._held),
+            "locks_acquired": self.locks_acquired,
+            "locks_contended": self.locks_contended,
+            "filled_elsewhere": self.filled_elsewhere,
+            "wait_timeouts": self.wait_timeouts,
+            "errors": self.errors,
+        }
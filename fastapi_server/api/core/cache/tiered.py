@@ -0,0 +1,97 @@
+# File: api/core/cache/tiered.py
+
+from typing import Any, Dict, Optional, Tuple
+
+from api.core.cache.base import CacheBackend
+from api.core.cache.memory import MemoryCache
+from api.core.cache.stampede import LOCK_PREFIX
+
+
+class TieredCache:
+    """
+    In-process L1 in front of a shared L2 (SQLite on the host, or a Redis-protocol server
+    for the fleet).
+
+    Reads try L1 first and copy L2 hits into it; writes go to both. L1 entries live at
+    most `l1_ttl`, and never longer than the L2 entry they copy, which bounds how stale a
+    node can be after another node overwrites or deletes a key. If L2 fails, the cache
+    keeps working from L1 alone. Fill locks are
+    never copied into L1, so every node sees the same lock.
+    """
+
+    name = "tiered"
+
+    def __init__(self, l1: MemoryCache, l2: CacheBackend, l1_ttl: float) -> None:
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+
+        # Stats
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.l2_errors = 0
+
+    def _l1_ttl(self, ttl: Optional[float]) -> float:
+        return self.l1_ttl if ttl is None else min(ttl, self.l1_ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        found = await self.get_with_ttl(key)
+        return found[0] if found is not None else None
+
+    async def get_with_ttl(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        if not key.startswith(LOCK_PREFIX):
+            found = await self.l1.get_with_ttl(key)
+            if found is not None:
+                self.l1_hits += 1
+                return found
+
+        try:
+            found = await self.l2.get_with_ttl(key)
+        except Exception:
+            self.l2_errors += 1
+            return None
+        if found is None:
+            self.misses += 1
+            return None
+
+        self.l2_hits += 1
+        if not key.startswith(LOCK_PREFIX):
+            await self.l1.set(key, found[0], self._l1_ttl(found[1]))
+        return found
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.l1.set(key, value, self._l1_ttl(ttl))
+        try:
+            await self.l2.set(key, value, ttl)
+        except Exception:
+            self.l2_errors += 1
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        try:
+            return await self.l2.add(key, value, ttl)
+        except Exception:
+            self.l2_errors += 1
+            return await self.l1.add(key, value, ttl)  # L2 is down: lock this node only
+
+    async def delete(self, key: str) -> None:
+        await self.l1.delete(key)
+        try:
+            await self.l2.delete(key)
+        except Exception:
+            self.l2_errors += 1
+
+    async def close(self) -> None:
+        await self.l1.close()
+        await self.l2.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l2_errors": self.l2_errors,
+            "l1": self.l1.snapshot(),
+            "l2": self.l2.snapshot(),
+        }
@@ -0,0 +1,230 @@
+# File: api/core/circuit_breaker.py
+
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    Literal,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+import httpx
+import openai
+
+from api.config.gateway_settings import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN_MAX_CALLS,
+    CIRCUIT_RECOVERY_TIMEOUT,
+)
+
+T = TypeVar("T")
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, backend: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {backend}; retry in {retry_in:.1f}s")
+        self.backend = backend
+        self.retry_in = retry_in
+
+
+def backend_key(base_url: str) -> str:
+    """Handlers talk to `<replica>/v1`; breakers are keyed by the replica root URL."""
+    return base_url.rstrip("/").removesuffix("/v1")
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Connection problems, timeouts and 5xx count against a backend; 4xx do not."""
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500
+    return isinstance(error, (openai.APIConnectionError, httpx.TransportError))
+
+
+_failed_backends: ContextVar[Optional[Set[str]]] = ContextVar("failed_backends", default=None)
+
+
+@contextmanager
+def track_upstream_failures(failed: Set[str]) -> Iterator[None]:
+    """
+    Adds to `failed` the backend of every breaker-guarded call, made in this context,
+    that ends in an upstream failure. Lets the gateway tell an upstream failure apart
+    from a handler's own error responses (validation, no tools called, ...).
+    """
+    token = _failed_backends.set(failed)
+    try:
+        yield
+    finally:
+        _failed_backends.reset(token)
+
+
+class CircuitBreaker:
+    """
+    closed    → calls pass; `failure_threshold` consecutive failures open the circuit.
+    open      → calls fail fast with CircuitOpenError for `recovery_timeout` seconds.
+    half_open → up to `half_open_max_calls` trial calls; one success closes, one failure reopens.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        half_open_max_calls: int,
+    ) -> None:
+        self.backend = backend
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state: CircuitState = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_in_flight = 0
+
+        # Stats
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == "open" and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return "half_open"
+        return self._state
+
+    def allows_request(self) -> bool:
+        """Non-mutating check used by routing to skip replicas that would fail fast."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open":
+            return self.half_open_in_flight < self.half_open_max_calls
+        return False
+
+    def before_call(self) -> None:
+        state = self.state
+        self._state = state
+        if state == "closed":
+            return
+        if state == "half_open" and self.half_open_in_flight < self.half_open_max_calls:
+            self.half_open_in_flight += 1
+            return
+
+        self.rejected += 1
+        retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(self.backend, retry_in)
+
+    def record_success(self) -> None:
+        if self._state == "half_open":
+            self.half_open_in_flight = max(0, self.half_open_in_flight - 1)
+        self._state = "closed"
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._state == "half_open":
+            self.half_open_in_flight = max(0, self.half_open_in_flight - 1)
+            self._open()
+        elif self._state == "closed" and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def record_abandoned(self) -> None:
+        # Cancelled by the client: says nothing about the backend, but frees a trial slot.
+        if self._state == "half_open":
+            self.half_open_in_flight = max(0, self.half_open_in_flight - 1)
+
+    def _open(self) -> None:
+        self._state = "open"
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def _record_upstream_failure(self) -> None:
+        self.record_failure()
+        failed = _failed_backends.get()
+        if failed is not None:
+            failed.add(self.backend)
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        self.before_call()
+        try:
+            yield
+        except Exception as e:
+            if is_upstream_failure(e):
+                self._record_upstream_failure()
+            else:
+                self.record_abandoned()
+            raise
+        except BaseException:
+            self.record_abandoned()
+            raise
+        self.record_success()
+
+    async def read(self, stream: AsyncIterable[T]) -> AsyncIterator[T]:
+        """
+        Items of a stream that `guard` already let open. A failed read counts against the
+        backend, but items are yielded outside of any guard, so the time a client spends
+        reading (or going away) is not charged to the backend.
+        """
+        iterator = stream.__aiter__()
+        while True:
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                if is_upstream_failure(e):
+                    self._record_upstream_failure()
+                raise
+            yield item
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Lazily creates one breaker per upstream replica."""
+
+    def __init__(self) -> None:
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, base_url: str) -> CircuitBreaker:
+        key = backend_key(base_url)
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                key,
+                failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                recovery_timeout=CIRCUIT_RECOVERY_TIMEOUT,
+                half_open_max_calls=CIRCUIT_HALF_OPEN_MAX_CALLS,
+            )
+            self.breakers[key] = breaker
+        return breaker
+
+    def allows_request(self, base_url: str) -> bool:
+        breaker = self.breakers.get(backend_key(base_url))
+        return breaker.allows_request() if breaker else True
+
+    def state(self, base_url: str) -> CircuitState:
+        breaker = self.breakers.get(backend_key(base_url))
+        return breaker.state if breaker else "closed"
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {key: b.snapshot() for key, b in self.breakers.items()}
+
+
+breakers = CircuitBreakerRegistry()
@@ -0,0 +1,90 @@
+# File: api/core/deadline.py
+
+import asyncio
+import inspect
+import time
+from typing import AsyncIterable, AsyncIterator, Awaitable, Literal, Optional, TypeVar
+
+T = TypeVar("T")
+
+Phase = Literal["admission", "coalesced", "chat", "tool_selection", "tool_execution", "synthesis"]
+
+
+class DeadlineExceeded(Exception):
+    """The request's end-to-end budget ran out while `phase` was running."""
+
+    def __init__(self, phase: Phase) -> None:
+        super().__init__(f"Deadline exceeded during {phase}")
+        self.phase: Phase = phase
+
+
+class Deadline:
+    """
+    End-to-end budget for one request, started when the route receives it.
+
+    Every phase (admission queue, LLM calls, tool execution) gets only what is
+    left. A deadline without a budget never expires and imposes no timeout.
+    """
+
+    def __init__(self, budget: Optional[float] = None) -> None:
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget if budget is not None else None
+
+    @classmethod
+    def from_request(cls, *budgets_ms: Optional[int]) -> "Deadline":
+        # Body field and header may both be set; the tighter one wins.
+        given = [ms for ms in budgets_ms if ms is not None]
+        return cls(min(given) / 1000 if given else None)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, cap: Optional[float] = None) -> Optional[float]:
+        """The smaller of `cap` and the remaining budget (None when both are unbounded)."""
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        return remaining if cap is None else min(cap, remaining)
+
+    def check(self, phase: Phase) -> None:
+        if self.expired():
+            raise DeadlineExceeded(phase)
+
+    async def run(self, awaitable: Awaitable[T], phase: Phase) -> T:
+        remaining = self.remaining()
+        if remaining is None:
+            return await awaitable
+        if remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()  # never started; avoid the "never awaited" warning
+            raise DeadlineExceeded(phase)
+        try:
+            return await asyncio.wait_for(awaitable, timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(phase) from None
+
+    async def iterate(self, stream: AsyncIterable[T], phase: Phase) -> AsyncIterator[T]:
+        """
+        Yields from `stream`, bounding the wait for every item by the remaining budget.
+        On expiry the stream is closed (releasing its upstream connection) before raising.
+        """
+        iterator = stream.__aiter__()
+        while True:
+            try:
+                item = await self.run(iterator.__anext__(), phase)
+            except StopAsyncIteration:
+                return
+            except DeadlineExceeded:
+                close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+                if close is not None:
+                    result = close()
+                    if inspect.isawaitable(result):
+                        await result
+                raise
+            yield item
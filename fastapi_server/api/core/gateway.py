@@ -0,0 +1,98 @@
+# File: api/core/gateway.py
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Optional, Set, Union
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from api.core.admission import AdmissionLease, AdmissionRejected, admission_controller
+from api.core.balancer import ReplicaLease, balancer
+from api.core.circuit_breaker import backend_key, is_upstream_failure, track_upstream_failures
+from api.core.deadline import Deadline, DeadlineExceeded
+
+StreamContent = Union[str, bytes, memoryview]
+
+
+async def _release_when_done(
+    body: AsyncIterable[StreamContent], lease: AdmissionLease, replica: ReplicaLease
+) -> AsyncIterator[StreamContent]:
+    failed: Set[str] = set()
+    iterator = body.__aiter__()
+    try:
+        while True:
+            # Tracked per step: the body may be driven from a different task than dispatch.
+            with track_upstream_failures(failed):
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+            lease.mark_first_token()
+            yield chunk
+    except (asyncio.CancelledError, GeneratorExit):
+        # The client went away: says nothing about the backend's latency or health.
+        lease.abandon()
+        raise
+    finally:
+        replica.release()
+        lease.release(failed=backend_key(replica.url) in failed)
+
+
+async def guarded_dispatch(
+    model_id: str,
+    dispatch: Callable[[str], Awaitable[Response]],
+    deadline: Optional[Deadline] = None,
+) -> Response:
+    """
+    Admits the request through the model_container's governor, picks the replica with
+    the fewest outstanding requests, then dispatches to that replica's base URL.
+
+    Streaming responses keep their slot until the SSE body is fully sent (or the
+    client goes away); everything else releases as soon as the response is built.
+    Latency (first SSE event, full response) and upstream failures (connection errors,
+    timeouts, 5xx) feed the governor's limiter; a handler's own error responses and
+    client cancellations do not.
+    Time spent queued counts against the request's deadline.
+    """
+    try:
+        lease = await (deadline or Deadline()).run(
+            admission_controller.get(model_id).acquire(), "admission"
+        )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except DeadlineExceeded as e:
+        raise HTTPException(
+            status_code=504,
+            detail=str(e),
+            headers={"X-Timed-Out-Phase": e.phase},
+        ) from e
+
+    replica = balancer.pool(model_id).acquire()
+
+    failed: Set[str] = set()
+    try:
+        with track_upstream_failures(failed):
+            response = await dispatch(replica.url)
+    except asyncio.CancelledError:
+        replica.release()
+        lease.abandon()
+        raise
+    except Exception as e:
+        replica.release()
+        lease.release(failed=is_upstream_failure(e) or backend_key(replica.url) in failed)
+        raise
+
+    response.headers["X-Queue-Wait-Ms"] = f"{1000 * lease.wait_time:.1f}"
+    response.headers["X-Upstream-Replica"] = replica.url
+
+    if isinstance(response, StreamingResponse):
+        response.body_iterator = _release_when_done(response.body_iterator, lease, replica)
+    else:
+        replica.release()
+        lease.release(failed=backend_key(replica.url) in failed)
+
+    return response
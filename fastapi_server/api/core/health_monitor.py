@@ -0,0 +1,145 @@
+# File: api/core/health_monitor.py
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional
+
+import httpx
+
+from api.config.gateway_settings import HEALTH_PROBE_INTERVAL, HEALTH_PROBE_TIMEOUT
+from api.core.balancer import ReplicaBalancer, balancer
+from api.core.circuit_breaker import breakers
+from api.core.http_client import client_manager
+
+HealthStatus = Literal["unknown", "online", "offline"]
+
+
+@dataclass
+class ReplicaHealth:
+    url: str
+    status: HealthStatus = "unknown"
+    latency_ms: Optional[float] = None
+    models: List[str] = field(default_factory=list)  # available (/api/tags)
+    loaded_models: Optional[List[str]] = None  # resident in memory (/api/ps)
+    error: Optional[str] = None
+    checked_at: Optional[float] = None
+    consecutive_failures: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "models": self.models,
+            "loaded_models": self.loaded_models,
+            "error": self.error,
+            "checked_at": self.checked_at,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+def _model_names(payload: Any) -> List[str]:
+    return (
+        [m.get("name", "") for m in payload.get("models", [])] if isinstance(payload, dict) else []
+    )
+
+
+class HealthMonitor:
+    """
+    Probes every replica concurrently on a fixed interval in the background.
+
+    Results are kept as a snapshot so /healthz and readiness checks never touch
+    the network, and each round marks replicas up/down on the balancer.
+    """
+
+    def __init__(self, replica_balancer: ReplicaBalancer, interval: float, timeout: float) -> None:
+        self.balancer = replica_balancer
+        self.interval = interval
+        self.timeout = timeout
+        self.replicas: Dict[str, ReplicaHealth] = {
+            url: ReplicaHealth(url=url) for url in replica_balancer.all_urls()
+        }
+        self.rounds = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                print(f"❌ Health probe round failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self) -> None:
+        client = client_manager.get_client()
+        await asyncio.gather(*(self._probe(client, health) for health in self.replicas.values()))
+        self.rounds += 1
+
+    async def _probe(self, client: httpx.AsyncClient, health: ReplicaHealth) -> None:
+        start = time.monotonic()
+        try:
+            tags_resp, ps_resp = await asyncio.gather(
+                client.get(f"{health.url}/api/tags", timeout=self.timeout),
+                client.get(f"{health.url}/api/ps", timeout=self.timeout),
+                return_exceptions=True,
+            )
+            if isinstance(tags_resp, BaseException):
+                raise tags_resp
+            tags_resp.raise_for_status()
+
+            health.status = "online"
+            health.latency_ms = round(1000 * (time.monotonic() - start), 2)
+            health.models = _model_names(tags_resp.json())
+            health.loaded_models = (
+                _model_names(ps_resp.json())
+                if isinstance(ps_resp, httpx.Response) and ps_resp.is_success
+                else None
+            )
+            health.error = None
+            health.consecutive_failures = 0
+        except Exception as e:
+            health.status = "offline"
+            health.latency_ms = None
+            health.error = str(e) or type(e).__name__
+            health.consecutive_failures += 1
+
+        health.checked_at = time.time()
+        self.balancer.mark(health.url, healthy=health.status == "online")
+
+    def is_ready(self, model_id: str) -> bool:
+        pool = self.balancer.pools.get(model_id)
+        if pool is None:
+            return False
+        return any(self.replicas[r.url].status == "online" for r in pool.replicas)
+
+    def model_snapshot(self, model_id: str) -> Optional[Dict[str, Any]]:
+        pool = self.balancer.pools.get(model_id)
+        if pool is None:
+            return None
+        return {
+            "status": "online" if self.is_ready(model_id) else "offline",
+            "replicas": {
+                r.url: {**self.replicas[r.url].to_dict(), "circuit": breakers.state(r.url)}
+                for r in pool.replicas
+            },
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {model_id: self.model_snapshot(model_id) for model_id in self.balancer.pools}
+
+
+health_monitor = HealthMonitor(balancer, HEALTH_PROBE_INTERVAL, HEALTH_PROBE_TIMEOUT)
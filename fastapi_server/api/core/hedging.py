@@ -0,0 +1,178 @@
+# File: api/core/hedging.py
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict, Optional, Set, Tuple, TypeVar
+
+from api.config.gateway_settings import (
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_DELAY_PERCENTILE,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+)
+from api.config.model_routes import model_map
+from api.core.admission import AdmissionLease, admission_controller
+from api.core.balancer import ReplicaLease, balancer
+from api.core.circuit_breaker import backend_key, breakers, is_upstream_failure
+from api.core.latency import LatencyWindow
+
+T = TypeVar("T")
+
+# (base_url, model_name) -> upstream result; a coroutine, since it runs as its own task
+UpstreamCall = Callable[[str, str], Coroutine[Any, Any, T]]
+
+
+@dataclass
+class SiblingLease:
+    model_id: str
+    model_name: str
+    base_url: str
+    admission: AdmissionLease
+    replica: ReplicaLease
+
+    def release(self, completed: bool, failed: bool = False) -> None:
+        self.replica.release()
+        if completed:
+            self.admission.release(failed=failed)
+        else:
+            self.admission.abandon()
+
+
+class HedgeStats:
+    def __init__(self) -> None:
+        self.latency = LatencyWindow()
+        self.calls = 0
+        self.hedges_sent = 0
+        self.hedges_skipped = 0  # delay passed but the sibling had no free capacity
+        self.hedge_wins = 0
+
+    def delay(self) -> float:
+        if len(self.latency) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return max(HEDGE_MIN_DELAY, self.latency.percentile(HEDGE_DELAY_PERCENTILE) or 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedge_delay_ms": round(1000 * self.delay(), 2),
+            "hedges_sent": self.hedges_sent,
+            "hedges_skipped": self.hedges_skipped,
+            "hedge_wins": self.hedge_wins,
+            "primary_latency": self.latency.snapshot(),
+        }
+
+
+class Hedger:
+    """
+    Races a slow primary against a sibling model_container.
+
+    The primary runs alone for a delay equal to its live latency percentile for that
+    phase; if it has not answered by then, the same request goes to the sibling (only
+    if the sibling has a free admission slot and a closed circuit). The first successful
+    answer wins and the other call is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Dict[Tuple[str, str], HedgeStats] = {}
+
+    def _stats(self, base_url: str, phase: str) -> HedgeStats:
+        key = (backend_key(base_url), phase)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = HedgeStats()
+            self.stats[key] = stats
+        return stats
+
+    def typical_latency(self, base_url: str, phase: str) -> Optional[float]:
+        """Median latency of `phase` on this backend, once there are enough samples."""
+        stats = self.stats.get((backend_key(base_url), phase))
+        if stats is None or len(stats.latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return stats.latency.percentile(50)
+
+    def _acquire_sibling(self, model_id: str) -> Optional[SiblingLease]:
+        model_name = model_map.get(model_id)
+        if not model_name or model_id not in balancer.pools:
+            return None
+
+        admission = admission_controller.get(model_id).try_acquire()
+        if admission is None:
+            return None
+
+        replica = balancer.pool(model_id).acquire()
+        if not breakers.allows_request(replica.url):
+            replica.release()
+            admission.abandon()
+            return None
+
+        return SiblingLease(model_id, model_name, f"{replica.url}/v1", admission, replica)
+
+    async def run(
+        self,
+        *,
+        phase: str,
+        base_url: str,
+        model_name: str,
+        call: UpstreamCall[T],
+        hedge_model_id: Optional[str] = None,
+    ) -> T:
+        stats = self._stats(base_url, phase)
+        stats.calls += 1
+        start = time.monotonic()
+
+        if not hedge_model_id:
+            result = await call(base_url, model_name)
+            stats.latency.add(time.monotonic() - start)
+            return result
+
+        primary = asyncio.create_task(call(base_url, model_name))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=stats.delay())
+        except BaseException:
+            # asyncio.wait leaves the task running; on a deadline or client disconnect the
+            # primary must not keep holding its replica and admission slot.
+            primary.cancel()
+            raise
+        if done:
+            if not primary.cancelled() and primary.exception() is None:
+                stats.latency.add(time.monotonic() - start)
+            return primary.result()
+
+        sibling = self._acquire_sibling(hedge_model_id)
+        if sibling is None:
+            stats.hedges_skipped += 1
+            result = await primary
+            stats.latency.add(time.monotonic() - start)
+            return result
+
+        stats.hedges_sent += 1
+        hedge = asyncio.create_task(call(sibling.base_url, sibling.model_name))
+        pending: Set[asyncio.Task[T]] = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled() or task.exception() is not None:
+                        continue
+                    if task is hedge:
+                        stats.hedge_wins += 1
+                    return task.result()
+            # Both failed: surface the primary's error.
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            # A cancelled primary still took at least this long; keep the percentile honest.
+            stats.latency.add(time.monotonic() - start)
+            completed = hedge.done() and not hedge.cancelled()
+            error = hedge.exception() if completed else None
+            sibling.release(
+                completed=completed, failed=error is not None and is_upstream_failure(error)
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {f"{url}#{phase}": s.snapshot() for (url, phase), s in self.stats.items()}
+
+
+hedger = Hedger()
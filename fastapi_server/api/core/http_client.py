@@ -1,25 +1,66 @@
 # app/core/http_client.py
 
+from typing import Dict, Iterable, Optional, cast
+
 import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+def _default_timeout() -> httpx.Timeout:
+    return httpx.Timeout(connect=10.0, read=120.0, write=10.0, pool=10.0)
+
+
+def _default_limits() -> httpx.Limits:
+    return httpx.Limits(max_keepalive_connections=20, max_connections=100)
 
 
 class HTTPClientManager:
-    def __init__(self):
-        self.client = None
+    """
+    Owns the long-lived HTTP connection pools for the gateway.
 
-    async def start(self):
-        timeout = httpx.Timeout(connect=10.0, read=120.0, write=10.0, pool=10.0)
-        limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
-        self.client = httpx.AsyncClient(timeout=timeout, limits=limits)
+    `client` is a general purpose pool, also used by tools with an async path. `openai_clients` caches one AsyncOpenAI
+    client (each with its own keep-alive pool) per backend base_url, shared by all handlers.
+    """
+
+    def __init__(self) -> None:
+        self.client: Optional[httpx.AsyncClient] = None
+        self.openai_clients: Dict[str, AsyncOpenAI] = {}
+
+    async def start(self, openai_base_urls: Iterable[str] = ()):
+        self.client = httpx.AsyncClient(timeout=_default_timeout(), limits=_default_limits())
+        for base_url in openai_base_urls:
+            self.get_openai_client(base_url)
 
     async def stop(self):
+        for openai_client in self.openai_clients.values():
+            await openai_client.close()
+        self.openai_clients.clear()
+
         if self.client:
             await self.client.aclose()
+            self.client = None
 
     def get_client(self) -> httpx.AsyncClient:
         if not self.client:
             raise RuntimeError("HTTPClientManager not started")
         return self.client
 
+    def get_openai_client(self, base_url: str) -> AsyncOpenAI:
+        # Backends not known at startup (e.g. added replicas) are created lazily and cached.
+        openai_client = self.openai_clients.get(base_url)
+        if openai_client is None:
+            openai_client = AsyncOpenAI(
+                base_url=base_url,
+                api_key="dummy",
+                max_retries=0,  # retries are budgeted by api.core.retry, not hidden in the SDK
+                # Typed by newer SDKs as their own httpx fork's client; an httpx one is accepted.
+                http_client=cast(
+                    DefaultAsyncHttpxClient,
+                    httpx.AsyncClient(timeout=_default_timeout(), limits=_default_limits()),
+                ),
+            )
+            self.openai_clients[base_url] = openai_client
+        return openai_client
+
 
 client_manager = HTTPClientManager()
@@ -0,0 +1,330 @@
+# File: api/core/idempotency.py
+
+import asyncio
+import hashlib
+import json
+import time
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from models.llm_request import LLMRequest
+
+from api.config.gateway_settings import (
+    CACHE_LOCK_POLL_INTERVAL,
+    CACHE_LOCK_TTL,
+    CACHE_LOCK_WAIT,
+    IDEMPOTENCY_BACKEND,
+    IDEMPOTENCY_ENABLED,
+    IDEMPOTENCY_MAX_BYTES,
+    IDEMPOTENCY_MAX_ENTRIES,
+    IDEMPOTENCY_TTL,
+)
+from api.core.cache.base import CacheBackend
+from api.core.cache.factory import build_cache_backend
+from api.core.cache.stampede import StampedeGuard
+from api.core.request_key import request_key
+from api.core.singleflight import SharedStream, StreamContent
+
+MAX_KEY_LENGTH = 255
+
+# A retry may recompute its deadline or hedging choice; everything else must match.
+_FINGERPRINT_EXCLUDE = frozenset({"deadline_ms", "hedge"})
+
+_SKIP_HEADERS = ("content-length", "idempotent-replayed")
+
+
+def _text(chunk: StreamContent) -> str:
+    return chunk if isinstance(chunk, str) else bytes(chunk).decode("utf-8")
+
+
+def _is_storable_stream(events: List[str]) -> bool:
+    """A stream that ran to `done` without an error or cancel event."""
+    if not events or "event: done" not in events[-1]:
+        return False
+    return not any("\nevent: error\n" in e or "\nevent: cancel\n" in e for e in events)
+
+
+def _is_storable_body(response: Response) -> bool:
+    if response.status_code >= 400:
+        return False
+    try:
+        body = json.loads(bytes(response.body))
+    except ValueError:
+        return False
+    return isinstance(body, dict) and body.get("type") != "error"
+
+
+class _Execution:
+    def __init__(self, fingerprint: str) -> None:
+        self.fingerprint = fingerprint
+        self.task: Optional["asyncio.Task[Response]"] = None
+        self.stream: Optional[SharedStream] = None
+        self.replayed = False  # answered from a stored result
+        self.lock = AsyncExitStack()  # cross-process fill lock, held until the result is stored
+
+
+class IdempotencyStore:
+    """
+    Deduplicates client retries that carry an `Idempotency-Key` header.
+
+    The first request with a key runs normally; its result is kept for `ttl` seconds and
+    replayed to retries with the same key. A retry that arrives while the first run is
+    still going attaches to it instead: JSON responses are shared when ready, SSE
+    streams are replayed from the first event and then followed live. The run is not
+    cancelled when its client disconnects, since the retry is expected to pick it up.
+
+    The key is scoped to the route, and the request body must match (a different body
+    under the same key is a 422). Only successful results are kept, so a retry after an
+    error or a 4xx/5xx runs again. With a shared backend, a fill lock makes a retry on
+    another process wait for the stored result (up to CACHE_LOCK_WAIT; streams longer
+    than CACHE_LOCK_TTL may run twice).
+    """
+
+    def __init__(
+        self, backend: CacheBackend, enabled: bool, ttl: float, stampede: StampedeGuard
+    ) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl = ttl
+        self.stampede = stampede
+        self._executions: Dict[str, _Execution] = {}
+        self._finishing: Set["asyncio.Task[None]"] = set()
+
+        # Stats
+        self.executed = 0
+        self.attached = 0
+        self.replayed = 0
+        self.conflicts = 0
+        self.stores = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(route: str, idempotency_key: str) -> str:
+        digest = hashlib.sha256(idempotency_key.encode("utf-8")).hexdigest()
+        return f"idem:v1:{route}:{digest}"
+
+    async def serve(
+        self,
+        route: str,
+        idempotency_key: Optional[str],
+        payload: LLMRequest,
+        produce: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        if not self.enabled or idempotency_key is None:
+            return await produce()
+        if not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters",
+            )
+
+        key = self.key(route, idempotency_key)
+        fingerprint = request_key("idem", route, "", payload, _FINGERPRINT_EXCLUDE)
+
+        execution = self._executions.get(key)
+        first = execution is None
+        if execution is None:
+            execution = _Execution(fingerprint)
+            execution.task = asyncio.ensure_future(self._run(key, execution, produce))
+            self._executions[key] = execution
+            execution.task.add_done_callback(lambda task: self._on_produced(key, execution, task))
+        else:
+            self._check_fingerprint(execution.fingerprint, fingerprint)
+            self.attached += 1
+
+        assert execution.task is not None
+        # Shielded: a client that goes away must not cancel the run its retry will join.
+        response = await asyncio.shield(execution.task)
+
+        if execution.stream is not None:
+            return StreamingResponse(
+                execution.stream.subscribe(payload.stage_id, payload.stage_id),
+                status_code=response.status_code,
+                headers=self._headers(response, replayed=not first or execution.replayed),
+                media_type=response.media_type,
+            )
+        if first:
+            return response
+        return Response(
+            content=bytes(response.body),
+            status_code=response.status_code,
+            headers=self._headers(response, replayed=True),
+            media_type=response.media_type,
+        )
+
+    def _check_fingerprint(self, stored: str, fingerprint: str) -> None:
+        if stored != fingerprint:
+            self.conflicts += 1
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used with a different request body",
+            )
+
+    async def _run(
+        self, key: str, execution: _Execution, produce: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        replay = await self._lookup(key, execution)
+        if replay is not None:
+            return replay
+
+        try:
+            filled_elsewhere = await execution.lock.enter_async_context(
+                self.stampede.fill(self.backend, key)
+            )
+            if filled_elsewhere:
+                replay = await self._lookup(key, execution)
+                if replay is not None:
+                    await execution.lock.aclose()
+                    return replay
+
+            self.executed += 1
+            response = await produce()
+        except BaseException:
+            await execution.lock.aclose()
+            raise
+
+        if not isinstance(response, StreamingResponse):
+            if _is_storable_body(response):
+                await self._store(
+                    key,
+                    execution.fingerprint,
+                    response,
+                    {"kind": "json", "body": bytes(response.body).decode("utf-8")},
+                )
+            await execution.lock.aclose()
+        # Streams keep the lock until _finish_stream has stored their events.
+        return response
+
+    def _on_produced(self, key: str, execution: _Execution, task: "asyncio.Task[Response]") -> None:
+        if task.cancelled() or task.exception() is not None:
+            self._release(key, execution)
+            return
+
+        response = task.result()
+        if not isinstance(response, StreamingResponse):
+            self._release(key, execution)
+            return
+
+        def finish() -> None:
+            finishing = asyncio.ensure_future(self._finish_stream(key, execution, response))
+            self._finishing.add(finishing)
+            finishing.add_done_callback(self._finishing.discard)
+
+        # Kept running (and joinable) even if every reader goes away.
+        execution.stream = SharedStream(
+            response.body_iterator, on_done=finish, cancel_when_idle=False
+        )
+
+    async def _finish_stream(self, key: str, execution: _Execution, response: Response) -> None:
+        stream = execution.stream
+        try:
+            if stream is not None and stream.error is None and not execution.replayed:
+                events = [_text(chunk) for chunk in stream.chunks]
+                if _is_storable_stream(events):
+                    await self._store(
+                        key, execution.fingerprint, response, {"kind": "sse", "events": events}
+                    )
+        finally:
+            await execution.lock.aclose()
+            self._release(key, execution)
+
+    def _release(self, key: str, execution: _Execution) -> None:
+        if self._executions.get(key) is execution:
+            del self._executions[key]
+
+    async def _lookup(self, key: str, execution: _Execution) -> Optional[Response]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            return None
+        if raw is None:
+            return None
+
+        entry = json.loads(raw)
+        self._check_fingerprint(entry["fingerprint"], execution.fingerprint)
+        self.replayed += 1
+        execution.replayed = True
+
+        age = max(0.0, time.time() - entry["stored_at"])
+        headers = {**entry["headers"], "Age": str(int(age))}
+        if entry["kind"] == "sse":
+
+            async def events() -> AsyncIterator[str]:
+                for event in entry["events"]:
+                    yield event
+
+            return StreamingResponse(
+                events(),
+                status_code=entry["status_code"],
+                headers=headers,
+                media_type=entry["media_type"],
+            )
+        return JSONResponse(
+            content=json.loads(entry["body"]),
+            status_code=entry["status_code"],
+            headers={**headers, "Idempotent-Replayed": "true"},
+            media_type=entry["media_type"],
+        )
+
+    async def _store(
+        self, key: str, fingerprint: str, response: Response, content: Dict[str, Any]
+    ) -> None:
+        entry = {
+            "stored_at": time.time(),
+            "fingerprint": fingerprint,
+            "status_code": response.status_code,
+            "media_type": response.media_type,
+            "headers": {
+                k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS
+            },
+            **content,
+        }
+        try:
+            await self.backend.set(key, json.dumps(entry).encode("utf-8"), self.ttl)
+            self.stores += 1
+        except Exception:
+            self.errors += 1
+
+    @staticmethod
+    def _headers(response: Response, replayed: bool) -> Dict[str, str]:
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS}
+        if replayed:
+            headers["Idempotent-Replayed"] = "true"
+        return headers
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "in_progress": len(self._executions),
+            "executed": self.executed,
+            "attached": self.attached,
+            "replayed": self.replayed,
+            "conflicts": self.conflicts,
+            "stores": self.stores,
+            "errors": self.errors,
+            "stampede": self.stampede.snapshot(),
+            "backend": self.backend.snapshot(),
+        }
+
+
+idempotency = IdempotencyStore(
+    build_cache_backend(
+        IDEMPOTENCY_BACKEND,
+        namespace="idempotency",
+        max_entries=IDEMPOTENCY_MAX_ENTRIES,
+        max_bytes=IDEMPOTENCY_MAX_BYTES,
+        default_ttl=IDEMPOTENCY_TTL,
+    ),
+    enabled=IDEMPOTENCY_ENABLED,
+    ttl=IDEMPOTENCY_TTL,
+    stampede=StampedeGuard(
+        lock_ttl=CACHE_LOCK_TTL, wait=CACHE_LOCK_WAIT, poll_interval=CACHE_LOCK_POLL_INTERVAL
+    ),
+)
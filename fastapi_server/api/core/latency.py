@@ -0,0 +1,35 @@
+# File: api/core/latency.py
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyWindow:
+    """Rolling window of recent latency samples (seconds)."""
+
+    def __init__(self, size: int = 200) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(1000 * value, 2) if value is not None else None
+
+        return {
+            "samples": len(self.samples),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+        }
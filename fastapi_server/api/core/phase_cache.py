@@ -0,0 +1,263 @@
+# File: api/core/phase_cache.py
+
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence
+
+from openai.types.chat import ChatCompletionMessageToolCall
+
+from api.config.gateway_settings import (
+    CACHE_LOCK_POLL_INTERVAL,
+    CACHE_LOCK_TTL,
+    CACHE_LOCK_WAIT,
+    PHASE_CACHE_BACKEND,
+    PHASE_CACHE_ENABLED,
+    PHASE_CACHE_MAX_BYTES,
+    PHASE_CACHE_MAX_ENTRIES,
+    PHASE_CACHE_PLAN_TTL,
+    PHASE_CACHE_SYNTHESIS_TTL,
+)
+from api.core.cache.base import CacheBackend
+from api.core.cache.factory import build_cache_backend
+from api.core.cache.stampede import StampedeGuard
+from api.core.response_cache import CacheControl
+
+CachedPhase = Literal["tool_selection", "synthesis"]
+
+# Reported per phase in the stage output.
+PhaseCacheStatus = Literal["hit", "miss"]
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case and whitespace differences do not change which tools are called."""
+    return " ".join(prompt.split()).casefold()
+
+
+def _canonical_arguments(arguments: str) -> Any:
+    try:
+        return json.loads(arguments)
+    except ValueError:
+        return arguments
+
+
+class PhaseCache:
+    """
+    Caches the two model phases of a /completion toolchain request separately.
+
+    Plans: the validated tool calls from tool selection, keyed on the normalized user
+    prompt, the system prompt, the model and the ToolRegistry version. A hit skips
+    phase 1 only; the tools still run, so their data stays current.
+
+    Synthesis: the final text, keyed on the same request plus every tool call and its
+    result, so unchanged results are not synthesized again.
+
+    A phase is cached only at temperature 0, and Cache-Control is honoured like the
+    response cache (no-store, no-cache, max-age). A caller that misses holds the key's
+    fill lock while it computes the phase, so other processes wait for its entry.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        enabled: bool,
+        plan_ttl: float,
+        synthesis_ttl: float,
+        stampede: StampedeGuard,
+    ) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.stampede = stampede
+        self.ttls: Dict[CachedPhase, float] = {
+            "tool_selection": plan_ttl,
+            "synthesis": synthesis_ttl,
+        }
+
+        # Stats
+        self.stats: Dict[CachedPhase, Dict[str, int]] = {
+            phase: {"hits": 0, "misses": 0, "filled_elsewhere": 0, "stores": 0}
+            for phase in self.ttls
+        }
+        self.errors = 0
+
+    def _key(
+        self, phase: CachedPhase, control: CacheControl, temperature: float, **parts: Any
+    ) -> Optional[str]:
+        """None when this phase must not be cached for the request."""
+        if not self.enabled or control.no_store or temperature != 0:
+            return None
+        canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return f"phase:v1:{phase}:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def plan_key(
+        self,
+        control: CacheControl,
+        *,
+        model_name: str,
+        registry_version: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> Optional[str]:
+        return self._key(
+            "tool_selection",
+            control,
+            temperature,
+            model_name=model_name,
+            registry_version=registry_version,
+            system_prompt=system_prompt,
+            user_prompt=normalize_prompt(user_prompt),
+            max_tokens=max_tokens,
+        )
+
+    def synthesis_key(
+        self,
+        control: CacheControl,
+        *,
+        model_name: str,
+        registry_version: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        tool_calls: Sequence[ChatCompletionMessageToolCall],
+        tool_results: Dict[str, str],
+    ) -> Optional[str]:
+        # Call ids differ between upstream responses; the calls and results are what count.
+        calls = [
+            {
+                "name": call.function.name,
+                "arguments": _canonical_arguments(call.function.arguments),
+                "result": tool_results.get(call.id),
+            }
+            for call in tool_calls
+        ]
+        return self._key(
+            "synthesis",
+            control,
+            temperature,
+            model_name=model_name,
+            registry_version=registry_version,
+            system_prompt=system_prompt,
+            user_prompt=normalize_prompt(user_prompt),
+            max_tokens=max_tokens,
+            calls=calls,
+        )
+
+    @asynccontextmanager
+    async def plan(
+        self, key: Optional[str], control: CacheControl
+    ) -> AsyncIterator[Optional[List[ChatCompletionMessageToolCall]]]:
+        """
+        Yields the cached plan, or None when the caller must select tools (and then
+        `store_plan` them) before leaving the block.
+        """
+        async with self._filling("tool_selection", key, control) as value:
+            yield (
+                [ChatCompletionMessageToolCall.model_validate(call) for call in value]
+                if value is not None
+                else None
+            )
+
+    async def store_plan(
+        self, key: Optional[str], tool_calls: Sequence[ChatCompletionMessageToolCall]
+    ) -> None:
+        await self._store("tool_selection", key, [call.model_dump() for call in tool_calls])
+
+    @asynccontextmanager
+    async def synthesis(
+        self, key: Optional[str], control: CacheControl
+    ) -> AsyncIterator[Optional[str]]:
+        """Yields the cached text, or None when the caller must synthesize (and store) it."""
+        async with self._filling("synthesis", key, control) as value:
+            yield str(value) if value is not None else None
+
+    async def store_synthesis(self, key: Optional[str], text: str) -> None:
+        await self._store("synthesis", key, text)
+
+    @asynccontextmanager
+    async def _filling(
+        self, phase: CachedPhase, key: Optional[str], control: CacheControl
+    ) -> AsyncIterator[Optional[Any]]:
+        if key is None or control.no_cache:
+            if key is not None:
+                self.stats[phase]["misses"] += 1
+            yield None
+            return
+
+        value = await self._read(key, control.max_age)
+        if value is not None:
+            self.stats[phase]["hits"] += 1
+            yield value
+            return
+
+        # Another gateway process may already be computing this phase; wait for its entry.
+        async with self.stampede.fill(self.backend, key) as filled_elsewhere:
+            value = await self._read(key, None) if filled_elsewhere else None
+            if value is not None:
+                self.stats[phase]["filled_elsewhere"] += 1
+            else:
+                self.stats[phase]["misses"] += 1
+            yield value
+
+    async def _read(self, key: str, max_age: Optional[float]) -> Optional[Any]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if max_age is not None and time.time() - entry["stored_at"] > max_age:
+            return None
+        return entry["value"]
+
+    async def _store(self, phase: CachedPhase, key: Optional[str], value: Any) -> None:
+        if key is None:
+            return
+        entry = {"stored_at": time.time(), "value": value}
+        try:
+            await self.backend.set(key, json.dumps(entry).encode("utf-8"), self.ttls[phase])
+            self.stats[phase]["stores"] += 1
+        except Exception:
+            self.errors += 1
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        phases: Dict[str, Any] = {}
+        for phase, stats in self.stats.items():
+            lookups = stats["hits"] + stats["misses"] + stats["filled_elsewhere"]
+            phases[phase] = {
+                **stats,
+                "hit_ratio": round(1 - stats["misses"] / lookups, 4) if lookups else None,
+                "ttl": self.ttls[phase],
+            }
+        return {
+            "enabled": self.enabled,
+            **phases,
+            "errors": self.errors,
+            "stampede": self.stampede.snapshot(),
+            "backend": self.backend.snapshot(),
+        }
+
+
+phase_cache = PhaseCache(
+    build_cache_backend(
+        PHASE_CACHE_BACKEND,
+        namespace="phase",
+        max_entries=PHASE_CACHE_MAX_ENTRIES,
+        max_bytes=PHASE_CACHE_MAX_BYTES,
+        default_ttl=PHASE_CACHE_PLAN_TTL,
+    ),
+    enabled=PHASE_CACHE_ENABLED,
+    plan_ttl=PHASE_CACHE_PLAN_TTL,
+    synthesis_ttl=PHASE_CACHE_SYNTHESIS_TTL,
+    stampede=StampedeGuard(
+        lock_ttl=CACHE_LOCK_TTL, wait=CACHE_LOCK_WAIT, poll_interval=CACHE_LOCK_POLL_INTERVAL
+    ),
+)
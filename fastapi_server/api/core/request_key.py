@@ -0,0 +1,29 @@
+# File: api/core/request_key.py
+
+import hashlib
+import json
+from typing import AbstractSet, Any
+
+from models.llm_request import LLMRequest
+
+
+def request_key(
+    namespace: str,
+    endpoint: str,
+    model_name: str,
+    payload: LLMRequest,
+    exclude: AbstractSet[str] = frozenset({"stage_id"}),
+    **extra: Any,
+) -> str:
+    """Stable hash of a canonicalized LLMRequest (minus `exclude`) and its routing."""
+    canonical = json.dumps(
+        {
+            "endpoint": endpoint,
+            "model_name": model_name,
+            **payload.model_dump(exclude=set(exclude)),
+            **extra,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return f"{namespace}:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,227 @@
+# File: api/core/response_cache.py
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Literal, Optional
+
+from fastapi.responses import JSONResponse, Response
+from models.llm_request import LLMRequest
+
+from api.config.gateway_settings import (
+    CACHE_LOCK_POLL_INTERVAL,
+    CACHE_LOCK_TTL,
+    CACHE_LOCK_WAIT,
+    RESPONSE_CACHE_BACKEND,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL,
+)
+from api.core.cache.base import CacheBackend
+from api.core.cache.factory import build_cache_backend
+from api.core.cache.stampede import StampedeGuard
+from api.core.request_key import request_key
+
+Endpoint = Literal["chat", "toolchain"]
+
+CACHEABLE_TYPES = ("text", "tool_results")
+
+# Per-request fields that do not change what the model produces.
+_KEY_EXCLUDE = frozenset({"stage_id", "stream", "hedge", "deadline_ms"})
+
+
+@dataclass(frozen=True)
+class CacheControl:
+    no_store: bool = False  # neither read nor write the cache
+    no_cache: bool = False  # skip the lookup, but store the fresh result
+    max_age: Optional[float] = None  # only accept entries at most this old (seconds)
+
+    @classmethod
+    def parse(cls, header: Optional[str]) -> "CacheControl":
+        no_store = no_cache = False
+        max_age: Optional[float] = None
+        for directive in (header or "").lower().split(","):
+            name, _, value = directive.strip().partition("=")
+            if name == "no-store":
+                no_store = True
+            elif name == "no-cache":
+                no_cache = True
+            elif name == "max-age":
+                try:
+                    max_age = max(0.0, float(value.strip().strip('"')))
+                except ValueError:
+                    pass
+        return cls(no_store=no_store, no_cache=no_cache or max_age == 0, max_age=max_age)
+
+
+def is_deterministic(endpoint: Endpoint, payload: LLMRequest) -> bool:
+    """Only temperature-0 phases are guaranteed to repeat their output."""
+    if payload.temperature[0] != 0:
+        return False
+    if endpoint == "toolchain" and payload.synthesis and payload.temperature[1] != 0:
+        return False
+    return True
+
+
+def storable_entry(stage_id: str, response: Response) -> Optional[Dict[str, Any]]:
+    """Cache entry for a successful text/tool_results response (None if not cacheable)."""
+    if not isinstance(response, JSONResponse) or response.status_code != 200:
+        return None
+    try:
+        body = json.loads(bytes(response.body))
+    except ValueError:
+        return None
+    if body.get("type") not in CACHEABLE_TYPES or body.get("timed_out_phase"):
+        return None
+
+    output_stage_id = str(body.get("stage_id", ""))
+    suffix = output_stage_id[len(stage_id) :] if output_stage_id.startswith(stage_id) else None
+    return {"stored_at": time.time(), "stage_id_suffix": suffix, "body": body}
+
+
+def entry_response(entry: Dict[str, Any], stage_id: str, headers: Dict[str, str]) -> JSONResponse:
+    """Replays a stored entry for the caller's stage_id."""
+    body: Dict[str, Any] = dict(entry["body"])
+    if entry["stage_id_suffix"] is not None:
+        body["stage_id"] = stage_id + entry["stage_id_suffix"]
+    if "attempts" in body:
+        body["attempts"] = None  # nothing was sent upstream for this response
+    if "tool_cache" in body:
+        body["tool_cache"] = None  # no tool ran for this response either
+    if "phase_cache" in body:
+        body["phase_cache"] = None
+    return JSONResponse(content=body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    Exact-match cache for /completion responses, checked before admission so hits
+    never reach a backend.
+
+    Only deterministic requests are cached, and only successful text/tool_results
+    outputs are stored. Entries keep the stage_id suffix the handler added
+    (e.g. "-chat-final") and are restamped with the caller's stage_id on a hit.
+    """
+
+    def __init__(
+        self, backend: CacheBackend, enabled: bool, ttl: float, stampede: StampedeGuard
+    ) -> None:
+        self.backend = backend
+        self.stampede = stampede
+        self.enabled = enabled
+        self.ttl = ttl
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(endpoint: Endpoint, model_name: str, payload: LLMRequest) -> str:
+        return request_key("resp:v1", endpoint, model_name, payload, _KEY_EXCLUDE)
+
+    async def serve(
+        self,
+        endpoint: Endpoint,
+        payload: LLMRequest,
+        model_name: str,
+        cache_control: Optional[str],
+        produce: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        control = CacheControl.parse(cache_control)
+        if not self.enabled or control.no_store or not is_deterministic(endpoint, payload):
+            self.bypassed += 1
+            response = await produce()
+            response.headers["X-Cache"] = "BYPASS"
+            return response
+
+        key = self.key(endpoint, model_name, payload)
+
+        if control.no_cache:
+            return await self._produce(key, payload.stage_id, produce)
+
+        hit = await self._lookup(key, payload.stage_id, control.max_age)
+        if hit is not None:
+            return hit
+
+        # Another gateway process may already be computing this key; wait for its entry.
+        async with self.stampede.fill(self.backend, key) as filled_elsewhere:
+            if filled_elsewhere:
+                hit = await self._lookup(key, payload.stage_id, None)
+                if hit is not None:
+                    return hit
+            return await self._produce(key, payload.stage_id, produce)
+
+    async def _produce(
+        self, key: str, stage_id: str, produce: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        self.misses += 1
+        response = await produce()
+        await self._store(key, stage_id, response)
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    async def _lookup(
+        self, key: str, stage_id: str, max_age: Optional[float]
+    ) -> Optional[JSONResponse]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            return None
+        if raw is None:
+            return None
+
+        entry = json.loads(raw)
+        age = max(0.0, time.time() - entry["stored_at"])
+        if max_age is not None and age > max_age:
+            return None
+
+        self.hits += 1
+        return entry_response(entry, stage_id, {"X-Cache": "HIT", "Age": str(int(age))})
+
+    async def _store(self, key: str, stage_id: str, response: Response) -> None:
+        entry = storable_entry(stage_id, response)
+        if entry is None:
+            return
+        try:
+            await self.backend.set(key, json.dumps(entry).encode("utf-8"), self.ttl)
+            self.stores += 1
+        except Exception:
+            self.errors += 1
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "errors": self.errors,
+            "stampede": self.stampede.snapshot(),
+            "backend": self.backend.snapshot(),
+        }
+
+
+response_cache = ResponseCache(
+    build_cache_backend(
+        RESPONSE_CACHE_BACKEND,
+        namespace="response",
+        max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=RESPONSE_CACHE_MAX_BYTES,
+        default_ttl=RESPONSE_CACHE_TTL,
+    ),
+    enabled=RESPONSE_CACHE_ENABLED,
+    ttl=RESPONSE_CACHE_TTL,
+    stampede=StampedeGuard(
+        lock_ttl=CACHE_LOCK_TTL, wait=CACHE_LOCK_WAIT, poll_interval=CACHE_LOCK_POLL_INTERVAL
+    ),
+)
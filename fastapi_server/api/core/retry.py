@@ -0,0 +1,139 @@
+# File: api/core/retry.py
+
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import openai
+from tenacity import AsyncRetrying, RetryCallState, stop_after_attempt, wait_random_exponential
+
+from api.config.gateway_settings import (
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_BUDGET_CAPACITY,
+    RETRY_BUDGET_RATIO,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_PHASES,
+)
+from api.core.circuit_breaker import is_upstream_failure
+
+T = TypeVar("T")
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Connection errors and 5xx are worth another try. Timeouts are not: the backend may
+    still be working on the request, and retrying it only adds load.
+    """
+    if isinstance(error, openai.APITimeoutError):
+        return False
+    return is_upstream_failure(error)
+
+
+class RetryBudget:
+    """
+    Token bucket shared by all upstream calls: every call deposits `ratio` tokens and
+    every retry spends one, so retries can add at most `ratio` extra load once the
+    initial `capacity` burst is used up.
+    """
+
+    def __init__(self, ratio: float, capacity: float) -> None:
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+
+        # Stats
+        self.calls = 0
+        self.retries = 0
+        self.denied = 0
+
+    def deposit(self) -> None:
+        self.calls += 1
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.retries += 1
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "tokens": round(self.tokens, 2),
+            "calls": self.calls,
+            "retries": self.retries,
+            "denied": self.denied,
+        }
+
+
+class RetryPolicy:
+    """
+    Retries idempotent upstream calls with jittered exponential backoff (tenacity),
+    subject to the shared RetryBudget. Calls in other phases run exactly once.
+    """
+
+    def __init__(
+        self,
+        budget: RetryBudget,
+        phases: frozenset[str],
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> None:
+        self.budget = budget
+        self.phases = phases
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _should_retry(self, retry_state: RetryCallState) -> bool:
+        # Checked before tenacity's stop condition, so never spend a token on a retry
+        # that would not happen anyway.
+        outcome = retry_state.outcome
+        if outcome is None or not outcome.failed:
+            return False
+        if retry_state.attempt_number >= self.max_attempts:
+            return False
+        error = outcome.exception()
+        return error is not None and is_retryable(error) and self.budget.try_withdraw()
+
+    async def run(
+        self,
+        phase: str,
+        call: Callable[[], Awaitable[T]],
+        attempts: Optional[Dict[str, int]] = None,
+    ) -> T:
+        """Runs `call`, counting every attempt into `attempts[phase]` when given."""
+        self.budget.deposit()
+
+        def count() -> None:
+            if attempts is not None:
+                attempts[phase] = attempts.get(phase, 0) + 1
+
+        if phase not in self.phases:
+            count()
+            return await call()
+
+        retrying = AsyncRetrying(
+            retry=self._should_retry,
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_random_exponential(multiplier=self.backoff_base, max=self.backoff_max),
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                count()
+                return await call()
+        raise AssertionError("unreachable: tenacity reraises the last error")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"phases": sorted(self.phases), "budget": self.budget.snapshot()}
+
+
+retry_policy = RetryPolicy(
+    RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_CAPACITY),
+    phases=RETRY_PHASES,
+    max_attempts=RETRY_MAX_ATTEMPTS,
+    backoff_base=RETRY_BACKOFF_BASE,
+    backoff_max=RETRY_BACKOFF_MAX,
+)
@@ -0,0 +1,288 @@
+# File: api/core/semantic_cache.py
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi.responses import Response
+from models.llm_request import LLMRequest
+
+from api.config.gateway_settings import (
+    SEMANTIC_CACHE_EMBED_MODEL,
+    SEMANTIC_CACHE_EMBED_TIMEOUT,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_NEAR_MISS_MARGIN,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+)
+from api.core.admission import admission_controller
+from api.core.balancer import balancer
+from api.core.circuit_breaker import breakers
+from api.core.http_client import client_manager
+from api.core.latency import LatencyWindow
+from api.core.request_key import request_key
+from api.core.response_cache import (
+    CacheControl,
+    Endpoint,
+    entry_response,
+    is_deterministic,
+    storable_entry,
+)
+
+# Everything except the user prompt must match exactly for a semantic hit.
+_CONTEXT_EXCLUDE = frozenset({"stage_id", "stream", "hedge", "deadline_ms", "user_prompt"})
+
+_OPT_OUT = ("off", "bypass", "no", "false")
+
+
+def context_id(endpoint: Endpoint, model_name: str, payload: LLMRequest) -> int:
+    digest = request_key("semantic", endpoint, model_name, payload, _CONTEXT_EXCLUDE)
+    return int(digest[-15:], 16)  # fits an int64 column
+
+
+class VectorIndex:
+    """
+    Fixed-capacity nearest-neighbour index for one model_container.
+
+    Unit-normalized embeddings live in one preallocated float32 matrix, so a lookup is
+    a single matrix-vector product (cosine similarity). Each row carries a context id
+    (the rest of the request), an expiry and a last-used time. New entries take an
+    empty or expired row, else the least recently used one.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.vectors: Optional[np.ndarray] = None  # float32[capacity, dim], sized on first add
+        self.contexts = np.zeros(capacity, dtype=np.int64)
+        self.expires_at = np.zeros(capacity, dtype=np.float64)  # 0: empty row
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.entries: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.evictions = 0
+
+    def live(self, now: float) -> int:
+        return int((self.expires_at > now).sum())
+
+    def search(self, vector: np.ndarray, context: int, now: float) -> Tuple[Optional[int], float]:
+        if self.vectors is None or self.vectors.shape[1] != vector.shape[0]:
+            return None, 0.0
+        candidates = (self.expires_at > now) & (self.contexts == context)
+        if not candidates.any():
+            return None, 0.0
+        scores = self.vectors @ vector
+        scores[~candidates] = -np.inf
+        row = int(scores.argmax())
+        return row, float(scores[row])
+
+    def add(
+        self, vector: np.ndarray, context: int, entry: Dict[str, Any], now: float, ttl: float
+    ) -> None:
+        if self.vectors is None or self.vectors.shape[1] != vector.shape[0]:
+            # First entry, or the embedding model changed: start over at the new width.
+            self.vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            self.expires_at[:] = 0
+            self.entries = [None] * self.capacity
+
+        free = np.flatnonzero(self.expires_at <= now)
+        if len(free):
+            row = int(free[0])
+        else:
+            row = int(np.argmin(self.last_used))
+            self.evictions += 1
+
+        self.vectors[row] = vector
+        self.contexts[row] = context
+        self.expires_at[row] = now + ttl
+        self.last_used[row] = now
+        self.entries[row] = entry
+
+    def touch(self, row: int, now: float) -> None:
+        self.last_used[row] = now
+
+    def nbytes(self) -> int:
+        vectors = self.vectors.nbytes if self.vectors is not None else 0
+        return int(vectors + self.contexts.nbytes + self.expires_at.nbytes + self.last_used.nbytes)
+
+
+class SemanticCache:
+    """
+    Reuses /completion answers for rephrased user prompts.
+
+    The user prompt is embedded through the container's embeddings endpoint and looked
+    up in that container's VectorIndex; a hit needs the rest of the request to match
+    exactly and a cosine similarity of at least `threshold`. Runs after the exact-match
+    cache misses, only for deterministic requests, and can be skipped per request with
+    `X-Semantic-Cache: off` (or Cache-Control: no-store). Embedding failures bypass it.
+    Embedding calls take a slot on the container's governor like any other request, but
+    never queue for one: when the container is saturated the cache is bypassed instead.
+
+    Hit quality is tracked as the similarity distribution of hits, plus near misses
+    (best candidate within `near_miss_margin` below the threshold) for tuning.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        threshold: float,
+        near_miss_margin: float,
+        max_entries: int,
+        ttl: float,
+        embed_model: str,
+        embed_timeout: float,
+    ) -> None:
+        self.enabled = enabled
+        self.threshold = threshold
+        self.near_miss_margin = near_miss_margin
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embed_model = embed_model
+        self.embed_timeout = embed_timeout
+        self.indexes: Dict[str, VectorIndex] = {}
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.near_misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.embed_errors = 0
+        self.embed_shed = 0
+        self.hit_scores: Deque[float] = deque(maxlen=500)
+        self.embed_latency = LatencyWindow()
+
+    async def serve(
+        self,
+        endpoint: Endpoint,
+        payload: LLMRequest,
+        model_id: str,
+        model_name: str,
+        cache_control: Optional[str],
+        opt: Optional[str],
+        produce: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        control = CacheControl.parse(cache_control)
+        if (
+            not self.enabled
+            or control.no_store
+            or (opt or "").strip().lower() in _OPT_OUT
+            or not is_deterministic(endpoint, payload)
+            or model_id not in balancer.pools
+        ):
+            self.bypassed += 1
+            return await produce()
+
+        vector = await self._embed(model_id, model_name, payload.user_prompt)
+        if vector is None:
+            self.bypassed += 1
+            return await produce()
+
+        index = self.indexes.get(model_id)
+        if index is None:
+            index = self.indexes[model_id] = VectorIndex(self.max_entries)
+        context = context_id(endpoint, model_name, payload)
+        now = time.time()
+
+        row, score = index.search(vector, context, now) if not control.no_cache else (None, 0.0)
+        entry = index.entries[row] if row is not None else None
+        if entry is not None and score >= self.threshold:
+            age = now - entry["stored_at"]
+            if control.max_age is None or age <= control.max_age:
+                index.touch(row, now)  # type: ignore[arg-type]
+                self.hits += 1
+                self.hit_scores.append(score)
+                return entry_response(
+                    entry,
+                    payload.stage_id,
+                    {
+                        "X-Semantic-Cache": "HIT",
+                        "X-Semantic-Similarity": f"{score:.4f}",
+                        "Age": str(int(age)),
+                    },
+                )
+        elif entry is not None and score >= self.threshold - self.near_miss_margin:
+            self.near_misses += 1
+
+        self.misses += 1
+        response = await produce()
+        entry = storable_entry(payload.stage_id, response)
+        if entry is not None:
+            index.add(vector, context, entry, time.time(), self.ttl)
+            self.stores += 1
+        response.headers["X-Semantic-Cache"] = "MISS"
+        return response
+
+    async def _embed(self, model_id: str, model_name: str, text: str) -> Optional[np.ndarray]:
+        lease = admission_controller.get(model_id).try_acquire()
+        if lease is None:
+            self.embed_shed += 1
+            return None
+        replica = balancer.pool(model_id).acquire()
+        base_url = f"{replica.url}/v1"
+        try:
+            # No breaker guard: a missing embedding model must not open the chat circuit.
+            if not breakers.allows_request(base_url):
+                return None
+            start = time.monotonic()
+            result = await asyncio.wait_for(
+                client_manager.get_openai_client(base_url).embeddings.create(
+                    model=self.embed_model or model_name, input=text
+                ),
+                timeout=self.embed_timeout,
+            )
+            self.embed_latency.add(time.monotonic() - start)
+        except Exception:
+            self.embed_errors += 1
+            return None
+        finally:
+            replica.release()
+            # No latency sample: embedding times say nothing about the chat limit.
+            lease.abandon()
+
+        vector = np.asarray(result.data[0].embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        now = time.time()
+        scores = np.asarray(self.hit_scores, dtype=np.float64)
+        quantiles = np.percentile(scores, [10, 50, 90]) if len(scores) else [None] * 3
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "near_misses": self.near_misses,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "embed_errors": self.embed_errors,
+            "embed_shed": self.embed_shed,
+            "hit_similarity": {
+                f"p{pct}": round(float(q), 4) if q is not None else None
+                for pct, q in zip((10, 50, 90), quantiles, strict=True)
+            },
+            "embed_latency": self.embed_latency.snapshot(),
+            "indexes": {
+                model_id: {
+                    "entries": index.live(now),
+                    "capacity": index.capacity,
+                    "bytes": index.nbytes(),
+                    "evictions": index.evictions,
+                }
+                for model_id, index in self.indexes.items()
+            },
+        }
+
+
+semantic_cache = SemanticCache(
+    enabled=SEMANTIC_CACHE_ENABLED,
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    near_miss_margin=SEMANTIC_CACHE_NEAR_MISS_MARGIN,
+    max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+    ttl=SEMANTIC_CACHE_TTL,
+    embed_model=SEMANTIC_CACHE_EMBED_MODEL,
+    embed_timeout=SEMANTIC_CACHE_EMBED_TIMEOUT,
+)
@@ -0,0 +1,253 @@
+# File: api/core/singleflight.py
+
+import asyncio
+import functools
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+from models.events import ErrorPayload, restamp_stage_id, serialize_sse_event
+from models.llm_request import LLMRequest
+
+from api.core.deadline import Deadline, DeadlineExceeded
+from api.core.request_key import request_key
+from api.core.response_cache import Endpoint, is_deterministic
+
+StreamContent = Any  # str | bytes | memoryview, as produced by the handlers
+
+
+class SharedStream:
+    """
+    Fans one SSE body out to every coalesced client.
+
+    A background pump drains the leader's body into a buffer; each subscriber replays
+    the buffer from the first event and then follows live, so late joiners still see
+    the whole sequence. If every subscriber goes away the pump is cancelled, which
+    closes the upstream stream and releases its admission slot (unless
+    `cancel_when_idle` is False, for callers that keep the result for later readers).
+    """
+
+    def __init__(
+        self,
+        body: AsyncIterable[StreamContent],
+        on_done: Callable[[], None],
+        cancel_when_idle: bool = True,
+    ) -> None:
+        self.chunks: List[StreamContent] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.cancel_when_idle = cancel_when_idle
+        self._changed = asyncio.Condition()
+        self._on_done = on_done
+        self._pump_task = asyncio.create_task(self._pump(body), name="singleflight-stream")
+
+    async def _pump(self, body: AsyncIterable[StreamContent]) -> None:
+        try:
+            async for chunk in body:
+                self.chunks.append(chunk)
+                async with self._changed:
+                    self._changed.notify_all()
+        except BaseException as e:
+            self.error = e
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            self.done = True
+            self._on_done()
+            async with self._changed:
+                self._changed.notify_all()
+
+    def _has_news(self, index: int) -> bool:
+        return index < len(self.chunks) or self.done
+
+    async def subscribe(self, leader_stage_id: str, stage_id: str) -> AsyncIterator[StreamContent]:
+        self.subscribers += 1
+        try:
+            index = 0
+            while True:
+                while index < len(self.chunks):
+                    chunk = self.chunks[index]
+                    index += 1
+                    if isinstance(chunk, (bytes, memoryview)):
+                        text = bytes(chunk).decode("utf-8")
+                        chunk = restamp_stage_id(text, leader_stage_id, stage_id).encode("utf-8")
+                    else:
+                        chunk = restamp_stage_id(chunk, leader_stage_id, stage_id)
+                    yield chunk
+                if self.done:
+                    if self.error is not None and not isinstance(
+                        self.error, asyncio.CancelledError
+                    ):
+                        raise self.error
+                    return
+                async with self._changed:
+                    await self._changed.wait_for(functools.partial(self._has_news, index))
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done and self.cancel_when_idle:
+                self._pump_task.cancel()
+
+
+class _Flight:
+    def __init__(self, leader_stage_id: str, task: "asyncio.Task[Response]") -> None:
+        self.leader_stage_id = leader_stage_id
+        self.task = task
+        self.waiters = 0
+        self.stream: Optional[SharedStream] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests onto one upstream call.
+
+    The first request for a key (the leader) runs the dispatch; duplicates that arrive
+    while it is in flight wait for the same result. JSON responses are copied with the
+    caller's stage_id; streaming responses are shared through a SharedStream. A key is
+    released as soon as its JSON response is ready, or when its stream ends.
+
+    Only deterministic (temperature-0) requests are coalesced; sampled ones each get
+    their own completion. A follower waits only as long as its own deadline allows.
+    """
+
+    def __init__(self) -> None:
+        self.flights: Dict[str, _Flight] = {}
+
+        # Stats
+        self.leaders = 0
+        self.followers = 0
+
+    @staticmethod
+    def key(endpoint: str, model_name: str, payload: LLMRequest, deadline: Deadline) -> str:
+        return request_key("flight", endpoint, model_name, payload, budget=deadline.budget)
+
+    async def serve(
+        self,
+        endpoint: str,
+        payload: LLMRequest,
+        model_name: str,
+        deadline: Deadline,
+        produce: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        kind: Endpoint = "toolchain" if endpoint.endswith("/toolchain") else "chat"
+        if not is_deterministic(kind, payload):
+            return await produce()
+
+        key = self.key(endpoint, model_name, payload, deadline)
+        flight = self.flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = self._start(key, payload.stage_id, produce)
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        flight.waiters += 1
+        try:
+            # The leader's dispatch enforces the leader's deadline; followers enforce theirs.
+            waiting = asyncio.shield(flight.task)
+            response = await (waiting if leader else deadline.run(waiting, "coalesced"))
+        except asyncio.CancelledError:
+            # Nobody left to deliver to: stop the upstream work.
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        except DeadlineExceeded as e:
+            raise HTTPException(
+                status_code=504,
+                detail=str(e),
+                headers={"X-Timed-Out-Phase": e.phase},
+            ) from e
+        finally:
+            flight.waiters -= 1
+
+        role = "leader" if leader else "follower"
+        if flight.stream is not None:
+            body = flight.stream.subscribe(flight.leader_stage_id, payload.stage_id)
+            return StreamingResponse(
+                body if leader else self._follow(body, payload.stage_id, deadline),
+                status_code=response.status_code,
+                headers=self._copy_headers(response, role),
+                media_type=response.media_type,
+            )
+        if leader:
+            response.headers["X-Singleflight"] = role
+            return response
+        return self._copy_response(response, flight.leader_stage_id, payload.stage_id, role)
+
+    def _start(
+        self, key: str, leader_stage_id: str, produce: Callable[[], Awaitable[Response]]
+    ) -> _Flight:
+        flight = _Flight(leader_stage_id, asyncio.ensure_future(produce()))
+        self.flights[key] = flight
+        flight.task.add_done_callback(lambda task: self._on_produced(key, flight, task))
+        return flight
+
+    @staticmethod
+    async def _follow(
+        body: AsyncIterator[StreamContent], stage_id: str, deadline: Deadline
+    ) -> AsyncIterator[StreamContent]:
+        """A follower's copy of the shared stream, cut short with an error event at its deadline."""
+        try:
+            async for chunk in deadline.iterate(body, "coalesced"):
+                yield chunk
+        except DeadlineExceeded as e:
+            yield serialize_sse_event(
+                id="0",
+                event="error",
+                data=ErrorPayload(stage_id=stage_id, error=str(e), timed_out_phase=e.phase),
+            )
+
+    def _on_produced(self, key: str, flight: _Flight, task: "asyncio.Task[Response]") -> None:
+        def release() -> None:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+
+        if task.cancelled() or task.exception() is not None:
+            release()
+            return
+
+        response = task.result()
+        if isinstance(response, StreamingResponse):
+            # Stays joinable until the stream ends; late followers replay the buffer.
+            flight.stream = SharedStream(response.body_iterator, on_done=release)
+        else:
+            release()
+
+    @staticmethod
+    def _copy_headers(response: Response, role: str) -> Dict[str, str]:
+        skip = ("content-length", "x-singleflight")
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in skip}
+        headers["x-singleflight"] = role
+        return headers
+
+    def _copy_response(
+        self, response: Response, leader_stage_id: str, stage_id: str, role: str
+    ) -> Response:
+        body = bytes(response.body)
+        try:
+            content = json.loads(body)
+            output_stage_id = content.get("stage_id")
+            if isinstance(output_stage_id, str) and output_stage_id.startswith(leader_stage_id):
+                content["stage_id"] = stage_id + output_stage_id[len(leader_stage_id) :]
+                body = json.dumps(content).encode("utf-8")
+        except (ValueError, AttributeError):
+            pass
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=self._copy_headers(response, role),
+            media_type=response.media_type,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self.flights),
+            "streams_in_flight": sum(1 for f in self.flights.values() if f.stream is not None),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+
+singleflight = SingleFlight()
@@ -0,0 +1,205 @@
+# File: api/core/stream_cache.py
+
+import asyncio
+import json
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
+
+from fastapi.responses import Response, StreamingResponse
+from models.events import restamp_stage_id
+from models.llm_request import LLMRequest
+
+from api.config.gateway_settings import (
+    STREAM_CACHE_BACKEND,
+    STREAM_CACHE_ENABLED,
+    STREAM_CACHE_MAX_BYTES,
+    STREAM_CACHE_MAX_ENTRIES,
+    STREAM_CACHE_REPLAY_MODE,
+    STREAM_CACHE_TTL,
+)
+from api.core.cache.base import CacheBackend
+from api.core.cache.factory import build_cache_backend
+from api.core.request_key import request_key
+from api.core.response_cache import CacheControl, Endpoint, is_deterministic
+
+ReplayMode = Literal["fast", "realtime"]
+
+# Per-request fields that do not change what the model produces.
+_KEY_EXCLUDE = frozenset({"stage_id", "stream", "hedge", "deadline_ms"})
+
+# (seconds since the first event, serialized SSE event)
+RecordedEvent = Tuple[float, str]
+
+
+def _is_complete(events: List[RecordedEvent]) -> bool:
+    """Only a stream that ended in a clean `done` (nothing skipped for time) is replayable."""
+    if not events or "event: done" not in events[-1][1]:
+        return False
+    return not any(
+        "event: error" in text or "event: cancel" in text or '"timed_out_phase":"' in text
+        for _, text in events
+    )
+
+
+class StreamReplayCache:
+    """
+    Records the SSE event sequence of deterministic /stream requests and replays it to
+    later identical requests, without admission or a backend call.
+
+    Replay is either `fast` (as quickly as the client reads) or `realtime` (original
+    inter-event timing), chosen per request with the X-Stream-Replay header. Events are
+    restamped with the caller's stage_id. Only streams the client read to a clean
+    `done` are stored.
+    """
+
+    def __init__(
+        self, backend: CacheBackend, enabled: bool, ttl: float, default_mode: ReplayMode
+    ) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl = ttl
+        self.default_mode = default_mode
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(endpoint: Endpoint, model_name: str, payload: LLMRequest) -> str:
+        return request_key("sse:v1", f"stream/{endpoint}", model_name, payload, _KEY_EXCLUDE)
+
+    async def serve(
+        self,
+        endpoint: Endpoint,
+        payload: LLMRequest,
+        model_name: str,
+        cache_control: Optional[str],
+        replay_mode: Optional[str],
+        produce: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        control = CacheControl.parse(cache_control)
+        if not self.enabled or control.no_store or not is_deterministic(endpoint, payload):
+            self.bypassed += 1
+            response = await produce()
+            response.headers["X-Cache"] = "BYPASS"
+            return response
+
+        key = self.key(endpoint, model_name, payload)
+
+        if not control.no_cache:
+            hit = await self._lookup(key, payload.stage_id, control.max_age, replay_mode)
+            if hit is not None:
+                return hit
+
+        self.misses += 1
+        response = await produce()
+        # Coalesced followers see the same events as their leader; record once.
+        if isinstance(response, StreamingResponse) and (
+            response.headers.get("x-singleflight") != "follower"
+        ):
+            response.body_iterator = self._record(key, payload.stage_id, response.body_iterator)
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    async def _lookup(
+        self, key: str, stage_id: str, max_age: Optional[float], replay_mode: Optional[str]
+    ) -> Optional[StreamingResponse]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            return None
+        if raw is None:
+            return None
+
+        entry = json.loads(raw)
+        age = max(0.0, time.time() - entry["stored_at"])
+        if max_age is not None and age > max_age:
+            return None
+
+        self.hits += 1
+        mode: ReplayMode = self.default_mode
+        if replay_mode in ("fast", "realtime"):
+            mode = "realtime" if replay_mode == "realtime" else "fast"
+        return StreamingResponse(
+            self._replay(entry["events"], entry["stage_id"], stage_id, mode),
+            media_type="text/event-stream",
+            headers={"X-Cache": "HIT", "Age": str(int(age)), "X-Stream-Replay": mode},
+        )
+
+    async def _replay(
+        self, events: List[RecordedEvent], recorded_stage_id: str, stage_id: str, mode: ReplayMode
+    ) -> AsyncIterator[str]:
+        elapsed = 0.0
+        for offset, text in events:
+            if mode == "realtime" and offset > elapsed:
+                await asyncio.sleep(offset - elapsed)
+                elapsed = offset
+            yield restamp_stage_id(text, recorded_stage_id, stage_id)
+
+    async def _record(
+        self, key: str, stage_id: str, body: AsyncIterable[Any]
+    ) -> AsyncIterator[Any]:
+        events: List[RecordedEvent] = []
+        first: Optional[float] = None
+        async for chunk in body:
+            now = time.monotonic()
+            first = now if first is None else first
+            text = chunk if isinstance(chunk, str) else bytes(chunk).decode("utf-8")
+            events.append((round(now - first, 4), text))
+            yield chunk
+
+        # Only reached when the client read the whole stream.
+        if not _is_complete(events):
+            return
+        entry = {"stored_at": time.time(), "stage_id": stage_id, "events": events}
+        try:
+            await self.backend.set(key, json.dumps(entry).encode("utf-8"), self.ttl)
+            self.stores += 1
+        except Exception:
+            self.errors += 1
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "default_replay_mode": self.default_mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "errors": self.errors,
+            "backend": self.backend.snapshot(),
+        }
+
+
+stream_cache = StreamReplayCache(
+    build_cache_backend(
+        STREAM_CACHE_BACKEND,
+        namespace="stream",
+        max_entries=STREAM_CACHE_MAX_ENTRIES,
+        max_bytes=STREAM_CACHE_MAX_BYTES,
+        default_ttl=STREAM_CACHE_TTL,
+    ),
+    enabled=STREAM_CACHE_ENABLED,
+    ttl=STREAM_CACHE_TTL,
+    default_mode="realtime" if STREAM_CACHE_REPLAY_MODE == "realtime" else "fast",
+)
@@ -0,0 +1,33 @@
+# File: api/core/tool_cache.py
+
+from toolkit.utils.tool_cache import ToolCache
+
+from api.config.gateway_settings import (
+    CACHE_LOCK_POLL_INTERVAL,
+    CACHE_LOCK_TTL,
+    CACHE_LOCK_WAIT,
+    TOOL_CACHE_BACKEND,
+    TOOL_CACHE_ENABLED,
+    TOOL_CACHE_MAX_BYTES,
+    TOOL_CACHE_MAX_ENTRIES,
+)
+from api.core.cache.factory import build_cache_backend
+from api.core.cache.stampede import StampedeGuard
+
+# Entries always carry their tool's policy TTL; the backend default is only a fallback.
+_FALLBACK_TTL = 3600.0
+
+tool_cache_backend = build_cache_backend(
+    TOOL_CACHE_BACKEND,
+    namespace="tool",
+    max_entries=TOOL_CACHE_MAX_ENTRIES,
+    max_bytes=TOOL_CACHE_MAX_BYTES,
+    default_ttl=_FALLBACK_TTL,
+)
+
+tool_cache_stampede = StampedeGuard(
+    lock_ttl=CACHE_LOCK_TTL, wait=CACHE_LOCK_WAIT, poll_interval=CACHE_LOCK_POLL_INTERVAL
+)
+
+# Shared by every request's ToolRegistry so results are reused between requests.
+tool_cache = ToolCache(tool_cache_backend, enabled=TOOL_CACHE_ENABLED, locks=tool_cache_stampede)
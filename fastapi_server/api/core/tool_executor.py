@@ -0,0 +1,9 @@
+# File: api/core/tool_executor.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+from api.config.gateway_settings import TOOL_THREAD_POOL_SIZE
+
+# Sync tools run here rather than on asyncio's default pool, so a burst of blocking tool
+# calls queues on its own bounded pool instead of starving other to_thread users.
+tool_executor = ThreadPoolExecutor(max_workers=TOOL_THREAD_POOL_SIZE, thread_name_prefix="tool")
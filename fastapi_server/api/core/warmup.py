@@ -0,0 +1,188 @@
+# File: api/core/warmup.py
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Literal, Mapping, Optional
+
+from openai.types.chat import (
+    ChatCompletionMessageParam,
+    ChatCompletionSystemMessageParam,
+    ChatCompletionToolParam,
+)
+
+from api.config.gateway_settings import WARMUP_TIMEOUT
+from api.core.balancer import ReplicaBalancer, balancer
+from api.core.http_client import client_manager
+
+WarmupStatus = Literal["pending", "warming", "warm", "failed"]
+
+
+@dataclass
+class ReplicaWarmup:
+    url: str
+    status: WarmupStatus = "pending"
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": self.status, "duration_ms": self.duration_ms, "error": self.error}
+
+
+@dataclass
+class ModelWarmupState:
+    model_id: str
+    model_name: str
+    replicas: Dict[str, ReplicaWarmup] = field(default_factory=dict)
+
+    @property
+    def finished(self) -> bool:
+        return all(r.status in ("warm", "failed") for r in self.replicas.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        durations = [r.duration_ms for r in self.replicas.values() if r.duration_ms is not None]
+        return {
+            "model_name": self.model_name,
+            "finished": self.finished,
+            "duration_ms": max(durations) if durations else None,
+            "replicas": {url: r.to_dict() for url, r in self.replicas.items()},
+        }
+
+
+class ModelWarmup:
+    """
+    Sends a one-token generation to every replica of each configured model, concurrently,
+    in the background at startup. This loads the weights into memory and evaluates the
+    toolchain system message, so the first real request pays for neither. The message
+    must be built the way toolchain requests build theirs (same system prompt, same tool
+    prompts and specs) or the backend has no matching prefix to reuse.
+
+    Until a model's warm-up has finished (successfully or not) it reports not-ready.
+    """
+
+    def __init__(self, replica_balancer: ReplicaBalancer, timeout: float) -> None:
+        self.balancer = replica_balancer
+        self.timeout = timeout
+        self.models: Dict[str, ModelWarmupState] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def start(
+        self,
+        models: Mapping[str, str],
+        system_message: ChatCompletionSystemMessageParam,
+        tools: Iterable[ChatCompletionToolParam] = (),
+    ) -> None:
+        """`models` maps model_id -> model_name for the containers to warm."""
+        if self._task is not None:
+            return
+        for model_id, model_name in models.items():
+            pool = self.balancer.pools.get(model_id)
+            if pool is None or not model_name:
+                continue
+            self.models[model_id] = ModelWarmupState(
+                model_id,
+                model_name,
+                {r.url: ReplicaWarmup(r.url) for r in pool.replicas},
+            )
+        self._task = asyncio.create_task(
+            self._run(system_message, list(tools)), name="model-warmup"
+        )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(
+        self,
+        system_message: ChatCompletionSystemMessageParam,
+        tools: List[ChatCompletionToolParam],
+    ) -> None:
+        self.started_at = time.monotonic()
+        await asyncio.gather(
+            *(
+                self._warm(state, replica, system_message, tools)
+                for state in self.models.values()
+                for replica in state.replicas.values()
+            )
+        )
+        self.finished_at = time.monotonic()
+        print(f"✅ Model warm-up finished in {self.finished_at - self.started_at:.2f}s")
+
+    async def _warm(
+        self,
+        state: ModelWarmupState,
+        replica: ReplicaWarmup,
+        system_message: ChatCompletionSystemMessageParam,
+        tools: List[ChatCompletionToolParam],
+    ) -> None:
+        replica.status = "warming"
+        start = time.monotonic()
+        messages: List[ChatCompletionMessageParam] = [
+            system_message,
+            {"role": "user", "content": "ping"},
+        ]
+        tool_params: Dict[str, Any] = {"tools": tools, "tool_choice": "auto"} if tools else {}
+        try:
+            client = client_manager.get_openai_client(f"{replica.url}/v1")
+            await client.chat.completions.create(
+                model=state.model_name,
+                messages=messages,
+                temperature=0.0,
+                max_tokens=1,
+                extra_body={"options": {"num_predict": 1}},
+                timeout=self.timeout,
+                **tool_params,
+            )
+            replica.status = "warm"
+            replica.error = None
+        except Exception as e:
+            replica.status = "failed"
+            replica.error = str(e) or type(e).__name__
+        replica.duration_ms = round(1000 * (time.monotonic() - start), 2)
+
+        if replica.status == "warm":
+            print(
+                f"🔥 Warmed {state.model_id} ({state.model_name}) on {replica.url} "
+                f"in {replica.duration_ms / 1000:.2f}s"
+            )
+        else:
+            print(
+                f"❌ Warm-up failed for {state.model_id} on {replica.url} "
+                f"after {replica.duration_ms / 1000:.2f}s: {replica.error}"
+            )
+
+    def is_warm(self, model_id: str) -> bool:
+        # Containers that are not warmed up have nothing to wait for.
+        state = self.models.get(model_id)
+        return state is None or state.finished
+
+    @property
+    def finished(self) -> bool:
+        return all(state.finished for state in self.models.values())
+
+    def model_snapshot(self, model_id: str) -> Optional[Dict[str, Any]]:
+        state = self.models.get(model_id)
+        return state.snapshot() if state else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = (
+            round(1000 * (self.finished_at - self.started_at), 2)
+            if self.started_at is not None and self.finished_at is not None
+            else None
+        )
+        return {
+            "finished": self.finished,
+            "total_duration_ms": total,
+            "models": {model_id: s.snapshot() for model_id, s in self.models.items()},
+        }
+
+
+model_warmup = ModelWarmup(balancer, WARMUP_TIMEOUT)
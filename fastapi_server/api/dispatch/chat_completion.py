@@ -4,6 +4,8 @@ from fastapi import HTTPException
 from fastapi.responses import Response
 from models.llm_request import LLMRequest
 
+from api.core.deadline import Deadline
+
 # from api.handlers.mcp.chat_completion import mcp_chat_completion_sync
 from api.handlers.openai.chat_completion import openai_chat_completion
 
@@ -13,6 +15,8 @@ async def dispatch_chat_completion(
     model_name: str,
     base_url: str,
     protocol: str,
+    hedge_model_id: str | None = None,
+    deadline: Deadline | None = None,
 ) -> Response:
     if protocol == "openai":
         return await openai_chat_completion(
@@ -23,6 +27,8 @@ async def dispatch_chat_completion(
             system_prompt=payload.system_prompt,
             max_tokens=payload.max_tokens,
             temperature=payload.temperature,
+            hedge_model_id=hedge_model_id,
+            deadline=deadline,
         )
 
     # if protocol == "mcp":
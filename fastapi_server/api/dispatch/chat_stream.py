@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 from models.llm_request import LLMRequest
 
+from api.core.deadline import Deadline
 from api.handlers.openai.chat_stream import openai_chat_completion_stream
 
 # from api.handlers.mcp.chat_stream import mcp_chat_completion_stream
@@ -14,6 +15,7 @@ async def dispatch_chat_stream(
     model_name: str,
     base_url: str,
     protocol: str,
+    deadline: Deadline | None = None,
 ) -> StreamingResponse:
     if protocol == "openai":
         return await openai_chat_completion_stream(
@@ -24,6 +26,7 @@ async def dispatch_chat_stream(
             system_prompt=payload.system_prompt,
             max_tokens=payload.max_tokens,
             temperature=payload.temperature,
+            deadline=deadline,
         )
 
     # if protocol == "mcp":
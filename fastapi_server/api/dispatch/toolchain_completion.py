@@ -4,6 +4,8 @@ from fastapi import HTTPException
 from fastapi.responses import Response
 from models.llm_request import LLMRequest
 
+from api.core.deadline import Deadline
+
 # from api.handlers.mcp.toolchain_completion import mcp_toolchain_completion_sync
 from api.handlers.openai.toolchain_completion import openai_toolchain_completion_sync
 
@@ -13,6 +15,9 @@ async def dispatch_toolchain_completion(
     model_name: str,
     base_url: str,
     protocol: str,
+    hedge_model_id: str | None = None,
+    deadline: Deadline | None = None,
+    cache_control: str | None = None,
 ) -> Response:
     if protocol == "openai":
         return await openai_toolchain_completion_sync(
@@ -24,6 +29,9 @@ async def dispatch_toolchain_completion(
             max_tokens=payload.max_tokens,
             temperature=payload.temperature,
             synthesis=payload.synthesis,
+            hedge_model_id=hedge_model_id,
+            deadline=deadline,
+            cache_control=cache_control,
         )
 
     # if protocol == "mcp":
@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from fastapi.responses import Response
 from models.llm_request import LLMRequest
 
+from api.core.deadline import Deadline
 from api.handlers.openai.toolchain_stream import openai_toolchain_completion_stream
 
 # from api.handlers.mcp.toolchain_stream import mcp_toolchain_completion_stream
@@ -14,6 +15,7 @@ async def dispatch_toolchain_stream(
     model_name: str,
     base_url: str,
     protocol: str,
+    deadline: Deadline | None = None,
 ) -> Response:
     if protocol == "openai":
         return await openai_toolchain_completion_stream(
@@ -25,6 +27,7 @@ async def dispatch_toolchain_stream(
             max_tokens=payload.max_tokens,
             temperature=payload.temperature,
             synthesis=payload.synthesis,
+            deadline=deadline,
         )
 
     # if protocol == "mcp":
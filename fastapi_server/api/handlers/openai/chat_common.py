@@ -1,22 +1,177 @@
 # File: api/handlers/openai/chat_common.py
 
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
+from openai.types.chat import (
+    ChatCompletion,
+    ChatCompletionSystemMessageParam,
+    ChatCompletionUserMessageParam,
+)
+from toolkit.tools.get_weather_tool import GetWeatherTool
+from toolkit.utils.multi_tool_call_parts import MultiToolCallParts
+from toolkit.utils.tool_registry import ToolRegistry
+
+from api.config.gateway_settings import (
+    DEADLINE_MIN_SYNTHESIS_BUDGET,
+    DEADLINE_MIN_SYNTHESIS_TOKENS,
+    TOOL_CALL_TIMEOUT,
+)
+from api.core.circuit_breaker import CircuitBreaker, breakers
+from api.core.deadline import Deadline, Phase
+from api.core.hedging import hedger
+from api.core.http_client import client_manager
+from api.core.retry import retry_policy
+from api.core.tool_cache import tool_cache
+from api.core.tool_executor import tool_executor
 
 
 def build_system_message(system_prompt: str) -> ChatCompletionSystemMessageParam:
     return {"role": "system", "content": system_prompt}
 
 
+def build_toolchain_system_message(
+    system_prompt: str, registry: ToolRegistry
+) -> ChatCompletionSystemMessageParam:
+    # The caller's prompt followed by every tool's instructions; warm-up builds the same
+    # message so the prompt prefix it evaluates is the one toolchain requests reuse.
+    return build_system_message(system_prompt + " " + registry.concat_tool_system_prompt())
+
+
 def build_user_message(user_prompt: str) -> ChatCompletionUserMessageParam:
     return {"role": "user", "content": user_prompt}
 
 
+def build_tool_registry() -> ToolRegistry:
+    # One definition shared by the toolchain handlers and startup warm-up, so both
+    # send the same tool specs and tool system prompt.
+    # Async tools share the gateway's pooled httpx client; sync ones get a bounded pool.
+    return ToolRegistry(
+        [GetWeatherTool()],
+        cache=tool_cache,
+        http_client=client_manager.client,
+        executor=tool_executor,
+        call_timeout=TOOL_CALL_TIMEOUT,
+    )
+
+
 def get_token_settings(max_tokens: List[int], temperature: List[float]) -> tuple[int, float]:
     return max_tokens[0], temperature[0]
 
 
 def get_openai_client(base_url: str) -> AsyncOpenAI:
-    return AsyncOpenAI(base_url=base_url, api_key="dummy")
+    # Pooled client shared across requests; owned and closed by the HTTPClientManager.
+    return client_manager.get_openai_client(base_url)
+
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    return breakers.get(base_url)
+
+
+def synthesis_token_budget(deadline: Deadline, base_url: str, max_tokens: int) -> Optional[int]:
+    """
+    Tokens synthesis can still afford under the deadline; None means skip it.
+    Shortened in proportion to the backend's typical synthesis latency once known.
+    """
+    remaining = deadline.remaining()
+    if remaining is None:
+        return max_tokens
+    if remaining < DEADLINE_MIN_SYNTHESIS_BUDGET:
+        return None
+
+    typical = hedger.typical_latency(base_url, "synthesis")
+    if not typical or typical <= remaining:
+        return max_tokens
+
+    tokens = int(max_tokens * remaining / typical)
+    return tokens if tokens >= DEADLINE_MIN_SYNTHESIS_TOKENS else None
+
+
+async def create_chat_completion(
+    *,
+    phase: Phase,
+    base_url: str,
+    model_name: str,
+    hedge_model_id: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    attempts: Optional[Dict[str, int]] = None,
+    **params: Any,
+) -> ChatCompletion:
+    """
+    Non-streaming chat completion behind the backend's circuit breaker.
+    Idempotent phases are retried on connection errors and 5xx (see api.core.retry);
+    every upstream attempt is counted into `attempts[phase]`.
+    With `hedge_model_id`, a slow call is raced against that sibling container.
+    With `deadline`, the call gets only the remaining budget (DeadlineExceeded otherwise).
+    """
+
+    async def call(target_base_url: str, target_model_name: str) -> ChatCompletion:
+        client = get_openai_client(target_base_url)
+        breaker = get_circuit_breaker(target_base_url)
+
+        async def attempt() -> ChatCompletion:
+            async with breaker.guard():
+                # With **params, mypy cannot pick the non-streaming overload on its own.
+                completion: ChatCompletion = await client.chat.completions.create(
+                    model=target_model_name, stream=False, **params
+                )
+                return completion
+
+        return await retry_policy.run(phase, attempt, attempts)
+
+    hedged = hedger.run(
+        phase=phase,
+        base_url=base_url,
+        model_name=model_name,
+        call=call,
+        hedge_model_id=hedge_model_id,
+    )
+    return await (deadline or Deadline()).run(hedged, phase)
+
+
+async def stream_tool_selection(
+    *,
+    base_url: str,
+    model_name: str,
+    registry: ToolRegistry,
+    hedge_model_id: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    attempts: Optional[Dict[str, int]] = None,
+    **params: Any,
+) -> MultiToolCallParts:
+    """
+    Tool selection for a non-streaming request, read from an internal stream so the
+    upstream is closed as soon as the answer is settled: the calls are finished (the
+    model may keep writing text after them) or one can no longer be valid. Otherwise
+    like create_chat_completion (breaker, retries, hedging, deadline).
+    """
+
+    async def call(target_base_url: str, target_model_name: str) -> MultiToolCallParts:
+        client = get_openai_client(target_base_url)
+        breaker = get_circuit_breaker(target_base_url)
+
+        async def attempt() -> MultiToolCallParts:
+            parts = MultiToolCallParts()
+            async with breaker.guard():
+                stream = await client.chat.completions.create(
+                    model=target_model_name, stream=True, **params
+                )
+                try:
+                    async for chunk in stream:
+                        parts.add_chunk(chunk)
+                        if parts.is_finished() or registry.find_doomed_calls(parts.partial_calls()):
+                            break
+                finally:
+                    await stream.close()  # frees the backend slot if we stopped early
+            return parts
+
+        return await retry_policy.run("tool_selection", attempt, attempts)
+
+    hedged = hedger.run(
+        phase="tool_selection",
+        base_url=base_url,
+        model_name=model_name,
+        call=call,
+        hedge_model_id=hedge_model_id,
+    )
+    return await (deadline or Deadline()).run(hedged, "tool_selection")
@@ -3,10 +3,11 @@
 from fastapi.responses import JSONResponse
 from models.llm_response import CompletionErrorOutput, TextStageOutput
 
+from api.core.deadline import Deadline, DeadlineExceeded
 from api.handlers.openai.chat_common import (
     build_system_message,
     build_user_message,
-    get_openai_client,
+    create_chat_completion,
     get_token_settings,
 )
 
@@ -19,18 +20,24 @@ async def openai_chat_completion(
     system_prompt: str,
     max_tokens: list[int],
     temperature: list[float],
+    hedge_model_id: str | None = None,
+    deadline: Deadline | None = None,
 ) -> JSONResponse:
-    client = get_openai_client(base_url)
     system = build_system_message(system_prompt)
     user = build_user_message(user_prompt)
     max_tokens_val, temperature_val = get_token_settings(max_tokens, temperature)
+    attempts: dict[str, int] = {}
 
     try:
-        resp = await client.chat.completions.create(
-            model=model_name,
+        resp = await create_chat_completion(
+            phase="chat",
+            base_url=base_url,
+            model_name=model_name,
+            hedge_model_id=hedge_model_id,
+            deadline=deadline,
+            attempts=attempts,
             messages=[system, user],
             temperature=temperature_val,
-            stream=False,
             max_tokens=max_tokens_val,
             extra_body={"options": {"num_predict": max_tokens_val}},
         )
@@ -40,6 +47,19 @@ async def openai_chat_completion(
                 stage_id=f"{stage_id}-chat-final",
                 type="text",
                 text=resp.choices[0].message.content,
+                attempts=attempts,
+            ).model_dump(),
+            media_type="application/json",
+        )
+
+    except DeadlineExceeded as e:
+        return JSONResponse(
+            content=CompletionErrorOutput(
+                stage_id=f"{stage_id}-chat-error",
+                type="error",
+                message=str(e),
+                timed_out_phase=e.phase,
+                attempts=attempts,
             ).model_dump(),
             media_type="application/json",
         )
@@ -50,6 +70,7 @@ async def openai_chat_completion(
                 stage_id=f"{stage_id}-chat-error",
                 type="error",
                 message=str(e),
+                attempts=attempts or None,
             ).model_dump(),
             media_type="application/json",
         )
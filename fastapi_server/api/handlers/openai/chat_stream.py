@@ -11,12 +11,20 @@ from models.events import (
     ErrorPayload,
     serialize_sse_event,
 )
-from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
+from openai import AsyncOpenAI, AsyncStream
+from openai.types.chat import (
+    ChatCompletionChunk,
+    ChatCompletionSystemMessageParam,
+    ChatCompletionUserMessageParam,
+)
 
+from api.core.circuit_breaker import CircuitBreaker
+from api.core.deadline import Deadline, DeadlineExceeded
+from api.core.retry import retry_policy
 from api.handlers.openai.chat_common import (
     build_system_message,
     build_user_message,
+    get_circuit_breaker,
     get_openai_client,
     get_token_settings,
 )
@@ -25,23 +33,32 @@ from api.handlers.openai.chat_common import (
 async def _stream_chat_response(
     stage_id: str,
     client: AsyncOpenAI,
+    breaker: CircuitBreaker,
     messages: List[Union[ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam]],
     model_name: str,
     temperature: float,
     max_tokens: int,
+    deadline: Deadline,
 ):
-    try:
-        stream_resp = await client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=temperature,
-            stream=True,
-            max_tokens=max_tokens,
-            extra_body={"options": {"num_predict": max_tokens}},
-        )
+    attempts: dict[str, int] = {}
+
+    async def open_stream() -> AsyncStream[ChatCompletionChunk]:
+        async with breaker.guard():
+            return await client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                max_tokens=max_tokens,
+                extra_body={"options": {"num_predict": max_tokens}},
+            )
 
+    try:
         chunk_id = 0
-        async for chunk in stream_resp:
+        # Nothing has been sent yet, so opening the stream can be retried.
+        stream_resp = await deadline.run(retry_policy.run("chat", open_stream, attempts), "chat")
+
+        async for chunk in breaker.read(deadline.iterate(stream_resp, "chat")):
             payload = ChatCompletionStreamPayload(stage_id=stage_id, chunk=chunk)
             yield serialize_sse_event(
                 id=f"{stage_id}-chunk-{chunk_id}", event="chat_completion_chunk", data=payload
@@ -49,11 +66,19 @@ async def _stream_chat_response(
             chunk_id += 1
 
         yield serialize_sse_event(
-            id=str(chunk_id), event="done", data=DonePayload(stage_id=stage_id)
+            id=str(chunk_id),
+            event="done",
+            data=DonePayload(stage_id=stage_id, attempts=attempts),
         )
 
     except asyncio.CancelledError:
         yield serialize_sse_event(id="0", event="cancel", data=CancelPayload(stage_id=stage_id))
+    except DeadlineExceeded as e:
+        yield serialize_sse_event(
+            id="0",
+            event="error",
+            data=ErrorPayload(stage_id=stage_id, error=str(e), timed_out_phase=e.phase),
+        )
     except Exception as e:
         yield serialize_sse_event(
             id="0", event="error", data=ErrorPayload(stage_id=stage_id, error=str(e))
@@ -68,8 +93,10 @@ async def openai_chat_completion_stream(
     system_prompt: str,
     max_tokens: list[int],
     temperature: list[float],
+    deadline: Deadline | None = None,
 ) -> StreamingResponse:
     client = get_openai_client(base_url)
+    breaker = get_circuit_breaker(base_url)
     system = build_system_message(system_prompt)
     user = build_user_message(user_prompt)
     messages: List[Union[ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam]] = [
@@ -82,10 +109,12 @@ async def openai_chat_completion_stream(
         _stream_chat_response(
             stage_id,
             client,
+            breaker,
             messages,
             model_name,
             temperature_val,
             max_tokens_val,
+            deadline or Deadline(),
         ),
         media_type="text/event-stream",
     )
@@ -8,21 +8,76 @@ from models.llm_response import CompletionErrorOutput, TextStageOutput, ToolStag
 from openai.types.chat import (
     ChatCompletionMessageToolCall,
 )
-from openai.types.chat.chat_completion_message_tool_call import (
-    Function as ToolCallFunction,
-)
-from toolkit.tools.get_weather_tool import GetWeatherTool
 from toolkit.utils.multi_tool_call_parts import MultiToolCallParts
-from toolkit.utils.tool_registry import ToolRegistry
+from toolkit.utils.tool_cache import CacheStatus
+from toolkit.utils.tool_registry import ToolRegistry, ValidationResult
 from toolkit.utils.tool_response_builder import build_tool_response_messages_multi
 
+from api.core.circuit_breaker import CircuitOpenError
+from api.core.deadline import Deadline, DeadlineExceeded, Phase
+from api.core.phase_cache import PhaseCacheStatus, phase_cache
+from api.core.response_cache import CacheControl
 from api.handlers.openai.chat_common import (
-    build_system_message,
+    build_tool_registry,
+    build_toolchain_system_message,
     build_user_message,
-    get_openai_client,
+    create_chat_completion,
+    stream_tool_selection,
+    synthesis_token_budget,
 )
 
 
+def _tool_results_response(
+    stage_id: str,
+    tool_results: dict[str, str],
+    attempts: dict[str, int],
+    tool_cache: dict[str, CacheStatus],
+    phase_status: dict[str, PhaseCacheStatus],
+    timed_out_phase: Phase | None = None,
+) -> JSONResponse:
+    return JSONResponse(
+        ToolStageOutput(
+            stage_id=stage_id,
+            type="tool_results",
+            tool_results=tool_results,
+            timed_out_phase=timed_out_phase,
+            attempts=attempts,
+            tool_cache=dict(tool_cache) or None,
+            phase_cache=dict(phase_status) or None,
+        ).model_dump(),
+        media_type="application/json",
+    )
+
+
+async def _select_tool_calls(
+    base_url: str,
+    model_name: str,
+    registry: ToolRegistry,
+    messages: list[Any],
+    max_tokens: int,
+    temperature: float,
+    hedge_model_id: str | None,
+    deadline: Deadline,
+    attempts: dict[str, int],
+) -> tuple[list[ChatCompletionMessageToolCall], dict[str, ValidationResult]]:
+    """The selected calls, and any call that stopped the stream by being invalid."""
+    parts = await stream_tool_selection(
+        base_url=base_url,
+        model_name=model_name,
+        registry=registry,
+        hedge_model_id=hedge_model_id,
+        deadline=deadline,
+        attempts=attempts,
+        messages=messages,
+        tools=registry.all_specs(),
+        tool_choice="auto",
+        temperature=temperature,
+        max_tokens=max_tokens,
+        extra_body={"options": {"num_predict": max_tokens}},
+    )
+    return parts.to_message_tool_calls(), registry.find_doomed_calls(parts.partial_calls())
+
+
 async def openai_toolchain_completion_sync(
     stage_id: str,
     base_url: str,
@@ -32,95 +87,218 @@ async def openai_toolchain_completion_sync(
     max_tokens: list[int],
     temperature: list[float],
     synthesis: bool | None = False,
+    hedge_model_id: str | None = None,
+    deadline: Deadline | None = None,
+    cache_control: str | None = None,
 ) -> JSONResponse:
-    client = get_openai_client(base_url)
-    registry = ToolRegistry([GetWeatherTool()])
+    deadline = deadline or Deadline()
+    registry = build_tool_registry()
     user = build_user_message(user_prompt)
-    system = build_system_message(system_prompt + " " + registry.concat_tool_system_prompt())
+    system = build_toolchain_system_message(system_prompt, registry)
     max_tool_tokens, tool_temp = max_tokens[0], temperature[0]
+    attempts: dict[str, int] = {}
 
-    # Phase 1: Tool execution
-    resp = await client.chat.completions.create(
-        model=model_name,
-        messages=[system, user],
-        tools=registry.all_specs(),
-        tool_choice="auto",
+    # Phase 1: Tool execution (tool selection may be hedged against a sibling container,
+    # or skipped when the plan for this prompt and tool set is cached; on a miss, other
+    # gateway processes wait for this plan until it is stored or the block is left)
+    control = CacheControl.parse(cache_control)
+    phase_status: dict[str, PhaseCacheStatus] = {}
+    plan_key = phase_cache.plan_key(
+        control,
+        model_name=model_name,
+        registry_version=registry.version,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
         temperature=tool_temp,
-        stream=False,
         max_tokens=max_tool_tokens,
-        extra_body={"options": {"num_predict": max_tool_tokens}},
     )
 
-    tool_calls = resp.choices[0].message.tool_calls or []
+    doomed: dict[str, ValidationResult] = {}
+    async with phase_cache.plan(plan_key, control) as tool_calls:
+        if plan_key is not None:
+            phase_status["tool_selection"] = "hit" if tool_calls is not None else "miss"
 
-    # Qwen-style fallback
-    if not tool_calls:
-        content: str = getattr(resp.choices[0].message, "content", "")
         try:
-            parsed: dict[str, Any] = json.loads(content)
-            tool_calls = [
-                ChatCompletionMessageToolCall(
-                    id="tool_0",
-                    type="function",
-                    function=ToolCallFunction(
-                        name=parsed["name"],
-                        arguments=json.dumps(parsed["arguments"]),
-                    ),
+            if tool_calls is None:
+                tool_calls, doomed = await _select_tool_calls(
+                    base_url=base_url,
+                    model_name=model_name,
+                    registry=registry,
+                    messages=[system, user],
+                    max_tokens=max_tool_tokens,
+                    temperature=tool_temp,
+                    hedge_model_id=hedge_model_id,
+                    deadline=deadline,
+                    attempts=attempts,
                 )
-            ]
-        except json.JSONDecodeError:
-            pass
+        except CircuitOpenError as e:
+            return JSONResponse(
+                CompletionErrorOutput(
+                    stage_id=stage_id, type="error", message=str(e), attempts=attempts
+                ).model_dump(),
+                media_type="application/json",
+            )
+        except DeadlineExceeded as e:
+            return JSONResponse(
+                CompletionErrorOutput(
+                    stage_id=stage_id,
+                    type="error",
+                    message=str(e),
+                    timed_out_phase=e.phase,
+                    attempts=attempts,
+                ).model_dump(),
+                media_type="application/json",
+            )
 
-    if not tool_calls:
-        return JSONResponse(
-            CompletionErrorOutput(
-                stage_id=stage_id, type="error", message="No tools called."
-            ).model_dump(),
-            media_type="application/json",
+        if doomed:
+            return JSONResponse(
+                CompletionErrorOutput(
+                    stage_id=stage_id,
+                    type="error",
+                    message=json.dumps(doomed),
+                    attempts=attempts,
+                ).model_dump(),
+                media_type="application/json",
+            )
+
+        if not tool_calls:
+            return JSONResponse(
+                CompletionErrorOutput(
+                    stage_id=stage_id, type="error", message="No tools called.", attempts=attempts
+                ).model_dump(),
+                media_type="application/json",
+            )
+
+        tool_call_map = MultiToolCallParts.from_completed(tool_calls)
+
+        validation = registry.validate_all_tool_calls(tool_call_map)
+
+        if not all(r["valid"] for r in validation.values()):
+            return JSONResponse(
+                CompletionErrorOutput(
+                    stage_id=stage_id,
+                    type="error",
+                    message=json.dumps(validation),
+                    attempts=attempts,
+                ).model_dump(),
+                media_type="application/json",
+            )
+
+        if phase_status.get("tool_selection") == "miss":
+            await phase_cache.store_plan(plan_key, tool_calls)
+
+    tool_cache: dict[str, CacheStatus] = {}
+    failed: set[str] = set()
+    tool_results = await registry.execute_all_tool_calls(
+        tool_call_map, timeout=deadline.remaining(), cache_status=tool_cache, failed=failed
+    )
+
+    if deadline.expired():
+        return _tool_results_response(
+            stage_id,
+            tool_results,
+            attempts,
+            tool_cache,
+            phase_status,
+            timed_out_phase="tool_execution",
         )
 
-    tool_call_map = MultiToolCallParts.from_completed(tool_calls)
+    if not synthesis:
+        return _tool_results_response(stage_id, tool_results, attempts, tool_cache, phase_status)
 
-    validation = registry.validate_all_tool_calls(tool_call_map)
+    # Phase 2: Synthesis (reused when the same calls returned the same results; otherwise
+    # skipped, or shortened, when the remaining budget cannot fit it)
+    synthesis_temp = temperature[1]
+    synthesis_key = (
+        phase_cache.synthesis_key(
+            control,
+            model_name=model_name,
+            registry_version=registry.version,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=synthesis_temp,
+            max_tokens=max_tokens[1],
+            tool_calls=tool_calls,
+            tool_results=tool_results,
+        )
+        if not failed
+        else None
+    )
 
-    if not all(r["valid"] for r in validation.values()):
-        return JSONResponse(
-            CompletionErrorOutput(
-                stage_id=stage_id, type="error", message=json.dumps(validation)
-            ).model_dump(),
-            media_type="application/json",
+    async with phase_cache.synthesis(synthesis_key, control) as cached_text:
+        if synthesis_key is not None:
+            phase_status["synthesis"] = "hit" if cached_text is not None else "miss"
+        if cached_text is not None:
+            return JSONResponse(
+                TextStageOutput(
+                    stage_id=stage_id,
+                    type="text",
+                    text=cached_text,
+                    attempts=attempts,
+                    phase_cache=dict(phase_status),
+                ).model_dump(),
+                media_type="application/json",
+            )
+
+        synthesis_tokens = synthesis_token_budget(deadline, base_url, max_tokens[1])
+        if synthesis_tokens is None:
+            return _tool_results_response(
+                stage_id,
+                tool_results,
+                attempts,
+                tool_cache,
+                phase_status,
+                timed_out_phase="synthesis",
+            )
+
+        followup_messages = build_tool_response_messages_multi(
+            system, user, tool_calls, tool_results
         )
 
-    tool_results = registry.execute_all_tool_calls(tool_call_map)
+        try:
+            second_resp = await create_chat_completion(
+                phase="synthesis",
+                base_url=base_url,
+                model_name=model_name,
+                deadline=deadline,
+                attempts=attempts,
+                messages=followup_messages,
+                tools=registry.all_specs(),
+                tool_choice="auto",
+                temperature=synthesis_temp,
+                max_tokens=synthesis_tokens,
+                extra_body={"options": {"num_predict": synthesis_tokens}},
+            )
+        except CircuitOpenError as e:
+            return JSONResponse(
+                CompletionErrorOutput(
+                    stage_id=stage_id, type="error", message=str(e), attempts=attempts
+                ).model_dump(),
+                media_type="application/json",
+            )
+        except DeadlineExceeded:
+            # The tool results are still good; return them rather than an error.
+            return _tool_results_response(
+                stage_id,
+                tool_results,
+                attempts,
+                tool_cache,
+                phase_status,
+                timed_out_phase="synthesis",
+            )
+
+        text = second_resp.choices[0].message.content
+        if text and synthesis_tokens == max_tokens[1]:
+            await phase_cache.store_synthesis(synthesis_key, text)
 
-    if not synthesis:
         return JSONResponse(
-            ToolStageOutput(
-                stage_id=stage_id, type="tool_results", tool_results=tool_results
+            TextStageOutput(
+                stage_id=stage_id,
+                type="text",
+                text=text,
+                timed_out_phase="synthesis" if synthesis_tokens < max_tokens[1] else None,
+                attempts=attempts,
+                phase_cache=dict(phase_status) or None,
             ).model_dump(),
             media_type="application/json",
         )
-
-    # Phase 2: Synthesis
-    synthesis_tokens, synthesis_temp = max_tokens[1], temperature[1]
-    followup_messages = build_tool_response_messages_multi(system, user, tool_calls, tool_results)
-
-    second_resp = await client.chat.completions.create(
-        model=model_name,
-        messages=followup_messages,
-        tools=registry.all_specs(),
-        tool_choice="auto",
-        temperature=synthesis_temp,
-        stream=False,
-        max_tokens=synthesis_tokens,
-        extra_body={"options": {"num_predict": synthesis_tokens}},
-    )
-
-    return JSONResponse(
-        TextStageOutput(
-            stage_id=stage_id,
-            type="text",
-            text=second_resp.choices[0].message.content,
-        ).model_dump(),
-        media_type="application/json",
-    )
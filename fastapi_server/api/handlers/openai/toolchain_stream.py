@@ -1,6 +1,7 @@
 # File: api/handlers/openai/toolchain_stream.py
 
 import asyncio
+import json
 
 from fastapi.responses import StreamingResponse
 from models.events import (
@@ -11,26 +12,35 @@ from models.events import (
     ToolSummaryStreamPayload,
     serialize_sse_event,
 )
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, AsyncStream
 from openai.types.chat import (
+    ChatCompletionChunk,
     ChatCompletionSystemMessageParam,
     ChatCompletionUserMessageParam,
 )
-from toolkit.tools.get_weather_tool import GetWeatherTool
 from toolkit.utils.multi_tool_call_parts import MultiToolCallParts
-from toolkit.utils.tool_registry import ToolRegistry
+from toolkit.utils.tool_cache import CacheStatus
+from toolkit.utils.tool_registry import ToolCallBatch, ToolRegistry
 from toolkit.utils.tool_response_builder import build_tool_response_messages_multi
 
+from api.core.circuit_breaker import CircuitBreaker
+from api.core.deadline import Deadline, DeadlineExceeded
+from api.core.retry import retry_policy
 from api.handlers.openai.chat_common import (
-    build_system_message,
+    build_tool_registry,
+    build_toolchain_system_message,
     build_user_message,
+    get_circuit_breaker,
     get_openai_client,
+    synthesis_token_budget,
 )
 
 
 async def _stream_tool_execution_and_synthesis(
     stage_id: str,
+    base_url: str,
     client: AsyncOpenAI,
+    breaker: CircuitBreaker,
     registry: ToolRegistry,
     system_msg: ChatCompletionSystemMessageParam,
     user_msg: ChatCompletionUserMessageParam,
@@ -38,25 +48,43 @@ async def _stream_tool_execution_and_synthesis(
     max_tokens: list[int],
     temperature: list[float],
     synthesis: bool | None = False,
+    deadline: Deadline | None = None,
 ):
+    deadline = deadline or Deadline()
+    attempts: dict[str, int] = {}
+    tool_batch: ToolCallBatch | None = None
     try:
         # Phase 1: Streaming tool call extraction
         multi_tool_call_parts = MultiToolCallParts()
 
-        stream_resp = await client.chat.completions.create(
-            model=model_name,
-            messages=[system_msg, user_msg],
-            tools=registry.all_specs(),
-            tool_choice="auto",
-            temperature=temperature[0],
-            stream=True,
-            max_tokens=max_tokens[0],
-            extra_body={"options": {"num_predict": max_tokens[0]}},
+        # Each call starts as soon as its arguments are complete, overlapping tool latency
+        # with the rest of the phase-1 stream; collect() waits for them all afterwards.
+        tool_batch = registry.batch(timeout=deadline.remaining())
+
+        async def open_selection() -> AsyncStream[ChatCompletionChunk]:
+            async with breaker.guard():
+                return await client.chat.completions.create(
+                    model=model_name,
+                    messages=[system_msg, user_msg],
+                    tools=registry.all_specs(),
+                    tool_choice="auto",
+                    temperature=temperature[0],
+                    stream=True,
+                    max_tokens=max_tokens[0],
+                    extra_body={"options": {"num_predict": max_tokens[0]}},
+                )
+
+        chunk_id = 0
+        # No tool has run and nothing has been sent yet, so opening the stream can be retried.
+        stream_resp = await deadline.run(
+            retry_policy.run("tool_selection", open_selection, attempts), "tool_selection"
         )
 
         # Collect tool calls from stream
-        chunk_id = 0
-        async for chunk in stream_resp:
+        # chunk for QWEN is actually a different shape.  It gets fixed inside add_chunk,
+        # but raw version being streamed
+        doomed: dict[str, dict[str, bool | str]] = {}
+        async for chunk in breaker.read(deadline.iterate(stream_resp, "tool_selection")):
             multi_tool_call_parts.add_chunk(chunk)
             payload = ToolCompletionStreamPayload(stage_id=stage_id, tool_results=chunk)
             yield serialize_sse_event(
@@ -64,65 +92,124 @@ async def _stream_tool_execution_and_synthesis(
             )
             chunk_id += 1
 
+            doomed = registry.find_doomed_calls(multi_tool_call_parts.partial_calls())
+            if doomed:
+                break
+            for call in multi_tool_call_parts.take_new_complete_calls():
+                tool_batch.start_early(call)
+            if multi_tool_call_parts.is_finished():
+                break
+
+        if doomed or multi_tool_call_parts.is_finished():
+            # Nothing more this generation writes can be used; free the backend now.
+            await stream_resp.close()
+        if doomed:
+            yield serialize_sse_event(
+                id="0",
+                event="error",
+                data=ErrorPayload(stage_id=stage_id, error=json.dumps(doomed)),
+            )
+            return
+
         tool_calls = multi_tool_call_parts.to_message_tool_calls()
         tool_call_map = multi_tool_call_parts.to_message_tool_call_map()
 
-        # chunk for QWEN is actually a different shape.  It gets fixed inside add_chunk,but raw version being streamed
-        async for chunk in stream_resp:
-            multi_tool_call_parts.add_chunk(chunk)
-            payload = ToolCompletionStreamPayload(stage_id=stage_id, tool_results=chunk)
+        tool_cache: dict[str, CacheStatus] = {}
+        tool_results = await tool_batch.collect(tool_call_map, cache_status=tool_cache)
+        payload = ToolSummaryStreamPayload(
+            stage_id=stage_id, tool_summary=tool_results, tool_cache=dict(tool_cache) or None
+        )
+        yield serialize_sse_event(id="0", event="tool_summary", data=payload)
+
+        if deadline.expired():
             yield serialize_sse_event(
-                id=f"{stage_id}-chunk-{chunk_id}", event="tool_completion_chunk", data=payload
+                id=str(chunk_id),
+                event="done",
+                data=DonePayload(
+                    stage_id=stage_id, timed_out_phase="tool_execution", attempts=attempts
+                ),
             )
-            chunk_id += 1
-
-        tool_results = registry.execute_all_tool_calls(tool_call_map)
-        payload = ToolSummaryStreamPayload(stage_id=stage_id, tool_summary=tool_results)
-        yield serialize_sse_event(id="0", event="tool_summary", data=payload)
+            return
 
         if not synthesis:
             # Tools only - we're done.   Better to check that complete from stream "done"
             yield serialize_sse_event(
-                id=str(chunk_id), event="done", data=DonePayload(stage_id=stage_id)
+                id=str(chunk_id),
+                event="done",
+                data=DonePayload(stage_id=stage_id, attempts=attempts),
+            )
+            return
+
+        # Phase 2: Synthesis streaming (skipped, or shortened, when the budget cannot fit it)
+        synthesis_tokens = synthesis_token_budget(deadline, base_url, max_tokens[1])
+        if synthesis_tokens is None:
+            yield serialize_sse_event(
+                id=str(chunk_id),
+                event="done",
+                data=DonePayload(stage_id=stage_id, timed_out_phase="synthesis", attempts=attempts),
             )
             return
 
-        # Phase 2: Synthesis streaming
         followup_messages = build_tool_response_messages_multi(
             system_msg, user_msg, tool_calls, tool_results
         )
 
-        second_stream = await client.chat.completions.create(
-            model=model_name,
-            messages=followup_messages,
-            temperature=temperature[1],
-            stream=True,
-            max_tokens=max_tokens[1],
-            extra_body={"options": {"num_predict": max_tokens[1]}},
-        )
+        async def open_synthesis() -> AsyncStream[ChatCompletionChunk]:
+            async with breaker.guard():
+                return await client.chat.completions.create(
+                    model=model_name,
+                    messages=followup_messages,
+                    temperature=temperature[1],
+                    stream=True,
+                    max_tokens=synthesis_tokens,
+                    extra_body={"options": {"num_predict": synthesis_tokens}},
+                )
 
         chunk_id = 0
-        async for chunk in second_stream:
-            delta = chunk.choices[0].delta
-            if delta.content:
-                payload = ToolCompletionStreamPayload(stage_id=stage_id, tool_results=chunk)
-                yield serialize_sse_event(
-                    id=f"{stage_id}-chunk-integ-{chunk_id}",
-                    event="tool_completion_chunk",
-                    data=payload,
-                )
-                chunk_id += 1
+        timed_out = synthesis_tokens < max_tokens[1]
+        try:
+            second_stream = await deadline.run(
+                retry_policy.run("synthesis", open_synthesis, attempts), "synthesis"
+            )
+            async for chunk in breaker.read(deadline.iterate(second_stream, "synthesis")):
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    payload = ToolCompletionStreamPayload(stage_id=stage_id, tool_results=chunk)
+                    yield serialize_sse_event(
+                        id=f"{stage_id}-chunk-integ-{chunk_id}",
+                        event="tool_completion_chunk",
+                        data=payload,
+                    )
+                    chunk_id += 1
+        except DeadlineExceeded:
+            # Tool results were already sent; end the stage cleanly with what we have.
+            timed_out = True
 
         yield serialize_sse_event(
-            id=str(chunk_id), event="done", data=DonePayload(stage_id=stage_id)
+            id=str(chunk_id),
+            event="done",
+            data=DonePayload(
+                stage_id=stage_id,
+                timed_out_phase="synthesis" if timed_out else None,
+                attempts=attempts,
+            ),
         )
 
     except asyncio.CancelledError:
         yield serialize_sse_event(id="0", event="cancel", data=CancelPayload(stage_id=stage_id))
+    except DeadlineExceeded as e:
+        yield serialize_sse_event(
+            id="0",
+            event="error",
+            data=ErrorPayload(stage_id=stage_id, error=str(e), timed_out_phase=e.phase),
+        )
     except Exception as e:
         yield serialize_sse_event(
             id="0", event="error", data=ErrorPayload(stage_id=stage_id, error=str(e))
         )
+    finally:
+        if tool_batch is not None:
+            tool_batch.cancel()  # tools started early for a stream that did not finish
 
 
 async def openai_toolchain_completion_stream(
@@ -134,17 +221,21 @@ async def openai_toolchain_completion_stream(
     max_tokens: list[int],
     temperature: list[float],
     synthesis: bool | None = False,
+    deadline: Deadline | None = None,
 ) -> StreamingResponse:
     client = get_openai_client(base_url)
-    registry = ToolRegistry([GetWeatherTool()])
+    breaker = get_circuit_breaker(base_url)
+    registry = build_tool_registry()
 
-    system_msg = build_system_message(system_prompt + " " + registry.concat_tool_system_prompt())
+    system_msg = build_toolchain_system_message(system_prompt, registry)
     user_msg = build_user_message(user_prompt)
 
     return StreamingResponse(
         _stream_tool_execution_and_synthesis(
             stage_id=stage_id,
+            base_url=base_url,
             client=client,
+            breaker=breaker,
             registry=registry,
             system_msg=system_msg,
             user_msg=user_msg,
@@ -152,6 +243,7 @@ async def openai_toolchain_completion_stream(
             max_tokens=max_tokens,
             temperature=temperature,
             synthesis=synthesis,
+            deadline=deadline,
         ),
         media_type="text/event-stream",
     )
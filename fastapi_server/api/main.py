@@ -5,18 +5,57 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.config.gateway_settings import WARMUP_ENABLED, WARMUP_MODELS, WARMUP_SYSTEM_PROMPT
+from api.config.model_routes import model_map, protocol_map
+from api.core.balancer import balancer
+from api.core.health_monitor import health_monitor
 from api.core.http_client import client_manager
+from api.core.idempotency import idempotency
+from api.core.phase_cache import phase_cache
+from api.core.response_cache import response_cache
+from api.core.stream_cache import stream_cache
+from api.core.tool_cache import tool_cache_backend
+from api.core.tool_executor import tool_executor
+from api.core.warmup import model_warmup
+from api.handlers.openai.chat_common import build_tool_registry, build_toolchain_system_message
 from api.routes.completion import router as completion_router
 from api.routes.health import router as health_router
+from api.routes.metrics import router as metrics_router
 from api.routes.stream import router as stream_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     print("🔧 Starting client manager...")
-    await client_manager.start()
+    await client_manager.start(
+        openai_base_urls=[f"{replica_url}/v1" for replica_url in balancer.all_urls()]
+    )
     print("✅ Client manager started")
+    await health_monitor.start()
+    print("✅ Health monitor started")
+    if WARMUP_ENABLED:
+        registry = build_tool_registry()
+        await model_warmup.start(
+            models={
+                model_id: model_map.get(model_id, "")
+                for model_id in (WARMUP_MODELS or model_map)
+                if protocol_map.get(model_id) == "openai"
+            },
+            system_message=build_toolchain_system_message(WARMUP_SYSTEM_PROMPT, registry),
+            tools=registry.all_specs(),
+        )
+        print("🔥 Model warm-up started in the background")
     yield
+    print("🔻 Stopping model warm-up...")
+    await model_warmup.stop()
+    print("🔻 Stopping health monitor...")
+    await health_monitor.stop()
+    await response_cache.close()
+    await phase_cache.close()
+    await idempotency.close()
+    await stream_cache.close()
+    await tool_cache_backend.close()
+    tool_executor.shutdown(wait=False, cancel_futures=True)
     print("🔻 Stopping client manager...")
     await client_manager.stop()
     print("✅ Client manager stopped")
@@ -26,5 +65,6 @@ app = FastAPI(lifespan=lifespan, title="Ollama Docker API Router")
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
 app.include_router(health_router)
+app.include_router(metrics_router)  # GET /metrics
 app.include_router(completion_router)  # POST /completion/v1/{chat,toolchain}
 app.include_router(stream_router)  # POST /stream/v1/{chat,toolchain}
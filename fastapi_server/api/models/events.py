@@ -1,5 +1,6 @@
 # File: models/events.py
 
+import json
 from typing import Any, Literal, Optional, Union
 
 from openai.types.chat import ChatCompletionChunk
@@ -51,12 +52,15 @@ class ToolSummaryStreamPayload(BaseModel):
 
     stage_id: str
     tool_summary: dict[str, Any]
+    tool_cache: Optional[dict[str, str]] = None  # tool_call_id → hit | stale | miss | shared
 
 
 class DonePayload(BaseModel):
     """Marks the completion of a stage or output stream."""
 
     stage_id: str
+    timed_out_phase: Optional[str] = None  # set when a phase was skipped for lack of budget
+    attempts: Optional[dict[str, int]] = None  # upstream calls per phase
 
 
 class CancelPayload(BaseModel):
@@ -70,6 +74,7 @@ class ErrorPayload(BaseModel):
 
     stage_id: str
     error: str
+    timed_out_phase: Optional[str] = None
 
 
 # ────────────────
@@ -115,3 +120,14 @@ def serialize_sse_event(
     for line in payload.splitlines():
         lines.append(f"data: {line}")
     return "\n".join(lines) + "\n\n"
+
+
+def restamp_stage_id(text: str, old_stage_id: str, new_stage_id: str) -> str:
+    """Rewrites serialized SSE events for another stage (payload stage_id and `id:` prefix)."""
+    if old_stage_id == new_stage_id:
+        return text
+    old_json = json.dumps(old_stage_id, ensure_ascii=False)
+    new_json = json.dumps(new_stage_id, ensure_ascii=False)
+    return text.replace(f'"stage_id":{old_json}', f'"stage_id":{new_json}').replace(
+        f"id: {old_stage_id}-", f"id: {new_stage_id}-"
+    )
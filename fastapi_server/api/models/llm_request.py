@@ -20,6 +20,10 @@ class LLMRequest(BaseModel):
     model_container: ModelContainer
     stream: Optional[bool] = False
     synthesis: Optional[bool] = None
+    hedge: Optional[bool] = False  # race a slow non-streaming call against the sibling container
+    deadline_ms: Optional[int] = Field(
+        default=None, gt=0
+    )  # end-to-end budget; X-Request-Deadline-Ms header also accepted (tighter wins)
 
     prompts: List[str] = Field(
         default_factory=list, min_length=2, max_length=2
@@ -9,15 +9,24 @@ class TextStageOutput(BaseModel):
     stage_id: str
     type: Literal["text"]
     text: Optional[str] = None
+    timed_out_phase: Optional[str] = None
+    attempts: Optional[Dict[str, int]] = None  # upstream calls per phase, e.g. {"chat": 2}
+    phase_cache: Optional[Dict[str, str]] = None  # toolchain phase → hit | miss
 
 
 class ToolStageOutput(BaseModel):
     stage_id: str
     type: Literal["tool_results"]
     tool_results: Optional[Dict[str, str]] = None
+    timed_out_phase: Optional[str] = None  # e.g. "synthesis" when it was skipped or cut short
+    attempts: Optional[Dict[str, int]] = None
+    tool_cache: Optional[Dict[str, str]] = None  # tool_call_id → hit | stale | miss | shared
+    phase_cache: Optional[Dict[str, str]] = None
 
 
 class CompletionErrorOutput(BaseModel):
     stage_id: str
     type: Literal["error"] = "error"
     message: str
+    timed_out_phase: Optional[str] = None
+    attempts: Optional[Dict[str, int]] = None
@@ -1,10 +1,18 @@
 # File: api/routes/completion.py
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import Response
 from models.llm_request import LLMRequest
 
-from api.config.model_routes import model_map, model_service_map, protocol_map
+from api.config.model_routes import hedge_sibling_map, model_map, model_service_map, protocol_map
+from api.core.deadline import Deadline
+from api.core.gateway import guarded_dispatch
+from api.core.idempotency import idempotency
+from api.core.response_cache import response_cache
+from api.core.semantic_cache import semantic_cache
+from api.core.singleflight import singleflight
 from api.dispatch.toolchain_completion import dispatch_toolchain_completion
 from api.dispatch.chat_completion import dispatch_chat_completion
 
@@ -12,7 +20,14 @@ router = APIRouter(prefix="/completion/v1")
 
 
 @router.post("/chat", response_model=None)
-async def chat_completion_handler(payload: LLMRequest) -> Response:
+async def chat_completion_handler(
+    payload: LLMRequest,
+    x_request_deadline_ms: Optional[int] = Header(default=None, gt=0),
+    cache_control: Optional[str] = Header(default=None),
+    idempotency_key: Optional[str] = Header(default=None),
+    x_semantic_cache: Optional[str] = Header(default=None),
+) -> Response:
+    deadline = Deadline.from_request(payload.deadline_ms, x_request_deadline_ms)
     model_id = payload.model_container
 
     if model_id not in model_map:
@@ -37,16 +52,56 @@ async def chat_completion_handler(payload: LLMRequest) -> Response:
             detail=f"No service configured for model: {model_id}",
         )
 
-    return await dispatch_chat_completion(
-        payload=payload,
-        model_name=model_name,
-        base_url=f"{base_url}/v1",
-        protocol=protocol,
+    hedge_model_id = hedge_sibling_map.get(model_id) if payload.hedge else None
+
+    return await idempotency.serve(
+        "completion/chat",
+        idempotency_key,
+        payload,
+        lambda: response_cache.serve(
+            "chat",
+            payload,
+            model_name,
+            cache_control,
+            lambda: semantic_cache.serve(
+                "chat",
+                payload,
+                model_id,
+                model_name,
+                cache_control,
+                x_semantic_cache,
+                lambda: singleflight.serve(
+                    "completion/chat",
+                    payload,
+                    model_name,
+                    deadline,
+                    lambda: guarded_dispatch(
+                        model_id,
+                        lambda replica_url: dispatch_chat_completion(
+                            payload=payload,
+                            model_name=model_name,
+                            base_url=f"{replica_url}/v1",
+                            protocol=protocol,
+                            hedge_model_id=hedge_model_id,
+                            deadline=deadline,
+                        ),
+                        deadline,
+                    ),
+                ),
+            ),
+        ),
     )
 
 
 @router.post("/toolchain", response_model=None)
-async def toolchain_completion_handler(payload: LLMRequest) -> Response:
+async def toolchain_completion_handler(
+    payload: LLMRequest,
+    x_request_deadline_ms: Optional[int] = Header(default=None, gt=0),
+    cache_control: Optional[str] = Header(default=None),
+    idempotency_key: Optional[str] = Header(default=None),
+    x_semantic_cache: Optional[str] = Header(default=None),
+) -> Response:
+    deadline = Deadline.from_request(payload.deadline_ms, x_request_deadline_ms)
     model_id = payload.model_container
 
     if model_id not in model_map:
@@ -71,9 +126,43 @@ async def toolchain_completion_handler(payload: LLMRequest) -> Response:
             detail=f"No service configured for model: {model_id}",
         )
 
-    return await dispatch_toolchain_completion(
-        payload=payload,
-        model_name=model_name,
-        base_url=f"{base_url}/v1",
-        protocol=protocol,
+    hedge_model_id = hedge_sibling_map.get(model_id) if payload.hedge else None
+
+    return await idempotency.serve(
+        "completion/toolchain",
+        idempotency_key,
+        payload,
+        lambda: response_cache.serve(
+            "toolchain",
+            payload,
+            model_name,
+            cache_control,
+            lambda: semantic_cache.serve(
+                "toolchain",
+                payload,
+                model_id,
+                model_name,
+                cache_control,
+                x_semantic_cache,
+                lambda: singleflight.serve(
+                    "completion/toolchain",
+                    payload,
+                    model_name,
+                    deadline,
+                    lambda: guarded_dispatch(
+                        model_id,
+                        lambda replica_url: dispatch_toolchain_completion(
+                            payload=payload,
+                            model_name=model_name,
+                            base_url=f"{replica_url}/v1",
+                            protocol=protocol,
+                            hedge_model_id=hedge_model_id,
+                            deadline=deadline,
+                            cache_control=cache_control,
+                        ),
+                        deadline,
+                    ),
+                ),
+            ),
+        ),
     )
@@ -2,22 +2,38 @@
 
 from typing import Any, Dict
 
-import httpx
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
-from api.config.model_routes import model_service_map
+from api.core.health_monitor import health_monitor
+from api.core.warmup import model_warmup
 
 router = APIRouter()
 
 
 @router.get("/healthz")
 async def health_checkz() -> Dict[str, Any]:
-    results = {}
-    async with httpx.AsyncClient(timeout=2.0) as client:
-        for name, url in model_service_map.items():
-            try:
-                resp = await client.get(f"{url}/api/tags")
-                results[name] = {"status": "online", "models": resp.json()}
-            except Exception as e:
-                results[name] = {"status": "offline", "error": str(e)}
-    return {"status": "ready", "model_servers": results}
+    # Served from the background prober's snapshot; never probes inline.
+    # Always 200 so it can serve as a liveness check while models load: "warming_up"
+    # is informational, and /readyz/{model_container} is what gates traffic.
+    return {
+        "status": "ready" if model_warmup.finished else "warming_up",
+        "probe_rounds": health_monitor.rounds,
+        "model_servers": health_monitor.snapshot(),
+        "warmup": model_warmup.snapshot(),
+    }
+
+
+@router.get("/readyz/{model_container}", response_model=None)
+async def readiness_check(model_container: str) -> JSONResponse:
+    # Not ready until the replicas answer probes and the startup warm-up has finished.
+    ready = health_monitor.is_ready(model_container) and model_warmup.is_warm(model_container)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "model_container": model_container,
+            "ready": ready,
+            "model_server": health_monitor.model_snapshot(model_container),
+            "warmup": model_warmup.model_snapshot(model_container),
+        },
+    )
@@ -0,0 +1,46 @@
+# File: api/routes/metrics.py
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from toolkit.utils.forecast_store import forecast_store
+
+from api.core.admission import admission_controller
+from api.core.balancer import balancer
+from api.core.circuit_breaker import breakers
+from api.core.hedging import hedger
+from api.core.idempotency import idempotency
+from api.core.phase_cache import phase_cache
+from api.core.response_cache import response_cache
+from api.core.retry import retry_policy
+from api.core.semantic_cache import semantic_cache
+from api.core.singleflight import singleflight
+from api.core.stream_cache import stream_cache
+from api.core.tool_cache import tool_cache, tool_cache_backend, tool_cache_stampede
+from api.core.warmup import model_warmup
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def gateway_metrics() -> Dict[str, Any]:
+    return {
+        "admission": admission_controller.snapshot(),
+        "replicas": balancer.snapshot(),
+        "circuit_breakers": breakers.snapshot(),
+        "hedging": hedger.snapshot(),
+        "retries": retry_policy.snapshot(),
+        "warmup": model_warmup.snapshot(),
+        "response_cache": response_cache.snapshot(),
+        "phase_cache": phase_cache.snapshot(),
+        "idempotency": idempotency.snapshot(),
+        "semantic_cache": semantic_cache.snapshot(),
+        "singleflight": singleflight.snapshot(),
+        "stream_cache": stream_cache.snapshot(),
+        "tool_cache": {
+            **tool_cache.snapshot(),
+            "stampede": tool_cache_stampede.snapshot(),
+            "backend": tool_cache_backend.snapshot(),
+        },
+        "forecast_store": forecast_store.snapshot(),
+    }
@@ -1,10 +1,17 @@
 # File: api/routes/stream.py
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import Response
 from models.llm_request import LLMRequest
 
 from api.config.model_routes import model_map, model_service_map, protocol_map
+from api.core.deadline import Deadline
+from api.core.gateway import guarded_dispatch
+from api.core.idempotency import idempotency
+from api.core.singleflight import singleflight
+from api.core.stream_cache import stream_cache
 from api.dispatch.toolchain_stream import dispatch_toolchain_stream
 from api.dispatch.chat_stream import dispatch_chat_stream
 
@@ -12,7 +19,14 @@ router = APIRouter(prefix="/stream/v1")
 
 
 @router.post("/chat", response_model=None)
-async def chat_stream_handler(payload: LLMRequest) -> Response:
+async def chat_stream_handler(
+    payload: LLMRequest,
+    x_request_deadline_ms: Optional[int] = Header(default=None, gt=0),
+    cache_control: Optional[str] = Header(default=None),
+    idempotency_key: Optional[str] = Header(default=None),
+    x_stream_replay: Optional[str] = Header(default=None),  # fast | realtime
+) -> Response:
+    deadline = Deadline.from_request(payload.deadline_ms, x_request_deadline_ms)
     model_id = payload.model_container
 
     if model_id not in model_map:
@@ -37,16 +51,46 @@ async def chat_stream_handler(payload: LLMRequest) -> Response:
             detail=f"No service configured for model: {model_id}",
         )
 
-    return await dispatch_chat_stream(
-        payload=payload,
-        model_name=model_name,
-        base_url=f"{base_url}/v1",
-        protocol=protocol,
+    return await idempotency.serve(
+        "stream/chat",
+        idempotency_key,
+        payload,
+        lambda: stream_cache.serve(
+            "chat",
+            payload,
+            model_name,
+            cache_control,
+            x_stream_replay,
+            lambda: singleflight.serve(
+                "stream/chat",
+                payload,
+                model_name,
+                deadline,
+                lambda: guarded_dispatch(
+                    model_id,
+                    lambda replica_url: dispatch_chat_stream(
+                        payload=payload,
+                        model_name=model_name,
+                        base_url=f"{replica_url}/v1",
+                        protocol=protocol,
+                        deadline=deadline,
+                    ),
+                    deadline,
+                ),
+            ),
+        ),
     )
 
 
 @router.post("/toolchain", response_model=None)
-async def toolchain_stream_handler(payload: LLMRequest) -> Response:
+async def toolchain_stream_handler(
+    payload: LLMRequest,
+    x_request_deadline_ms: Optional[int] = Header(default=None, gt=0),
+    cache_control: Optional[str] = Header(default=None),
+    idempotency_key: Optional[str] = Header(default=None),
+    x_stream_replay: Optional[str] = Header(default=None),  # fast | realtime
+) -> Response:
+    deadline = Deadline.from_request(payload.deadline_ms, x_request_deadline_ms)
     model_id = payload.model_container
 
     if model_id not in model_map:
@@ -71,9 +115,32 @@ async def toolchain_stream_handler(payload: LLMRequest) -> Response:
             detail=f"No service configured for model: {model_id}",
         )
 
-    return await dispatch_toolchain_stream(
-        payload=payload,
-        model_name=model_name,
-        base_url=f"{base_url}/v1",
-        protocol=protocol,
+    return await idempotency.serve(
+        "stream/toolchain",
+        idempotency_key,
+        payload,
+        lambda: stream_cache.serve(
+            "toolchain",
+            payload,
+            model_name,
+            cache_control,
+            x_stream_replay,
+            lambda: singleflight.serve(
+                "stream/toolchain",
+                payload,
+                model_name,
+                deadline,
+                lambda: guarded_dispatch(
+                    model_id,
+                    lambda replica_url: dispatch_toolchain_stream(
+                        payload=payload,
+                        model_name=model_name,
+                        base_url=f"{replica_url}/v1",
+                        protocol=protocol,
+                        deadline=deadline,
+                    ),
+                    deadline,
+                ),
+            ),
+        ),
     )
@@ -1,10 +1,23 @@
-import requests
+from typing import Dict, Optional, Type
+
+import httpx
 from openai.types.chat import ChatCompletionToolParam
-from pydantic import BaseModel, Field, ValidationError
-from toolkit.tools.tool_types import ToolProtocol
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from toolkit.tools.tool_types import (
+    ToolCachePolicy,
+    ToolExecutionError,
+    ToolProtocol,
+)
+from toolkit.utils.forecast_store import (
+    OPEN_METEO_CACHE_POLICY,
+    OPEN_METEO_TIMEOUT,
+    forecast_store,
+)
 
 
 class WeatherInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")  # an unknown key is a bad call, not noise
+
     latitude: float = Field(..., description="Latitude of the location")
     longitude: float = Field(..., description="Longitude of the location")
 
@@ -37,26 +50,41 @@ class GetWeatherTool(ToolProtocol):
             "and must return the current temperature using the `get_weather` tool.  "
         )
 
-    def execute(self, input_data: WeatherInput) -> str:
-        lat = input_data.latitude
-        lon = input_data.longitude
+    def execute(self, input_data: WeatherInput, timeout: Optional[float] = None) -> str:
+        lat, lon = input_data.latitude, input_data.longitude
+        timeout = OPEN_METEO_TIMEOUT if timeout is None else min(timeout, OPEN_METEO_TIMEOUT)
 
-        url = (
-            f"https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}&current=temperature_2m"
-        )
+        try:
+            values = forecast_store.current(lat, lon, timeout)
+        except Exception as e:
+            raise ToolExecutionError(f"Failed to retrieve weather data: {str(e)}") from e
+        return self._describe(input_data, values)
+
+    async def aexecute(
+        self, input_data: WeatherInput, http: httpx.AsyncClient, timeout: Optional[float] = None
+    ) -> str:
+        lat, lon = input_data.latitude, input_data.longitude
+        timeout = OPEN_METEO_TIMEOUT if timeout is None else min(timeout, OPEN_METEO_TIMEOUT)
 
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            temp = data["current"]["temperature_2m"]
-            return f"The current temperature at ({lat}, {lon}) is {temp}°C."
+            values = await forecast_store.acurrent(lat, lon, http, timeout)
         except Exception as e:
-            return f"Failed to retrieve weather data: {str(e)}"
+            raise ToolExecutionError(f"Failed to retrieve weather data: {str(e)}") from e
+        return self._describe(input_data, values)
+
+    @staticmethod
+    def _describe(input_data: WeatherInput, values: Dict[str, float]) -> str:
+        lat, lon = input_data.latitude, input_data.longitude
+        temp = values["temperature_2m"]
+        return f"The current temperature at ({lat}, {lon}) is {temp}°C."
 
-    def run_from_json(self, raw_json: str) -> str:
-        return self.execute(WeatherInput.model_validate_json(raw_json))
+    def run_from_json(self, raw_json: str, timeout: Optional[float] = None) -> str:
+        return self.execute(WeatherInput.model_validate_json(raw_json), timeout)
+
+    async def arun_from_json(
+        self, raw_json: str, http: httpx.AsyncClient, timeout: Optional[float] = None
+    ) -> str:
+        return await self.aexecute(WeatherInput.model_validate_json(raw_json), http, timeout)
 
     def validate_tool_call(self, raw_json: str) -> bool:
         try:
@@ -64,3 +92,16 @@ class GetWeatherTool(ToolProtocol):
             return True
         except ValidationError:
             return False
+
+    @property
+    def input_model(self) -> Type[WeatherInput]:
+        return WeatherInput
+
+    @property
+    def timeout(self) -> float:
+        timeout: float = OPEN_METEO_TIMEOUT
+        return timeout
+
+    @property
+    def cache_policy(self) -> ToolCachePolicy:
+        return OPEN_METEO_CACHE_POLICY
@@ -1,12 +1,25 @@
 # File: tools/plant_care_advisor.py
 
-import requests
+from typing import Dict, List, Optional, Type
+
+import httpx
 from openai.types.chat import ChatCompletionToolParam
-from pydantic import BaseModel, Field
-from toolkit.tools.tool_types import ToolProtocol
+from pydantic import BaseModel, ConfigDict, Field
+from toolkit.tools.tool_types import (
+    ToolCachePolicy,
+    ToolExecutionError,
+    ToolProtocol,
+)
+from toolkit.utils.forecast_store import (
+    OPEN_METEO_CACHE_POLICY,
+    OPEN_METEO_TIMEOUT,
+    forecast_store,
+)
 
 
 class PlantCareInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     latitude: float = Field(..., description="Latitude of the location")
     longitude: float = Field(..., description="Longitude of the location")
 
@@ -39,55 +52,63 @@ class PlantCareAdvisorTool(ToolProtocol):
             "and must return the current plant conditions using the `plant_care_advisor` tool. "
         )
 
-    def execute(self, input_data: PlantCareInput) -> str:
+    def execute(self, input_data: PlantCareInput, timeout: Optional[float] = None) -> str:
         lat, lon = input_data.latitude, input_data.longitude
-        url = (
-            f"https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}"
-            f"&current=temperature_2m,relative_humidity_2m,precipitation"
-            f"&timezone=auto"
-        )
+        timeout = OPEN_METEO_TIMEOUT if timeout is None else min(timeout, OPEN_METEO_TIMEOUT)
 
         try:
-            res = requests.get(url, timeout=5)
-            res.raise_for_status()
-            data = res.json()
-
-            temp = data["current"]["temperature_2m"]
-            humidity = data["current"]["relative_humidity_2m"]
-            rain = data["current"]["precipitation"]
-
-            from typing import List
-
-            messages: List[str] = [
-                f"Current temperature: {temp}°C, Humidity: {humidity}%, Rainfall: {rain}mm. \n"
-            ]
-
-            if temp < 5:
-                messages.append(
-                    "⚠️ Frost risk! Bring potted plants indoors or cover delicate crops."
-                )
-            elif temp > 30:
-                messages.append(
-                    "☀️ High heat — water early morning or late evening to reduce evaporation."
-                )
-            else:
-                messages.append("🌤️ Mild temperatures — good conditions for most outdoor plants.")
-
-            if rain > 2:
-                messages.append("🌧️ Rainfall is sufficient today — skip watering.")
-            elif humidity < 30:
-                messages.append("💧 Very dry air — consider misting or increased watering.")
-            else:
-                messages.append("🪴 Moderate humidity — maintain your normal watering schedule.")
-
-            return " ".join(messages)
-
+            current = forecast_store.current(lat, lon, timeout)
         except Exception as e:
-            return f"Failed to retrieve plant care data: {str(e)}"
+            raise ToolExecutionError(f"Failed to retrieve plant care data: {str(e)}") from e
+        return self._advise(current)
 
-    def run_from_json(self, raw_json: str) -> str:
-        return self.execute(PlantCareInput.model_validate_json(raw_json))
+    async def aexecute(
+        self, input_data: PlantCareInput, http: httpx.AsyncClient, timeout: Optional[float] = None
+    ) -> str:
+        lat, lon = input_data.latitude, input_data.longitude
+        timeout = OPEN_METEO_TIMEOUT if timeout is None else min(timeout, OPEN_METEO_TIMEOUT)
+
+        try:
+            current = await forecast_store.acurrent(lat, lon, http, timeout)
+        except Exception as e:
+            raise ToolExecutionError(f"Failed to retrieve plant care data: {str(e)}") from e
+        return self._advise(current)
+
+    @staticmethod
+    def _advise(current: Dict[str, float]) -> str:
+        temp = current["temperature_2m"]
+        humidity = current["relative_humidity_2m"]
+        rain = current["precipitation"]
+
+        messages: List[str] = [
+            f"Current temperature: {temp}°C, Humidity: {humidity}%, Rainfall: {rain}mm. \n"
+        ]
+
+        if temp < 5:
+            messages.append("⚠️ Frost risk! Bring potted plants indoors or cover delicate crops.")
+        elif temp > 30:
+            messages.append(
+                "☀️ High heat — water early morning or late evening to reduce evaporation."
+            )
+        else:
+            messages.append("🌤️ Mild temperatures — good conditions for most outdoor plants.")
+
+        if rain > 2:
+            messages.append("🌧️ Rainfall is sufficient today — skip watering.")
+        elif humidity < 30:
+            messages.append("💧 Very dry air — consider misting or increased watering.")
+        else:
+            messages.append("🪴 Moderate humidity — maintain your normal watering schedule.")
+
+        return " ".join(messages)
+
+    def run_from_json(self, raw_json: str, timeout: Optional[float] = None) -> str:
+        return self.execute(PlantCareInput.model_validate_json(raw_json), timeout)
+
+    async def arun_from_json(
+        self, raw_json: str, http: httpx.AsyncClient, timeout: Optional[float] = None
+    ) -> str:
+        return await self.aexecute(PlantCareInput.model_validate_json(raw_json), http, timeout)
 
     def validate_tool_call(self, raw_json: str) -> bool:
         try:
@@ -95,3 +116,16 @@ class PlantCareAdvisorTool(ToolProtocol):
             return True
         except Exception:
             return False
+
+    @property
+    def input_model(self) -> Type[PlantCareInput]:
+        return PlantCareInput
+
+    @property
+    def timeout(self) -> float:
+        timeout: float = OPEN_METEO_TIMEOUT
+        return timeout
+
+    @property
+    def cache_policy(self) -> ToolCachePolicy:
+        return OPEN_METEO_CACHE_POLICY
@@ -1,7 +1,40 @@
 # toolkit/tool_types.py
 
-from typing import Protocol, Optional, Literal, Any
+from dataclasses import dataclass
+from typing import Protocol, Optional, Literal, Any, Callable, Dict, Type, runtime_checkable
+
+import httpx
 from openai.types.chat import ChatCompletionToolParam
+from pydantic import BaseModel
+
+
+class ToolExecutionError(Exception):
+    """A tool could not produce a result (e.g. its upstream API failed). Never cached."""
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """How long a tool's results may be reused, and which arguments count as the same call."""
+
+    ttl: float  # seconds a result is fresh
+    stale_ttl: float = 0.0  # seconds past `ttl` it is still served while being refreshed
+    canonicalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+
+    def canonical_arguments(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return self.canonicalize(arguments) if self.canonicalize else arguments
+
+
+def snap_coordinates(step: float) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Canonicalizer rounding `latitude`/`longitude` to a grid of `step` degrees."""
+
+    def canonicalize(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        snapped = dict(arguments)
+        for field in ("latitude", "longitude"):
+            if isinstance(snapped.get(field), (int, float)):
+                snapped[field] = round(round(snapped[field] / step) * step, 6)
+        return snapped
+
+    return canonicalize
 
 
 class ToolResult:
@@ -27,10 +60,26 @@ class ToolProtocol(Protocol):
 
     # Note: `execute()` is not part of the protocol—it's an internal method each tool class must define.
     # `run_from_json()` assumes `execute()` exists to process parsed arguments and return a result.
-    def run_from_json(self, raw_json: str) -> str: ...
+    # `timeout` is the caller's remaining budget in seconds (None: the tool's own default).
+    def run_from_json(self, raw_json: str, timeout: Optional[float] = None) -> str: ...
 
     def validate_tool_call(self, raw_json: str) -> bool: ...
 
+    @property
+    def input_model(self) -> Optional[Type[BaseModel]]:
+        """Model of the arguments, checked while a call is still streaming. Optional."""
+        return None
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Seconds one call may take before it is abandoned (None: the registry's default)."""
+        return None
+
+    @property
+    def cache_policy(self) -> Optional[ToolCachePolicy]:
+        """Results may be reused under this policy (None: run on every call). Optional."""
+        return None
+
     # ===== FUTURE METHODS =====
     
     def output_schema(self) -> Optional[dict[str, Any]]:
@@ -56,4 +105,16 @@ class ToolProtocol(Protocol):
             return self.mcp_tool_spec()
         return None
 
-    # def validate_tool_call_args(self, args: dict[str, Any]) -> bool: ...
\ No newline at end of file
+    # def validate_tool_call_args(self, args: dict[str, Any]) -> bool: ...
+
+
+@runtime_checkable
+class AsyncToolProtocol(Protocol):
+    """
+    Tools that also implement this are awaited on the event loop, doing I/O through the
+    caller's pooled client; other tools run `run_from_json` in a worker thread instead.
+    """
+
+    async def arun_from_json(
+        self, raw_json: str, http: httpx.AsyncClient, timeout: Optional[float] = None
+    ) -> str: ...
\ No newline at end of file
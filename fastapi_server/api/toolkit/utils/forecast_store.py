@@ -0,0 +1,390 @@
+# utils/forecast_store.py
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+import numpy as np
+import requests
+from toolkit.tools.tool_types import ToolCachePolicy, snap_coordinates
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+OPEN_METEO_TIMEOUT = 5.0  # seconds; capped further by the request deadline
+
+# Open-Meteo refreshes current conditions every 15 minutes on a grid of a few km,
+# so nearby coordinates within a few minutes get the same answer.
+OPEN_METEO_UPDATE_INTERVAL = 900.0
+OPEN_METEO_GRID = 0.05
+
+# Cache policy of every tool answering from `forecast_store`. The tool cache sits in front
+# of the store and keeps rendered results (shared by the fleet when it is on Redis); the
+# store keeps the raw cells for this process. A cell lives for the update interval minus
+# the tool cache TTL, so a fresh tool result is never more than one interval old. Past
+# that, a result is served stale for at most `stale_ttl` while it is being refreshed.
+OPEN_METEO_CACHE_POLICY = ToolCachePolicy(
+    ttl=300, stale_ttl=900, canonicalize=snap_coordinates(OPEN_METEO_GRID)
+)
+
+# Union of what the weather tools need; one fetch per cell answers all of them.
+FIELDS = ("temperature_2m", "relative_humidity_2m", "precipitation")
+
+CellKey = Tuple[float, float]
+
+
+class ForecastUnavailable(Exception):
+    """No forecast could be produced for the requested cell or time."""
+
+
+@dataclass
+class ForecastCell:
+    latitude: float  # cell centre
+    longitude: float
+    fetched_at: float  # epoch seconds
+    expires_at: float
+    current_time: int  # epoch seconds of the current observation
+    current: np.ndarray  # float32[len(FIELDS)]
+    hourly_time: np.ndarray  # int64[hours], epoch seconds
+    hourly: np.ndarray  # float32[hours, len(FIELDS)]
+    reads: int = 0  # since the last fetch; marks hot cells for refresh-ahead
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.current.nbytes + self.hourly_time.nbytes + self.hourly.nbytes)
+
+    @staticmethod
+    def _values(row: np.ndarray) -> Dict[str, float]:
+        return {field: round(float(value), 2) for field, value in zip(FIELDS, row, strict=True)}
+
+    def current_values(self) -> Dict[str, float]:
+        return self._values(self.current)
+
+    def values_at(self, when: float) -> Dict[str, float]:
+        """Hourly values for the hour nearest to `when` (epoch seconds)."""
+        if not len(self.hourly_time) or not (
+            self.hourly_time[0] - 1800 <= when <= self.hourly_time[-1] + 1800
+        ):
+            raise ForecastUnavailable("Requested time is outside the forecast horizon")
+        index = int(np.argmin(np.abs(self.hourly_time - int(when))))
+        return self._values(self.hourly[index])
+
+
+class _PendingFetch:
+    """One in-flight fetch, awaitable from worker threads and from event loops alike."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.cell: Optional[ForecastCell] = None
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    def finish(self) -> None:
+        with self._lock:
+            self.done.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # that loop has closed; nobody is waiting there any more
+
+    async def wait_async(self, timeout: Optional[float]) -> bool:
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        with self._lock:
+            if self.done.is_set():
+                return True
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ForecastStore:
+    """
+    In-memory Open-Meteo forecasts on a lat/lon grid, shared by the weather tools.
+
+    Each grid cell is fetched once (current conditions plus the hourly series for the
+    fields in FIELDS) and kept as compact numpy arrays until `ttl` expires. Concurrent
+    readers of a missing cell wait for a single fetch, which runs apart from all of them
+    under `fetch_timeout`: each reader waits only up to its own timeout, and a reader that
+    gives up or is cancelled does not fail the fetch for the others. A cell read at least `hot_reads`
+    times is refetched in the background once `refresh_ahead` of its TTL has passed, so
+    hot cells rarely expire under a caller. Least recently used cells are dropped past
+    `max_cells`.
+
+    Sync readers (`current`, `forecast`) fetch with `requests` and are safe from several
+    threads. Async readers (`acurrent`, `aforecast`) fetch through the caller's
+    httpx.AsyncClient without blocking the event loop. Both share the same cells and
+    in-flight fetches.
+    """
+
+    def __init__(
+        self,
+        grid: float = 0.05,
+        ttl: float = 900.0,
+        refresh_ahead: float = 0.8,
+        hot_reads: int = 3,
+        max_cells: int = 2048,
+        forecast_days: int = 3,
+        fetch_timeout: float = 5.0,
+    ) -> None:
+        self.grid = grid
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.hot_reads = hot_reads
+        self.max_cells = max_cells
+        self.forecast_days = forecast_days
+        self.fetch_timeout = fetch_timeout
+        self._cells: "OrderedDict[CellKey, ForecastCell]" = OrderedDict()
+        self._pending: Dict[CellKey, _PendingFetch] = {}
+        self._lock = threading.Lock()
+        self._fetcher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="forecast-fetch")
+        self._async_fetches: Set["asyncio.Task[None]"] = set()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.refreshes_ahead = 0
+        self.evictions = 0
+
+    def cell_key(self, latitude: float, longitude: float) -> CellKey:
+        return (
+            round(round(latitude / self.grid) * self.grid, 6),
+            round(round(longitude / self.grid) * self.grid, 6),
+        )
+
+    def current(
+        self, latitude: float, longitude: float, timeout: Optional[float] = None
+    ) -> Dict[str, float]:
+        return self.cell(latitude, longitude, timeout).current_values()
+
+    def forecast(
+        self, latitude: float, longitude: float, hours_ahead: float, timeout: Optional[float] = None
+    ) -> Dict[str, float]:
+        return self.cell(latitude, longitude, timeout).values_at(time.time() + 3600 * hours_ahead)
+
+    async def acurrent(
+        self,
+        latitude: float,
+        longitude: float,
+        http: httpx.AsyncClient,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, float]:
+        return (await self.acell(latitude, longitude, http, timeout)).current_values()
+
+    async def aforecast(
+        self,
+        latitude: float,
+        longitude: float,
+        hours_ahead: float,
+        http: httpx.AsyncClient,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, float]:
+        cell = await self.acell(latitude, longitude, http, timeout)
+        return cell.values_at(time.time() + 3600 * hours_ahead)
+
+    def cell(
+        self, latitude: float, longitude: float, timeout: Optional[float] = None
+    ) -> ForecastCell:
+        key = self.cell_key(latitude, longitude)
+        cell, pending, leader = self._claim(key)
+        if cell is not None:
+            return cell
+        assert pending is not None
+
+        if leader:
+            self._start_fetch(key, pending, None)
+        if not pending.done.wait(timeout):
+            raise ForecastUnavailable("Timed out waiting for the forecast fetch")
+        return self._result(pending)
+
+    async def acell(
+        self,
+        latitude: float,
+        longitude: float,
+        http: httpx.AsyncClient,
+        timeout: Optional[float] = None,
+    ) -> ForecastCell:
+        key = self.cell_key(latitude, longitude)
+        cell, pending, leader = self._claim(key, http)
+        if cell is not None:
+            return cell
+        assert pending is not None
+
+        if leader:
+            self._start_fetch(key, pending, http)
+        # Waits on a future of its own, so giving up leaves the fetch running.
+        if not await pending.wait_async(timeout):
+            raise ForecastUnavailable("Timed out waiting for the forecast fetch")
+        return self._result(pending)
+
+    def _claim(
+        self, key: CellKey, http: Optional[httpx.AsyncClient] = None
+    ) -> Tuple[Optional[ForecastCell], Optional[_PendingFetch], bool]:
+        """A fresh cell, or the pending fetch to wait on (and whether the caller runs it)."""
+        with self._lock:
+            cell = self._cells.get(key)
+            now = time.time()
+            if cell is not None and now < cell.expires_at:
+                self._cells.move_to_end(key)
+                cell.reads += 1
+                self.hits += 1
+                self._maybe_refresh_ahead(key, cell, now, http)
+                return cell, None, False
+
+            pending = self._pending.get(key)
+            leader = pending is None
+            if pending is None:
+                pending = self._pending[key] = _PendingFetch()
+                self.misses += 1
+            else:
+                self.shared += 1
+            return None, pending, leader
+
+    @staticmethod
+    def _result(pending: _PendingFetch) -> ForecastCell:
+        if pending.cell is None:
+            raise ForecastUnavailable(str(pending.error)) from pending.error
+        return pending.cell
+
+    def _maybe_refresh_ahead(
+        self, key: CellKey, cell: ForecastCell, now: float, http: Optional[httpx.AsyncClient]
+    ) -> None:
+        # Caller holds the lock.
+        if cell.reads < self.hot_reads or key in self._pending:
+            return
+        if now < cell.fetched_at + self.refresh_ahead * self.ttl:
+            return
+        pending = self._pending[key] = _PendingFetch()
+        self.refreshes_ahead += 1
+        self._start_fetch(key, pending, http)
+
+    def _start_fetch(
+        self, key: CellKey, pending: _PendingFetch, http: Optional[httpx.AsyncClient]
+    ) -> None:
+        """Runs the fetch detached from the caller: on a worker thread, or as its own task."""
+        if http is None:
+            self._fetcher.submit(self._fetch_into, key, pending)
+            return
+        task = asyncio.ensure_future(self._afetch_into(key, pending, http))
+        self._async_fetches.add(task)  # keep a reference until it finishes
+        task.add_done_callback(self._async_fetches.discard)
+
+    def _fetch_into(self, key: CellKey, pending: _PendingFetch) -> None:
+        try:
+            self._store(key, pending, self._fetch(key))
+        except Exception as e:
+            self._fail(key, pending, e)
+
+    async def _afetch_into(
+        self, key: CellKey, pending: _PendingFetch, http: httpx.AsyncClient
+    ) -> None:
+        try:
+            self._store(key, pending, await self._afetch(key, http))
+        except BaseException as e:
+            # Also on cancellation, so threads and tasks waiting on this fetch are released.
+            self._fail(key, pending, e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+
+    def _store(self, key: CellKey, pending: _PendingFetch, cell: ForecastCell) -> None:
+        with self._lock:
+            self._cells[key] = cell
+            self._cells.move_to_end(key)
+            while len(self._cells) > self.max_cells:
+                self._cells.popitem(last=False)
+                self.evictions += 1
+            self._pending.pop(key, None)
+        pending.cell = cell
+        pending.finish()
+
+    def _fail(self, key: CellKey, pending: _PendingFetch, error: BaseException) -> None:
+        with self._lock:
+            self.fetch_errors += 1
+            self._pending.pop(key, None)
+        pending.error = error
+        pending.finish()
+
+    def _request(self, key: CellKey) -> Dict[str, Any]:
+        latitude, longitude = key
+        fields = ",".join(FIELDS)
+        return {
+            "params": {
+                "latitude": latitude,
+                "longitude": longitude,
+                "current": fields,
+                "hourly": fields,
+                "forecast_days": self.forecast_days,
+                "timeformat": "unixtime",
+                "timezone": "auto",
+            },
+            "timeout": self.fetch_timeout,
+        }
+
+    def _fetch(self, key: CellKey) -> ForecastCell:
+        response = requests.get(OPEN_METEO_URL, **self._request(key))
+        response.raise_for_status()
+        return self._parse(key, response.json())
+
+    async def _afetch(self, key: CellKey, http: httpx.AsyncClient) -> ForecastCell:
+        response = await http.get(OPEN_METEO_URL, **self._request(key))
+        response.raise_for_status()
+        return self._parse(key, response.json())
+
+    def _parse(self, key: CellKey, data: Dict[str, Any]) -> ForecastCell:
+        latitude, longitude = key
+        with self._lock:
+            self.fetches += 1
+
+        current, hourly = data["current"], data["hourly"]
+        fetched_at = time.time()
+        return ForecastCell(
+            latitude=latitude,
+            longitude=longitude,
+            fetched_at=fetched_at,
+            expires_at=fetched_at + self.ttl,
+            current_time=int(current["time"]),
+            # None (missing value) becomes NaN
+            current=np.array([current[f] for f in FIELDS], dtype=float).astype(np.float32),
+            hourly_time=np.asarray(hourly["time"], dtype=np.int64),
+            hourly=np.array([hourly[f] for f in FIELDS], dtype=float).T.astype(np.float32),
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cells": len(self._cells),
+                "bytes": sum(c.nbytes for c in self._cells.values()),
+                "fetching": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "fetches": self.fetches,
+                "fetch_errors": self.fetch_errors,
+                "refreshes_ahead": self.refreshes_ahead,
+                "evictions": self.evictions,
+            }
+
+
+# One store per process, shared by every weather-backed tool.
+forecast_store = ForecastStore(
+    grid=OPEN_METEO_GRID,
+    ttl=OPEN_METEO_UPDATE_INTERVAL - OPEN_METEO_CACHE_POLICY.ttl,
+    fetch_timeout=OPEN_METEO_TIMEOUT,
+)
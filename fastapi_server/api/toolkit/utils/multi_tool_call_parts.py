@@ -5,13 +5,26 @@ from typing import Dict, List, Sequence
 
 from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageToolCall, ChatCompletionMessageFunctionToolCall, ChatCompletionMessageToolCallUnion
 
-from .tool_call_parts import ToolCallParts
+from pydantic_core import from_json
+
+from .tool_call_parts import PartialCall, ToolCallParts
+
+_DECODER = json.JSONDecoder()
 
 
 class MultiToolCallParts:
+    """
+    Tool calls are keyed by tool_call.id, so several calls to the same tool (e.g. the
+    weather in two cities) stay separate.
+    """
+
     def __init__(self) -> None:
         self.tool_calls: Dict[str, ToolCallParts] = {}
         self.partial_tool_call_buffer: list[str] = []
+        self._ids_by_index: Dict[int, str] = {}
+        self._taken: set[str] = set()
+        self._content_call_id = ""  # id the Qwen-style call gets once complete
+        self._content_call_done = False
 
     @staticmethod
     def from_completed(
@@ -21,8 +34,7 @@ class MultiToolCallParts:
         for call in calls:
             if isinstance(call, ChatCompletionMessageFunctionToolCall):
                 # Only function tool calls have .function.name
-                name = call.function.name
-                result[name] = call
+                result[call.id] = call
         return result
 
     def to_message_tool_calls(self) -> List[ChatCompletionMessageToolCall]:
@@ -53,7 +65,9 @@ class MultiToolCallParts:
         # --- OpenAI / LLaMA-style structured calls ---
         if delta.tool_calls:
             for call in delta.tool_calls:
-                call_id = call.id or chunk.id or f"tool_{call.index}"
+                # Only a call's first delta carries its id; later ones are matched by index.
+                call_id = call.id or self._ids_by_index.get(call.index) or f"tool_{call.index}"
+                self._ids_by_index.setdefault(call.index, call_id)
                 part = self.tool_calls.setdefault(call_id, ToolCallParts(id=call_id))
                 if call.function:
                     part.name += call.function.name or ""
@@ -64,19 +78,22 @@ class MultiToolCallParts:
         # non-OpenAI modles do not support multi-tool calls yet, so we assume single call.
 
         if delta.content:
+            self._content_call_id = chunk.id
             self.partial_tool_call_buffer.append(delta.content)
             buffer = "".join(self.partial_tool_call_buffer)
 
-            # Defensive: try parsing as single object OR array of tool calls
+            # Defensive: try parsing as single object OR array of tool calls.
+            # raw_decode accepts trailing tokens after the JSON (the model keeps talking).
             try:
-                parsed = json.loads(buffer)
+                parsed, _ = _DECODER.raw_decode(buffer.lstrip())
                 # v1: Qwen (single object)
                 if isinstance(parsed, dict) and "name" in parsed and "arguments" in parsed:
-                    call_id = chunk.id
+                    call_id = self._content_call_id
                     part = self.tool_calls.setdefault(call_id, ToolCallParts(id=call_id))
                     part.name = parsed["name"]
                     part.arguments = json.dumps(parsed["arguments"])
                     self.partial_tool_call_buffer.clear()
+                    self._content_call_done = True
 
                 # v2: Future multi-call (array of tool calls).  Placeholder.
 
@@ -95,8 +112,49 @@ class MultiToolCallParts:
                 # Not complete yet, wait for more chunks
                 pass
 
+    def is_finished(self) -> bool:
+        """
+        No further calls can follow, so the rest of the stream need not be read.  True
+        once a Qwen-style call is complete (one per response); the model may keep
+        writing text after it.
+        """
+        return self._content_call_done
+
+    def take_new_complete_calls(self) -> List[ChatCompletionMessageToolCall]:
+        """Calls whose arguments became complete JSON since the last call to this method."""
+        new_calls = [
+            call for call in self.to_message_tool_calls() if call.id not in self._taken
+        ]
+        self._taken.update(call.id for call in new_calls)
+        return new_calls
+
+    def partial_calls(self) -> List[PartialCall]:
+        """
+        Every call seen so far, complete or not, including a Qwen-style call still being
+        written into the content buffer.
+        """
+        calls = [part.to_partial_call() for part in self.tool_calls.values()]
+
+        buffer = "".join(self.partial_tool_call_buffer).lstrip()
+        if buffer.startswith("{"):
+            try:
+                parsed = from_json(buffer, allow_partial=True)
+            except ValueError:
+                parsed = None  # plain text after all, not a call
+            # Partial parsing leaves strings out until they are closed, so a name is whole.
+            if isinstance(parsed, dict) and "name" in parsed:
+                calls.append(
+                    PartialCall(
+                        id=self._content_call_id,
+                        name=str(parsed["name"]),
+                        name_complete=True,
+                        arguments=parsed.get("arguments", {}),
+                    )
+                )
+        return calls
+
     def to_message_tool_call_map(self) -> dict[str, ChatCompletionMessageToolCall]:
-        return {call.function.name: call for call in self.to_message_tool_calls()}
+        return {call.id: call for call in self.to_message_tool_calls()}
 
     def get_complete_calls(self) -> list[ToolCallParts]:
         return [p for p in self.tool_calls.values() if p.is_complete() and p.is_json_complete()]
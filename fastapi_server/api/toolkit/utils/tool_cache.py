@@ -0,0 +1,212 @@
+# utils/tool_cache.py
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import (
+    Any,
+    AsyncContextManager,
+    Awaitable,
+    Callable,
+    Dict,
+    Literal,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
+
+from toolkit.tools.tool_types import ToolCachePolicy
+
+# hit: fresh entry; stale: served while a background refresh runs;
+# miss: this call ran the tool; shared: joined an identical call already running
+# (in this process, or in another one sharing the store).
+CacheStatus = Literal["hit", "stale", "miss", "shared"]
+
+# (result, status reported by the caller that started the execution)
+Flight = asyncio.Future[Tuple[str, CacheStatus]]
+
+
+class ToolCacheStore(Protocol):
+    """Byte-valued store the cache writes to (the gateway injects its cache backend)."""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None: ...
+
+
+class ToolCacheLocks(Protocol):
+    """Fill locks shared by every process using the store (the gateway injects its own)."""
+
+    def fill(self, backend: Any, key: str) -> AsyncContextManager[bool]:
+        """Yields True when another process stored `key` meanwhile, False to compute it."""
+        ...
+
+    def try_fill(self, backend: Any, key: str) -> AsyncContextManager[bool]:
+        """Yields True to recompute `key`, False when another process already is."""
+        ...
+
+
+class ToolCache:
+    """
+    Reuses tool results across requests under each tool's ToolCachePolicy.
+
+    Identical concurrent calls (after argument canonicalization) share one execution.
+    Within `stale_ttl` after expiry, the old result is returned at once and refreshed in
+    the background, so a slow or failing upstream does not reach callers until the stale
+    window is used up. Failed executions (ToolExecutionError or any exception) are never
+    stored.
+
+    With `locks`, a miss or refresh is also shared with the other processes on the store:
+    one of them runs the tool, the rest wait for its entry (or skip the refresh).
+    """
+
+    def __init__(
+        self, store: ToolCacheStore, enabled: bool = True, locks: Optional[ToolCacheLocks] = None
+    ) -> None:
+        self.store = store
+        self.enabled = enabled
+        self.locks = locks
+        self._inflight: Dict[str, Flight] = {}
+        self._refreshes: Set[Flight] = set()
+
+        # Stats
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.filled_elsewhere = 0
+        self.refresh_failures = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(tool_name: str, arguments: Dict[str, Any]) -> str:
+        canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+        return f"tool:v1:{tool_name}:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def run(
+        self,
+        tool_name: str,
+        policy: ToolCachePolicy,
+        arguments: Dict[str, Any],
+        execute: Callable[[], Awaitable[str]],
+    ) -> Tuple[str, CacheStatus]:
+        """`arguments` must already be canonical; `execute` runs the tool with them."""
+        key = self.key(tool_name, arguments)
+
+        entry = await self._read(key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age <= policy.ttl:
+                self.hits += 1
+                return entry["result"], "hit"
+            if age <= policy.ttl + policy.stale_ttl:
+                self.stale_hits += 1
+                self._refresh(key, policy, execute, entry["result"])
+                return entry["result"], "stale"
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._fill(key, policy, execute))
+            self._inflight[key] = flight
+            flight.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Shielded: one caller giving up does not cancel the execution for the others.
+            return await asyncio.shield(flight)
+
+        self.shared += 1
+        result, _ = await asyncio.shield(flight)
+        return result, "shared"
+
+    async def _fill(
+        self, key: str, policy: ToolCachePolicy, execute: Callable[[], Awaitable[str]]
+    ) -> Tuple[str, CacheStatus]:
+        if self.locks is None:
+            self.misses += 1
+            return await self._execute_and_store(key, policy, execute), "miss"
+
+        # Another process may already be running this call; wait for its entry.
+        async with self.locks.fill(self.store, key) as filled_elsewhere:
+            if filled_elsewhere:
+                entry = await self._read(key)
+                if entry is not None and time.time() - entry["stored_at"] <= policy.ttl:
+                    self.filled_elsewhere += 1
+                    return entry["result"], "shared"
+            self.misses += 1
+            return await self._execute_and_store(key, policy, execute), "miss"
+
+    async def _refresh_entry(
+        self,
+        key: str,
+        policy: ToolCachePolicy,
+        execute: Callable[[], Awaitable[str]],
+        stale_result: str,
+    ) -> Tuple[str, CacheStatus]:
+        if self.locks is None:
+            return await self._execute_and_store(key, policy, execute), "miss"
+
+        # The stale entry is still served meanwhile, so never wait for another refresher.
+        async with self.locks.try_fill(self.store, key) as refresh:
+            if refresh:
+                return await self._execute_and_store(key, policy, execute), "miss"
+        return stale_result, "stale"
+
+    async def _execute_and_store(
+        self, key: str, policy: ToolCachePolicy, execute: Callable[[], Awaitable[str]]
+    ) -> str:
+        result = await execute()
+        entry = {"stored_at": time.time(), "result": result}
+        try:
+            await self.store.set(
+                key, json.dumps(entry).encode("utf-8"), policy.ttl + policy.stale_ttl
+            )
+        except Exception:
+            self.errors += 1
+        return result
+
+    def _refresh(
+        self,
+        key: str,
+        policy: ToolCachePolicy,
+        execute: Callable[[], Awaitable[str]],
+        stale_result: str,
+    ) -> None:
+        if key in self._inflight:
+            return
+        flight = asyncio.ensure_future(self._refresh_entry(key, policy, execute, stale_result))
+        self._inflight[key] = flight
+        self._refreshes.add(flight)  # keep a reference until it finishes
+
+        def done(task: Flight) -> None:
+            self._inflight.pop(key, None)
+            self._refreshes.discard(task)
+            if task.cancelled() or task.exception() is not None:
+                self.refresh_failures += 1  # the stale entry stays until its window ends
+
+        flight.add_done_callback(done)
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self.store.get(key)
+        except Exception:
+            self.errors += 1
+            return None
+        if raw is None:
+            return None
+        entry: Dict[str, Any] = json.loads(raw)
+        return entry
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses + self.shared + self.filled_elsewhere
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "filled_elsewhere": self.filled_elsewhere,
+            "hit_ratio": round((lookups - self.misses) / lookups, 4) if lookups else None,
+            "in_flight": len(self._inflight),
+            "refresh_failures": self.refresh_failures,
+            "errors": self.errors,
+        }
@@ -2,7 +2,7 @@
 
 import json
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 from openai.types.chat import (
     ChatCompletionChunk,
@@ -11,6 +11,34 @@ from openai.types.chat import (
 from openai.types.chat.chat_completion_message_tool_call import (
     Function as ToolCallFunction,
 )
+from pydantic_core import from_json
+
+
+def parse_partial_json(raw: str) -> Tuple[Any, bool]:
+    """
+    Parses a JSON prefix into (value, complete). Values still being written are left
+    out (`{"a": 1, "b": "x` gives {"a": 1}), except that a trailing number, object or
+    array may still grow. Raises ValueError for text that cannot start a JSON value.
+    """
+    text = raw.strip()
+    if not text:
+        return None, False
+    try:
+        return json.loads(text), True
+    except ValueError:
+        return from_json(text, allow_partial=True), False
+
+
+@dataclass
+class PartialCall:
+    """What has been parsed of a tool call so far, for checking it mid flight."""
+
+    id: str
+    name: str
+    name_complete: bool
+    arguments: Any = None  # parsed prefix of the arguments (see parse_partial_json)
+    arguments_complete: bool = False
+    json_error: Optional[str] = None  # the arguments can never be valid JSON
 
 
 @dataclass
@@ -49,7 +77,8 @@ class ToolCallParts:
 
     def is_json_complete(self) -> bool:
         """
-        Future check to validate arguments mid flight.  Would like to cancel a stream if failing already.
+        Arguments parse as JSON.  to_partial_call() is for checking them mid flight,
+        so a stream can be cancelled once a call is failing already.
         """
         try:
             json.loads(self.arguments)
@@ -57,6 +86,15 @@ class ToolCallParts:
         except Exception:
             return False
 
+    def to_partial_call(self) -> PartialCall:
+        # Streamed calls carry their name before the first argument delta.
+        call = PartialCall(id=self.id, name=self.name, name_complete=bool(self.arguments))
+        try:
+            call.arguments, call.arguments_complete = parse_partial_json(self.arguments)
+        except ValueError as e:
+            call.json_error = f"Arguments are not valid JSON: {e}"
+        return call
+
     def to_dict(self) -> dict[str, Any]:
         return {"name": self.name, "arguments": self.arguments, "id": self.id}
 
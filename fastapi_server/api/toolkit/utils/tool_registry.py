@@ -1,20 +1,90 @@
-from typing import Any, Dict, List, Sequence, Union
+import asyncio
+import hashlib
+import json
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Type, Union
 
+import httpx
 from openai.types.chat import ChatCompletionMessageToolCall, ChatCompletionToolParam
-from pydantic import ValidationError
-from toolkit.tools.tool_types import ToolProtocol
+from pydantic import BaseModel, ValidationError
+from toolkit.tools.tool_types import AsyncToolProtocol, ToolExecutionError, ToolProtocol
+from toolkit.utils.tool_cache import CacheStatus, ToolCache
+from toolkit.utils.tool_call_parts import PartialCall
 
 ValidationResult = Dict[str, Union[bool, str]]
 
+# (result, cache status, whether the result is an error)
+CallOutcome = Tuple[str, Optional[CacheStatus], bool]
+
+
+def _partial_arguments_error(
+    model: Type[BaseModel], arguments: Any, complete: bool
+) -> Optional[str]:
+    if not isinstance(arguments, dict):
+        return "Arguments must be a JSON object"
+
+    if model.model_config.get("extra") == "forbid":
+        allowed = set(model.model_fields)
+        allowed.update(field.alias for field in model.model_fields.values() if field.alias)
+        # Keys only show up in a partial parse once their name is closed.
+        unexpected = [key for key in arguments if key not in allowed]
+        if unexpected:
+            return f"Unexpected argument: {unexpected[0]}"
+
+    # Until the arguments are complete, a trailing number, object or array may still grow.
+    settled = dict(arguments)
+    if not complete and settled:
+        last = next(reversed(settled))
+        if settled[last] is not None and not isinstance(settled[last], (str, bool)):
+            del settled[last]
+    try:
+        model.model_validate(settled)
+    except ValidationError as e:
+        for error in e.errors():
+            loc = error["loc"]
+            if complete or (error["type"] != "missing" and loc and loc[0] in settled):
+                return f"Invalid argument {'.'.join(map(str, loc))}: {error['msg']}"
+    return None
+
 
 class ToolRegistry:
     """
-    constructor expects any ordered, iterable container of ToolProtocol items
+    constructor expects any ordered, iterable container of ToolProtocol items;
+    with a `cache`, tools that declare a cache_policy reuse results across calls;
+    with an `http_client`, tools that implement AsyncToolProtocol are awaited on the event
+    loop, and the rest run on `executor` (default: asyncio's default thread pool);
+    `call_timeout` bounds each call to a tool that declares no timeout of its own
     """
 
-    def __init__(self, tools: Sequence[ToolProtocol]) -> None:
+    def __init__(
+        self,
+        tools: Sequence[ToolProtocol],
+        cache: Optional[ToolCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        executor: Optional[Executor] = None,
+        call_timeout: Optional[float] = None,
+    ) -> None:
         self.tools = tools
+        self.cache = cache
+        self.http_client = http_client
+        self.executor = executor
+        self.call_timeout = call_timeout
         self._tool_map: Dict[str, ToolProtocol] = {tool.name: tool for tool in tools}
+        self.version = self._fingerprint(tools)
+
+    @staticmethod
+    def _fingerprint(tools: Sequence[ToolProtocol]) -> str:
+        """Changes whenever a tool's spec or prompts do, so plans cached against it expire."""
+        canonical = json.dumps(
+            [
+                {"spec": tool.tool_spec(), "system_prompt": tool.tool_system_prompt()}
+                for tool in tools
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
 
     def get(self, name: str) -> ToolProtocol:
         return self._tool_map[name]
@@ -34,44 +104,197 @@ class ToolRegistry:
     def validate_all_tool_calls(
         self, tool_call_map: Dict[str, ChatCompletionMessageToolCall]
     ) -> Dict[str, ValidationResult]:
+        """`tool_call_map` is keyed by tool_call.id; so is the result."""
         results: Dict[str, ValidationResult] = {}
 
-        for tool in self.tools:
-            call = tool_call_map.get(tool.name)
-            if not call:
-                results[tool.name] = {"valid": False, "error": "Tool call missing"}
+        for call_id, call in tool_call_map.items():
+            tool = self._tool_map.get(call.function.name)
+            if tool is None:
+                results[call_id] = {"valid": False, "error": f"Unknown tool: {call.function.name}"}
                 continue
 
             try:
-                tool.validate_tool_call(call.function.arguments)
-                results[tool.name] = {"valid": True}
+                if tool.validate_tool_call(call.function.arguments):
+                    results[call_id] = {"valid": True}
+                else:
+                    results[call_id] = {"valid": False, "error": "Invalid arguments"}
             except ValidationError as e:
-                results[tool.name] = {
+                results[call_id] = {
                     "valid": False,
                     "error": str(e),
                 }
 
         return results
 
-    def execute_all_tool_calls(
-        self, tool_call_map: Dict[str, ChatCompletionMessageToolCall]
+    def find_doomed_calls(self, calls: Sequence[PartialCall]) -> Dict[str, ValidationResult]:
+        """
+        Calls that can no longer become valid while they are still streaming: an unknown
+        tool, arguments that are not a JSON object, an unexpected key or a value of the
+        wrong type. Keyed by call id; calls that may still turn out valid are left out.
+        """
+        results: Dict[str, ValidationResult] = {}
+        for call in calls:
+            error = self._partial_call_error(call)
+            if error is not None:
+                results[call.id] = {"valid": False, "error": error}
+        return results
+
+    def _partial_call_error(self, call: PartialCall) -> Optional[str]:
+        if not call.name_complete:
+            if any(name.startswith(call.name) for name in self._tool_map):
+                return None
+            return f"Unknown tool: {call.name}"
+
+        tool = self._tool_map.get(call.name)
+        if tool is None:
+            return f"Unknown tool: {call.name}"
+        json_error: Optional[str] = call.json_error
+        if json_error is not None:
+            return json_error
+        model = tool.input_model
+        if model is None:
+            return None
+        return _partial_arguments_error(model, call.arguments, call.arguments_complete)
+
+    async def execute_all_tool_calls(
+        self,
+        tool_call_map: Dict[str, ChatCompletionMessageToolCall],
+        timeout: Optional[float] = None,
+        cache_status: Optional[Dict[str, CacheStatus]] = None,
+        failed: Optional[Set[str]] = None,
     ) -> Dict[str, str]:
-        results: Dict[str, str] = {}
+        """
+        Runs every call in `tool_call_map` (keyed by tool_call.id) concurrently and returns
+        the results in the same order, keyed by tool_call.id. Calls to the same tool with
+        different arguments are separate calls.
 
-        for tool in self.tools:
-            call = tool_call_map.get(tool.name)
-            if not call:
-                continue  # Remove this tool from results entirely if missing
+        `timeout` is the budget (seconds) for all calls together; each call is also bounded
+        by its tool's own timeout (or `call_timeout`). A call that fails or times out gets an
+        error string as its result; the others are unaffected. Async tools run on the event
+        loop, sync tools in worker threads. For cached tools, `cache_status` (when given)
+        collects how each tool_call.id was answered; `failed` collects the ids whose result
+        is an error.
+        """
+        return await self.batch(timeout).collect(tool_call_map, cache_status, failed)
 
-            try:
-                result = tool.run_from_json(call.function.arguments)
-            except Exception as e:
-                result = f"[Tool Error] {str(e)}"
+    def batch(self, timeout: Optional[float] = None) -> "ToolCallBatch":
+        """A ToolCallBatch whose calls share a `timeout` budget counted from now."""
+        return ToolCallBatch(self, timeout)
 
-            # ✅ Store result keyed by tool_call.id, not tool.name
-            results[call.id] = result
+    def is_valid_call(self, call: ChatCompletionMessageToolCall) -> bool:
+        tool = self._tool_map.get(call.function.name)
+        try:
+            return tool is not None and tool.validate_tool_call(call.function.arguments)
+        except ValidationError:
+            return False
 
-        return results
+    async def _execute_call(
+        self, call: ChatCompletionMessageToolCall, budget: Optional[float]
+    ) -> CallOutcome:
+        tool = self._tool_map.get(call.function.name)
+        if tool is None:
+            return f"[Tool Error] Unknown tool: {call.function.name}", None, True
+        if budget is not None and budget <= 0:
+            return "[Tool Error] Deadline exceeded before the tool could run", None, True
+
+        limits = [t for t in (budget, tool.timeout or self.call_timeout) if t is not None]
+        timeout = min(limits) if limits else None
+        try:
+            result, status = await asyncio.wait_for(
+                self._execute(tool, call.function.arguments, timeout), timeout=timeout
+            )
+            return result, status, False
+        except asyncio.TimeoutError:
+            return "[Tool Error] Deadline exceeded while the tool was running", None, True
+        except ToolExecutionError as e:
+            return str(e), None, True
+        except Exception as e:
+            return f"[Tool Error] {str(e)}", None, True
+
+    async def _execute(
+        self, tool: ToolProtocol, raw_json: str, timeout: Optional[float]
+    ) -> Tuple[str, Optional[CacheStatus]]:
+        policy = tool.cache_policy
+        if self.cache is None or not self.cache.enabled or policy is None:
+            return await self._run(tool, raw_json, timeout), None
+
+        # Run with the canonical arguments so the stored result matches its key.
+        arguments = policy.canonical_arguments(json.loads(raw_json))
+        canonical_json = json.dumps(arguments)
+        outcome: Tuple[str, CacheStatus] = await self.cache.run(
+            tool.name, policy, arguments, lambda: self._run(tool, canonical_json, timeout)
+        )
+        return outcome
+
+    async def _run(self, tool: ToolProtocol, raw_json: str, timeout: Optional[float]) -> str:
+        if self.http_client is not None and isinstance(tool, AsyncToolProtocol):
+            result: str = await tool.arun_from_json(raw_json, self.http_client, timeout)
+            return result
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, tool.run_from_json, raw_json, timeout)
 
     def list_metadata(self) -> List[Dict[str, Any]]:
         return [{"name": t.name, "description": t.description} for t in self.tools]
+
+
+class ToolCallBatch:
+    """
+    Tool calls of one turn, started individually and collected together.
+
+    A streaming caller can `start` each call as soon as its arguments are complete, while
+    the model is still producing later calls; `collect` then starts whatever is left and
+    waits for all of them. A call whose final arguments differ from the ones it was
+    started with is run again. `cancel` drops calls nobody will collect.
+    """
+
+    def __init__(self, registry: ToolRegistry, timeout: Optional[float] = None) -> None:
+        self.registry = registry
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+        self._started: Dict[str, Tuple[str, "asyncio.Task[CallOutcome]"]] = {}
+        self.speculative = 0  # calls started before collect()
+
+    def remaining(self) -> Optional[float]:
+        return self.expires_at - time.monotonic() if self.expires_at is not None else None
+
+    def start(self, call: ChatCompletionMessageToolCall) -> None:
+        if call.id in self._started:
+            return
+        task = asyncio.ensure_future(self.registry._execute_call(call, self.remaining()))
+        self._started[call.id] = (call.function.arguments, task)
+
+    def start_early(self, call: ChatCompletionMessageToolCall) -> None:
+        """`start`, but only for valid calls; invalid ones wait for collect() to report them."""
+        if call.id not in self._started and self.registry.is_valid_call(call):
+            self.start(call)
+            self.speculative += 1
+
+    async def collect(
+        self,
+        tool_call_map: Dict[str, ChatCompletionMessageToolCall],
+        cache_status: Optional[Dict[str, CacheStatus]] = None,
+        failed: Optional[Set[str]] = None,
+    ) -> Dict[str, str]:
+        """Results for `tool_call_map` (keyed by tool_call.id), in its order."""
+        for call_id, call in tool_call_map.items():
+            started = self._started.get(call_id)
+            if started is not None and started[0] != call.function.arguments:
+                started[1].cancel()
+                del self._started[call_id]
+            self.start(call)
+
+        outcomes = await asyncio.gather(*(self._started[call_id][1] for call_id in tool_call_map))
+
+        results: Dict[str, str] = {}
+        for call_id, (result, status, error) in zip(tool_call_map, outcomes, strict=True):
+            results[call_id] = result
+            if failed is not None and error:
+                failed.add(call_id)
+            if cache_status is not None and status is not None:
+                cache_status[call_id] = status
+        self.cancel()  # anything started for a call that is not in the final map
+        return results
+
+    def cancel(self) -> None:
+        for _, task in self._started.values():
+            if not task.done():
+                task.cancel()
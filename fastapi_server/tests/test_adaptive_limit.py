@@ -0,0 +1,75 @@
+from dataclasses import replace
+
+from api.config.gateway_settings import AdaptiveLimitSettings
+from api.core.adaptive_limit import AdaptiveLimit
+
+SETTINGS = AdaptiveLimitSettings(
+    enabled=True,
+    min_limit=1,
+    max_limit=10,
+    ttft_tolerance=2.0,
+    total_tolerance=3.0,
+    backoff=0.5,
+    smoothing=1.0,  # the EWMA is the latest sample, so one slow request is enough
+    baseline_drift=0.0,
+)
+
+
+def fill_window(limit: AdaptiveLimit, ttft: float = 0.1, failed: bool = False) -> None:
+    for _ in range(limit.limit):
+        limit.on_sample(ttft, 1.0, in_flight=limit.limit, failed=failed)
+
+
+def test_limit_grows_by_one_per_saturated_healthy_window() -> None:
+    limit = AdaptiveLimit(4, SETTINGS)
+    fill_window(limit)
+    assert limit.limit == 5
+    fill_window(limit)
+    assert (limit.limit, limit.increases) == (6, 2)
+
+
+def test_limit_holds_while_it_is_not_in_use() -> None:
+    limit = AdaptiveLimit(4, SETTINGS)
+    for _ in range(4):
+        limit.on_sample(0.1, 1.0, in_flight=1)
+    assert (limit.limit, limit.increases, limit.decreases) == (4, 0, 0)
+
+
+def test_window_is_re_evaluated_only_once_it_is_full() -> None:
+    limit = AdaptiveLimit(4, SETTINGS)
+    for _ in range(3):
+        limit.on_sample(0.1, 1.0, in_flight=4)
+    assert limit.increases == 0
+    limit.on_sample(0.1, 1.0, in_flight=4)
+    assert limit.increases == 1
+
+
+def test_degraded_ttft_backs_off_once_per_window() -> None:
+    limit = AdaptiveLimit(8, SETTINGS)
+    limit.on_sample(0.1, 1.0, in_flight=8)  # baseline
+    for _ in range(7):
+        limit.on_sample(1.0, 1.0, in_flight=8)
+    assert (limit.limit, limit.decreases) == (4, 1)
+
+
+def test_a_burst_of_failures_backs_off_once() -> None:
+    limit = AdaptiveLimit(8, SETTINGS)
+    fill_window(limit, failed=True)
+    assert (limit.limit, limit.decreases) == (4, 1)
+
+
+def test_failures_do_not_feed_the_latency_baseline() -> None:
+    limit = AdaptiveLimit(2, SETTINGS)
+    limit.on_sample(0.001, 0.001, in_flight=1, failed=True)
+    assert limit.ttft.baseline is None and limit.total.baseline is None
+
+
+def test_limit_stays_within_bounds() -> None:
+    limit = AdaptiveLimit(1, SETTINGS)
+    fill_window(limit, failed=True)
+    assert limit.limit == SETTINGS.min_limit
+
+    limit = AdaptiveLimit(100, replace(SETTINGS, max_limit=3))
+    assert limit.limit == 3
+    fill_window(limit)
+    assert limit.limit == 3
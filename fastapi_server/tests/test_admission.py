@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from api.config.gateway_settings import AdaptiveLimitSettings, AdmissionSettings
+from api.core.admission import AdmissionRejected, BackendGovernor
+
+FIXED = AdaptiveLimitSettings(
+    enabled=False,
+    min_limit=1,
+    max_limit=8,
+    ttft_tolerance=2.0,
+    total_tolerance=3.0,
+    backoff=0.5,
+    smoothing=0.2,
+    baseline_drift=0.01,
+)
+
+
+def governor(
+    max_in_flight: int = 1, max_queue: int = 1, queue_timeout: float = 1.0
+) -> BackendGovernor:
+    settings = AdmissionSettings(
+        max_in_flight=max_in_flight,
+        max_queue=max_queue,
+        queue_timeout=queue_timeout,
+        retry_after=2,
+    )
+    return BackendGovernor("traditional", settings, FIXED)
+
+
+async def test_admits_up_to_the_limit_then_rejects_when_the_queue_is_full() -> None:
+    g = governor(max_in_flight=1, max_queue=1)
+    lease = await g.acquire()
+    waiting = asyncio.ensure_future(g.acquire())
+    await asyncio.sleep(0)
+    assert g.queued == 1
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await g.acquire()
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after == 2
+
+    lease.release()
+    second = await waiting
+    assert g.in_flight == 1 and g.queued == 0
+    second.release()
+    assert g.in_flight == 0
+
+
+async def test_queued_requests_are_admitted_in_arrival_order() -> None:
+    g = governor(max_in_flight=1, max_queue=3)
+    lease = await g.acquire()
+    order = []
+
+    async def wait(name: str) -> None:
+        admitted = await g.acquire()
+        order.append(name)
+        admitted.release()
+
+    waiters = [asyncio.ensure_future(wait(name)) for name in "abc"]
+    await asyncio.sleep(0)
+    lease.release()
+    await asyncio.gather(*waiters)
+    assert order == ["a", "b", "c"]
+
+
+async def test_queue_timeout_rejects_with_503_and_frees_the_queue_slot() -> None:
+    g = governor(max_in_flight=1, max_queue=1, queue_timeout=0.01)
+    lease = await g.acquire()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await g.acquire()
+    assert rejected.value.status_code == 503
+    assert g.rejected_timeout == 1
+    assert g.queued == 0
+
+    lease.release()
+    assert g.in_flight == 0
+
+
+async def test_cancelled_waiter_does_not_keep_a_slot() -> None:
+    g = governor(max_in_flight=1, max_queue=2)
+    lease = await g.acquire()
+    cancelled = asyncio.ensure_future(g.acquire())
+    waiting = asyncio.ensure_future(g.acquire())
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    lease.release()
+
+    (await waiting).release()
+    assert g.in_flight == 0 and g.queued == 0
+
+
+async def test_try_acquire_never_queues() -> None:
+    g = governor(max_in_flight=1)
+    lease = g.try_acquire()
+    assert lease is not None
+    assert g.try_acquire() is None
+    lease.release()
+    assert g.try_acquire() is not None
+
+
+async def test_release_and_abandon_are_idempotent() -> None:
+    g = governor(max_in_flight=2)
+    released = await g.acquire()
+    abandoned = await g.acquire()
+
+    released.release()
+    released.release()
+    abandoned.abandon()
+    abandoned.release()
+
+    assert g.in_flight == 0
+    assert g.admitted == 2
+    assert len(g.total_latency) == 1  # abandon leaves no latency sample
+
+
+async def test_failed_release_is_counted_without_a_latency_sample() -> None:
+    g = governor()
+    (await g.acquire()).release(failed=True)
+    assert g.failures == 1
+    assert len(g.total_latency) == 0
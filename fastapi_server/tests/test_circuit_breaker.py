@@ -0,0 +1,129 @@
+from typing import AsyncIterator, Set
+
+import httpx
+import pytest
+
+from api.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    backend_key,
+    track_upstream_failures,
+)
+
+BACKEND = "http://traditional_model:11434"
+
+
+def breaker(failure_threshold: int = 2, half_open_max_calls: int = 1) -> CircuitBreaker:
+    return CircuitBreaker(
+        BACKEND,
+        failure_threshold=failure_threshold,
+        recovery_timeout=30.0,
+        half_open_max_calls=half_open_max_calls,
+    )
+
+
+def state(b: CircuitBreaker) -> CircuitState:
+    # A call, so mypy does not keep `b.state` narrowed across transitions.
+    return b.state
+
+
+def expire_recovery(b: CircuitBreaker) -> None:
+    b.opened_at -= b.recovery_timeout
+
+
+def test_opens_after_consecutive_failures_and_fails_fast() -> None:
+    b = breaker(failure_threshold=2)
+    b.record_failure()
+    b.record_success()  # resets the count
+    b.record_failure()
+    assert state(b) == "closed"
+    b.record_failure()
+    assert state(b) == "open"
+    assert not b.allows_request()
+
+    with pytest.raises(CircuitOpenError) as error:
+        b.before_call()
+    assert error.value.retry_in > 0
+    assert b.rejected == 1
+
+
+def test_half_open_admits_limited_trials_and_closes_on_success() -> None:
+    b = breaker(failure_threshold=1, half_open_max_calls=1)
+    b.record_failure()
+    expire_recovery(b)
+    assert state(b) == "half_open"
+
+    b.before_call()
+    assert not b.allows_request()
+    with pytest.raises(CircuitOpenError):
+        b.before_call()
+
+    b.record_success()
+    assert state(b) == "closed"
+    assert b.half_open_in_flight == 0
+
+
+def test_half_open_failure_reopens() -> None:
+    b = breaker(failure_threshold=1)
+    b.record_failure()
+    expire_recovery(b)
+    b.before_call()
+    b.record_failure()
+    assert state(b) == "open"
+    assert b.times_opened == 2
+
+
+def test_abandoned_trial_frees_its_slot_without_a_verdict() -> None:
+    b = breaker(failure_threshold=1)
+    b.record_failure()
+    expire_recovery(b)
+    b.before_call()
+    b.record_abandoned()
+    assert state(b) == "half_open"
+    assert b.allows_request()
+
+
+async def test_guard_counts_only_upstream_failures() -> None:
+    b = breaker(failure_threshold=1)
+    failed: Set[str] = set()
+
+    with track_upstream_failures(failed):
+        with pytest.raises(ValueError):
+            async with b.guard():
+                raise ValueError("handler error")
+        assert state(b) == "closed" and not failed
+
+        with pytest.raises(httpx.ConnectError):
+            async with b.guard():
+                raise httpx.ConnectError("refused")
+    assert state(b) == "open"
+    assert failed == {BACKEND}
+
+
+async def upstream_stream(fail_after: int) -> AsyncIterator[int]:
+    for item in range(fail_after):
+        yield item
+    raise httpx.ReadError("connection reset")
+
+
+async def test_read_counts_failed_reads_but_not_the_consumer() -> None:
+    b = breaker(failure_threshold=1)
+    with pytest.raises(RuntimeError):
+        async for _ in b.read(upstream_stream(fail_after=2)):
+            raise RuntimeError("client went away")
+    assert state(b) == "closed"
+
+    failed: Set[str] = set()
+    received = []
+    with track_upstream_failures(failed):
+        with pytest.raises(httpx.ReadError):
+            async for item in b.read(upstream_stream(fail_after=2)):
+                received.append(item)
+    assert received == [0, 1]
+    assert state(b) == "open"
+    assert failed == {BACKEND}
+
+
+def test_backend_key_strips_the_api_suffix() -> None:
+    assert backend_key(f"{BACKEND}/v1/") == BACKEND
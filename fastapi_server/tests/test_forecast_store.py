@@ -0,0 +1,92 @@
+import asyncio
+import time
+from typing import AsyncIterator, List
+
+import httpx
+import pytest
+
+from toolkit.utils.forecast_store import FIELDS, ForecastStore, ForecastUnavailable
+
+
+class OpenMeteo:
+    """Fake Open-Meteo answering after `delay` seconds; counts requests."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.requests: List[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        now = int(time.time())
+        hours = [now + 3600 * h for h in range(3)]
+        return httpx.Response(
+            200,
+            json={
+                "current": {"time": now, **{field: 20.0 for field in FIELDS}},
+                "hourly": {"time": hours, **{field: [20.0, 21.0, 22.0] for field in FIELDS}},
+            },
+        )
+
+
+@pytest.fixture
+def upstream() -> OpenMeteo:
+    return OpenMeteo(delay=0.05)
+
+
+@pytest.fixture
+async def http(upstream: OpenMeteo) -> AsyncIterator[httpx.AsyncClient]:
+    async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as client:
+        yield client
+
+
+async def test_concurrent_readers_share_one_fetch(
+    upstream: OpenMeteo, http: httpx.AsyncClient
+) -> None:
+    store = ForecastStore()
+    results = await asyncio.gather(
+        *(store.acurrent(52.5, 13.4, http, timeout=1.0) for _ in range(5))
+    )
+    assert all(result["temperature_2m"] == 20.0 for result in results)
+    assert len(upstream.requests) == 1
+    assert (store.misses, store.shared) == (1, 4)
+
+
+async def test_leader_timeout_does_not_fail_the_other_readers(
+    upstream: OpenMeteo, http: httpx.AsyncClient
+) -> None:
+    store = ForecastStore()
+    leader = asyncio.ensure_future(store.acurrent(52.5, 13.4, http, timeout=0.01))
+    follower = asyncio.ensure_future(store.acurrent(52.5, 13.4, http, timeout=1.0))
+
+    with pytest.raises(ForecastUnavailable):
+        await leader
+    assert (await follower)["temperature_2m"] == 20.0
+    assert store.fetch_errors == 0
+    assert len(upstream.requests) == 1
+
+
+async def test_cancelled_leader_does_not_fail_the_other_readers(
+    upstream: OpenMeteo, http: httpx.AsyncClient
+) -> None:
+    store = ForecastStore()
+    leader = asyncio.ensure_future(store.acurrent(52.5, 13.4, http, timeout=1.0))
+    follower = asyncio.ensure_future(store.acurrent(52.5, 13.4, http, timeout=1.0))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert (await follower)["temperature_2m"] == 20.0
+    assert leader.cancelled()
+    assert store.fetch_errors == 0
+
+
+async def test_fetch_outlives_a_reader_that_gave_up(
+    upstream: OpenMeteo, http: httpx.AsyncClient
+) -> None:
+    store = ForecastStore()
+    with pytest.raises(ForecastUnavailable):
+        await store.acurrent(52.5, 13.4, http, timeout=0.01)
+    await asyncio.sleep(0.1)
+
+    assert (await store.acurrent(52.5, 13.4, http, timeout=0.01))["temperature_2m"] == 20.0
+    assert (store.fetches, store.hits) == (1, 1)
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from api.config.model_routes import model_map
+from api.core import hedging
+from api.core.admission import admission_controller
+from api.core.circuit_breaker import backend_key
+from api.core.deadline import Deadline, DeadlineExceeded
+from api.core.hedging import Hedger
+
+PRIMARY = "http://traditional_model:11434/v1"
+SIBLING = "traditional_alt"
+
+
+@pytest.fixture(autouse=True)
+def short_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(hedging, "HEDGE_DEFAULT_DELAY", 0.02)
+    monkeypatch.setitem(model_map, SIBLING, "alt-model")
+
+
+class Upstream:
+    """Fake upstream: per-model latencies, and a record of every call's fate."""
+
+    def __init__(self, latency: Dict[str, float]) -> None:
+        self.latency = latency
+        self.started: List[str] = []
+        self.cancelled: List[str] = []
+
+    async def __call__(self, base_url: str, model_name: str) -> str:
+        self.started.append(model_name)
+        try:
+            await asyncio.sleep(self.latency[model_name])
+        except asyncio.CancelledError:
+            self.cancelled.append(model_name)
+            raise
+        return model_name
+
+
+async def test_fast_primary_is_not_hedged() -> None:
+    upstream = Upstream({"primary": 0.0})
+    hedger = Hedger()
+    result = await hedger.run(
+        phase="chat", base_url=PRIMARY, model_name="primary", call=upstream, hedge_model_id=SIBLING
+    )
+    assert result == "primary"
+    assert upstream.started == ["primary"]
+    assert hedger.snapshot()[f"{backend_key(PRIMARY)}#chat"]["hedges_sent"] == 0
+
+
+async def test_slow_primary_loses_to_the_hedge_and_is_cancelled() -> None:
+    upstream = Upstream({"primary": 10.0, "alt-model": 0.0})
+    hedger = Hedger()
+    result = await hedger.run(
+        phase="chat", base_url=PRIMARY, model_name="primary", call=upstream, hedge_model_id=SIBLING
+    )
+    await asyncio.sleep(0)
+    assert result == "alt-model"
+    assert upstream.cancelled == ["primary"]
+    stats = hedger.snapshot()[f"{backend_key(PRIMARY)}#chat"]
+    assert (stats["hedges_sent"], stats["hedge_wins"]) == (1, 1)
+    assert admission_controller.get(SIBLING).in_flight == 0
+
+
+async def test_cancelling_the_caller_during_the_delay_cancels_the_primary() -> None:
+    upstream = Upstream({"primary": 10.0})
+    caller = asyncio.ensure_future(
+        Hedger().run(
+            phase="chat",
+            base_url=PRIMARY,
+            model_name="primary",
+            call=upstream,
+            hedge_model_id=SIBLING,
+        )
+    )
+    await asyncio.sleep(0.005)  # inside the hedge delay
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+    assert upstream.cancelled == ["primary"]
+
+
+async def test_deadline_expiry_during_the_delay_cancels_the_primary() -> None:
+    upstream = Upstream({"primary": 10.0})
+    hedged = Hedger().run(
+        phase="chat", base_url=PRIMARY, model_name="primary", call=upstream, hedge_model_id=SIBLING
+    )
+    with pytest.raises(DeadlineExceeded):
+        await Deadline(0.005).run(hedged, "chat")
+    await asyncio.sleep(0)
+    assert upstream.cancelled == ["primary"]
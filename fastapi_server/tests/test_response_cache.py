@@ -0,0 +1,23 @@
+import pytest
+
+from api.core.response_cache import CacheControl
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, CacheControl()),
+        ("", CacheControl()),
+        ("no-store", CacheControl(no_store=True)),
+        ("No-Cache", CacheControl(no_cache=True)),
+        ("max-age=60", CacheControl(max_age=60.0)),
+        ('max-age="30"', CacheControl(max_age=30.0)),
+        ("max-age=0", CacheControl(no_cache=True, max_age=0.0)),
+        ("max-age=-5", CacheControl(no_cache=True, max_age=0.0)),
+        ("max-age=soon", CacheControl()),
+        ("no-cache, max-age=10", CacheControl(no_cache=True, max_age=10.0)),
+        (" no-store ,private", CacheControl(no_store=True)),
+    ],
+)
+def test_parse(header: str, expected: CacheControl) -> None:
+    assert CacheControl.parse(header) == expected
@@ -0,0 +1,64 @@
+import numpy as np
+
+from api.core.semantic_cache import VectorIndex
+
+NOW = 1_000.0
+TTL = 60.0
+
+
+def unit(*values: float) -> np.ndarray:
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_search_returns_the_most_similar_entry_in_the_same_context() -> None:
+    index = VectorIndex(4)
+    index.add(unit(1, 0, 0), 7, {"body": "x"}, NOW, TTL)
+    index.add(unit(0, 1, 0), 7, {"body": "y"}, NOW, TTL)
+    index.add(unit(1, 0.1, 0), 8, {"body": "other context"}, NOW, TTL)
+
+    row, score = index.search(unit(1, 0.2, 0), 7, NOW)
+    assert row is not None
+    assert index.entries[row] == {"body": "x"}
+    assert 0.9 < score <= 1.0
+
+
+def test_search_misses_without_a_candidate() -> None:
+    index = VectorIndex(2)
+    assert index.search(unit(1, 0), 7, NOW) == (None, 0.0)
+    index.add(unit(1, 0), 7, {}, NOW, TTL)
+    assert index.search(unit(1, 0), 8, NOW) == (None, 0.0)
+    assert index.search(unit(1, 0, 0), 7, NOW) == (None, 0.0)  # other embedding width
+
+
+def test_expired_entries_are_not_found_and_are_reused_first() -> None:
+    index = VectorIndex(2)
+    index.add(unit(1, 0), 7, {"body": "old"}, NOW, TTL)
+    index.add(unit(0, 1), 7, {"body": "kept"}, NOW + 1, TTL)
+    later = NOW + TTL
+    assert index.live(later) == 1
+    row, _ = index.search(unit(1, 0), 7, later)
+    assert row is not None and index.entries[row] == {"body": "kept"}
+
+    index.add(unit(1, 1), 7, {"body": "new"}, later, TTL)
+    assert index.entries[0] == {"body": "new"}
+    assert index.evictions == 0
+
+
+def test_full_index_evicts_the_least_recently_used_entry() -> None:
+    index = VectorIndex(2)
+    index.add(unit(1, 0), 7, {"body": "a"}, NOW, TTL)
+    index.add(unit(0, 1), 7, {"body": "b"}, NOW + 1, TTL)
+    index.touch(0, NOW + 2)
+
+    index.add(unit(1, 1), 7, {"body": "c"}, NOW + 3, TTL)
+    assert [entry["body"] for entry in index.entries if entry] == ["a", "c"]
+    assert index.evictions == 1
+
+
+def test_new_embedding_width_starts_over() -> None:
+    index = VectorIndex(2)
+    index.add(unit(1, 0), 7, {"body": "a"}, NOW, TTL)
+    index.add(unit(1, 0, 0), 7, {"body": "b"}, NOW, TTL)
+    assert index.live(NOW) == 1
+    assert index.search(unit(1, 0, 0), 7, NOW)[1] > 0.99
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable, List
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from models.events import DonePayload, serialize_sse_event
+from models.llm_request import LLMRequest
+
+from api.core.deadline import Deadline
+from api.core.singleflight import SingleFlight
+
+ENDPOINT = "/v1/chat"
+MODEL = "qwen3:8b"
+
+Produce = Callable[[], Awaitable[Response]]
+
+
+def request(stage_id: str, temperature: float = 0.0) -> LLMRequest:
+    return LLMRequest(
+        stage_id=stage_id,
+        system_prompt="You are terse.",
+        user_prompt="Weather in Paris?",
+        model_container="traditional",
+        temperature=[temperature, 0.0],
+    )
+
+
+class Upstream:
+    """Fake dispatch: answers as the stage that reached it first, after `delay` seconds."""
+
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay = delay
+        self.calls: List[str] = []
+
+    def json(self, payload: LLMRequest) -> Produce:
+        async def produce() -> Response:
+            self.calls.append(payload.stage_id)
+            await asyncio.sleep(self.delay)
+            return JSONResponse({"stage_id": f"{payload.stage_id}-tools", "type": "text"})
+
+        return produce
+
+    def stream(self, payload: LLMRequest, stall: float) -> Produce:
+        async def body() -> AsyncIterator[str]:
+            yield serialize_sse_event(
+                id=f"{payload.stage_id}-chunk-0",
+                event="done",
+                data=DonePayload(stage_id=payload.stage_id),
+            )
+            await asyncio.sleep(stall)
+
+        async def produce() -> Response:
+            self.calls.append(payload.stage_id)
+            return StreamingResponse(body(), media_type="text/event-stream")
+
+        return produce
+
+
+async def serve(
+    flights: SingleFlight, payload: LLMRequest, upstream: Upstream, deadline: Deadline
+) -> Response:
+    return await flights.serve(ENDPOINT, payload, MODEL, deadline, upstream.json(payload))
+
+
+async def test_identical_deterministic_requests_share_one_call() -> None:
+    flights, upstream, deadline = SingleFlight(), Upstream(), Deadline()
+    leader, follower = await asyncio.gather(
+        serve(flights, request("a"), upstream, deadline),
+        serve(flights, request("b"), upstream, deadline),
+    )
+
+    assert upstream.calls == ["a"]
+    assert leader.headers["x-singleflight"] == "leader"
+    assert follower.headers["x-singleflight"] == "follower"
+    assert json.loads(bytes(follower.body))["stage_id"] == "b-tools"
+    assert flights.snapshot()["in_flight"] == 0
+
+
+async def test_sampled_requests_are_not_coalesced() -> None:
+    flights, upstream, deadline = SingleFlight(), Upstream(), Deadline()
+    await asyncio.gather(
+        serve(flights, request("a", temperature=0.7), upstream, deadline),
+        serve(flights, request("b", temperature=0.7), upstream, deadline),
+    )
+    assert upstream.calls == ["a", "b"]
+    assert (flights.leaders, flights.followers) == (0, 0)
+
+
+async def test_follower_gives_up_at_its_own_deadline() -> None:
+    flights, upstream = SingleFlight(), Upstream(delay=0.2)
+    leader = asyncio.ensure_future(serve(flights, request("a"), upstream, Deadline(0.05)))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as error:
+        await serve(flights, request("b"), upstream, Deadline(0.05))
+    assert error.value.status_code == 504
+    assert error.value.headers == {"X-Timed-Out-Phase": "coalesced"}
+    assert (await leader).headers["x-singleflight"] == "leader"
+
+
+async def test_streaming_follower_is_restamped_and_cut_off_at_its_deadline() -> None:
+    flights, upstream = SingleFlight(), Upstream()
+    leader_request, follower_request = request("a"), request("b")
+    leader_request.stream = follower_request.stream = True
+    produce = upstream.stream(leader_request, stall=10.0)
+
+    await flights.serve(ENDPOINT, leader_request, MODEL, Deadline(0.05), produce)
+    follower = await flights.serve(ENDPOINT, follower_request, MODEL, Deadline(0.05), produce)
+    assert isinstance(follower, StreamingResponse)
+    events = [event async for event in follower.body_iterator]
+
+    assert upstream.calls == ["a"]
+    assert events[0] == serialize_sse_event(
+        id="b-chunk-0", event="done", data=DonePayload(stage_id="b")
+    )
+    assert "event: error" in str(events[1])
+    assert '"timed_out_phase":"coalesced"' in str(events[1])
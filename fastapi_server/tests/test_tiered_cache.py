@@ -0,0 +1,125 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+from typing import Any, AsyncIterator, Callable, List, Tuple
+
+import pytest
+
+from api.core.cache.memory import MemoryCache
+from api.core.cache.redis import RedisCache
+from api.core.cache.resp import RespClient
+from api.core.cache.tiered import TieredCache
+
+
+def load_stand_in() -> ModuleType:
+    path = Path(__file__).resolve().parents[2] / "scripts" / "resp_cache_server.py"
+    spec = importlib.util.spec_from_file_location("resp_cache_server", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+stand_in = load_stand_in()
+
+
+def without_pttl(server: Any) -> Any:
+    """`server`, but rejecting PTTL and TTL like a proxy that only knows GET."""
+    execute = server.execute
+
+    def rejecting(db: int, args: List[bytes]) -> Tuple[object, int]:
+        if args[0].upper() in (b"PTTL", b"TTL"):
+            return ValueError("unknown command 'PTTL'"), db
+        result: Tuple[object, int] = execute(db, args)
+        return result
+
+    server.execute = rejecting
+    return server
+
+
+Factory = Callable[..., TieredCache]
+
+
+async def serve(server: Any) -> AsyncIterator[Factory]:
+    """Runs `server` on a free port; yields a factory of tiered caches that use it."""
+    caches: List[TieredCache] = []
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    url = f"redis://127.0.0.1:{listener.sockets[0].getsockname()[1]}/0"
+
+    def tiered(l1_ttl: float = 30.0) -> TieredCache:
+        client = RespClient(url, pool_size=2, timeout=1.0, retry_after=1.0)
+        l1 = MemoryCache(max_entries=100, max_bytes=1 << 20, default_ttl=l1_ttl)
+        cache = TieredCache(l1, RedisCache(client, "test", default_ttl=60.0), l1_ttl=l1_ttl)
+        caches.append(cache)
+        return cache
+
+    async with listener:
+        try:
+            yield tiered
+        finally:
+            # Before the server closes: its shutdown waits for every client connection.
+            for cache in caches:
+                await cache.close()
+
+
+@pytest.fixture
+async def tiered() -> AsyncIterator[Factory]:
+    async for factory in serve(stand_in.CacheServer()):
+        yield factory
+
+
+@pytest.fixture
+async def tiered_without_pttl() -> AsyncIterator[Factory]:
+    async for factory in serve(without_pttl(stand_in.CacheServer())):
+        yield factory
+
+
+async def test_l2_hit_is_served_and_copied_into_l1(tiered: Factory) -> None:
+    writer, reader = tiered(), tiered()
+    await writer.set("k", b"value", ttl=60.0)
+
+    assert await reader.get("k") == b"value"
+    assert (reader.l2_hits, reader.l2_errors) == (1, 0)
+    assert await reader.get("k") == b"value"
+    assert reader.l1_hits == 1
+
+
+async def test_l1_copy_expires_with_the_l2_entry(tiered: Factory) -> None:
+    writer, reader = tiered(), tiered()
+    await writer.set("k", b"value", ttl=5.0)
+
+    found = await reader.get_with_ttl("k")
+    assert found is not None
+    _, ttl = found
+    assert ttl is not None and 4.0 < ttl <= 5.0
+    l1_found = await reader.l1.get_with_ttl("k")
+    assert l1_found is not None and l1_found[1] is not None and l1_found[1] <= 5.0
+
+
+async def test_fill_locks_are_shared_through_l2(tiered: Factory) -> None:
+    first, second = tiered(), tiered()
+    assert await first.add("lock:k", b"1", ttl=5.0)
+    assert not await second.add("lock:k", b"1", ttl=5.0)
+    await first.delete("lock:k")
+    assert await second.add("lock:k", b"1", ttl=5.0)
+
+
+async def test_server_without_pttl_still_serves_l2_hits(tiered_without_pttl: Factory) -> None:
+    writer, reader = tiered_without_pttl(l1_ttl=2.0), tiered_without_pttl(l1_ttl=2.0)
+    await writer.set("k", b"value", ttl=60.0)
+
+    assert await reader.get_with_ttl("k") == (b"value", None)
+    assert await reader.get("k") == b"value"
+    assert (reader.l2_hits, reader.l1_hits, reader.l2_errors) == (1, 1, 0)
+    l1_found = await reader.l1.get_with_ttl("k")
+    assert l1_found is not None and l1_found[1] is not None and l1_found[1] <= 2.0
+
+
+async def test_unreachable_l2_falls_back_to_l1() -> None:
+    l1 = MemoryCache(max_entries=10, max_bytes=1 << 20, default_ttl=30.0)
+    client = RespClient("redis://127.0.0.1:1/0", pool_size=1, timeout=1.0, retry_after=1.0)
+    cache = TieredCache(l1, RedisCache(client, "test", default_ttl=60.0), l1_ttl=30.0)
+    await cache.set("k", b"value")
+    assert await cache.get("k") == b"value"
+    assert cache.l2_errors == 1
@@ -0,0 +1,62 @@
+from typing import Any
+
+import pytest
+
+from toolkit.tools.get_weather_tool import GetWeatherTool
+from toolkit.tools.plant_care_tool import PlantCareAdvisorTool
+from toolkit.tools.tool_types import AsyncToolProtocol, ToolProtocol
+from toolkit.utils.tool_call_parts import PartialCall
+from toolkit.utils.tool_registry import ToolRegistry
+
+
+@pytest.fixture
+def registry() -> ToolRegistry:
+    return ToolRegistry([GetWeatherTool()])
+
+
+def call(name: str, arguments: Any = None, **kwargs: Any) -> PartialCall:
+    return PartialCall(id="call_1", name=name, name_complete=True, arguments=arguments, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "partial",
+    [
+        PartialCall(id="call_1", name="get_wea", name_complete=False),
+        call("get_weather", {}),
+        call("get_weather", {"latitude": 52.5}),
+        call("get_weather", {"latitude": 52.5, "longitude": 1}),  # may still be 13.4
+        call("get_weather", {"latitude": 52.5, "longitude": 13.4}, arguments_complete=True),
+    ],
+)
+def test_calls_that_may_still_be_valid_are_not_doomed(
+    registry: ToolRegistry, partial: PartialCall
+) -> None:
+    assert registry.find_doomed_calls([partial]) == {}
+
+
+@pytest.mark.parametrize(
+    "partial, error",
+    [
+        (PartialCall(id="call_1", name="get_pizza", name_complete=False), "Unknown tool"),
+        (call("get_pizza", {}), "Unknown tool"),
+        (call("get_weather", ["latitude"]), "Arguments must be a JSON object"),
+        (call("get_weather", {"city": "Berlin"}), "Unexpected argument: city"),
+        (call("get_weather", {"latitude": "north", "longitude": 1}), "Invalid argument latitude"),
+        (
+            call("get_weather", {"latitude": 52.5}, arguments_complete=True),
+            "Invalid argument longitude",
+        ),
+        (call("get_weather", json_error="Expecting value"), "Expecting value"),
+    ],
+)
+def test_calls_that_can_no_longer_be_valid_are_doomed(
+    registry: ToolRegistry, partial: PartialCall, error: str
+) -> None:
+    doomed = registry.find_doomed_calls([partial])
+    assert doomed["call_1"]["valid"] is False
+    assert error in str(doomed["call_1"]["error"])
+
+
+@pytest.mark.parametrize("tool", [GetWeatherTool(), PlantCareAdvisorTool()])
+def test_http_tools_take_the_async_path(tool: ToolProtocol) -> None:
+    assert isinstance(tool, AsyncToolProtocol)
@@ -0,0 +1,151 @@
+# File: scripts/resp_cache_server.py
+"""
+Local stand-in for a Redis server, for exercising the gateway's shared cache tier
+(CACHE_REDIS_URL) without installing Redis.
+
+Speaks enough of RESP2 for the gateway: PING, AUTH, SELECT, GET, SET [EX|PX] [NX|XX],
+TTL, PTTL, DEL, EXISTS, DBSIZE, FLUSHDB and QUIT. Data lives in memory and is lost on exit.
+
+    poetry run python scripts/resp_cache_server.py --port 6379
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+# key -> (value, expires_at or None)
+Store = Dict[bytes, Tuple[bytes, Optional[float]]]
+
+
+def encode(reply: object) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, bool):
+        return b":%d\r\n" % int(reply)
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, Exception):
+        return b"-ERR %s\r\n" % str(reply).encode("utf-8")
+    return b"+%s\r\n" % str(reply).encode("utf-8")
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split()  # inline command, e.g. from `nc`
+    args = []
+    for _ in range(int(line[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+class CacheServer:
+    def __init__(self) -> None:
+        self.dbs: Dict[int, Store] = {}
+
+    def _live(self, store: Store, key: bytes) -> Optional[bytes]:
+        entry = store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del store[key]
+            return None
+        return value
+
+    def _pttl(self, store: Store, key: bytes) -> int:
+        # Redis semantics: -2 for a missing key, -1 for a key without expiry.
+        if self._live(store, key) is None:
+            return -2
+        expires_at = store[key][1]
+        if expires_at is None:
+            return -1
+        return max(0, int(1000 * (expires_at - time.monotonic())))
+
+    def _set(self, store: Store, args: List[bytes]) -> object:
+        key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+        expires_at: Optional[float] = None
+        if b"EX" in options:
+            expires_at = time.monotonic() + float(args[2 + options.index(b"EX") + 1])
+        if b"PX" in options:
+            expires_at = time.monotonic() + float(args[2 + options.index(b"PX") + 1]) / 1000
+        exists = self._live(store, key) is not None
+        if (b"NX" in options and exists) or (b"XX" in options and not exists):
+            return None
+        store[key] = (value, expires_at)
+        return "OK"
+
+    def execute(self, db: int, args: List[bytes]) -> Tuple[object, int]:
+        name, args = args[0].upper(), args[1:]
+        store = self.dbs.setdefault(db, {})
+        if name == b"PING":
+            return (args[0] if args else "PONG"), db
+        if name == b"AUTH":
+            return "OK", db
+        if name == b"SELECT":
+            return "OK", int(args[0])
+        if name == b"GET":
+            return self._live(store, args[0]), db
+        if name == b"SET":
+            return self._set(store, args), db
+        if name == b"PTTL":
+            return self._pttl(store, args[0]), db
+        if name == b"TTL":
+            pttl = self._pttl(store, args[0])
+            return (pttl if pttl < 0 else (pttl + 500) // 1000), db
+        if name == b"DEL":
+            return sum(store.pop(k, None) is not None for k in args), db
+        if name == b"EXISTS":
+            return sum(self._live(store, k) is not None for k in args), db
+        if name == b"DBSIZE":
+            return sum(self._live(store, k) is not None for k in list(store)), db
+        if name == b"FLUSHDB":
+            store.clear()
+            return "OK", db
+        return ValueError(f"unknown command '{name.decode('utf-8', 'replace')}'"), db
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        db = 0
+        try:
+            while True:
+                args = await read_command(reader)
+                if not args:
+                    break
+                if args[0].upper() == b"QUIT":
+                    writer.write(encode("OK"))
+                    break
+                try:
+                    reply, db = self.execute(db, args)
+                except (IndexError, ValueError) as e:
+                    reply = ValueError(f"bad arguments: {e}")
+                writer.write(encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int) -> None:
+    server = await asyncio.start_server(CacheServer().handle, host, port)
+    print(f"🗄️  RESP cache stand-in listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Redis-protocol cache stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
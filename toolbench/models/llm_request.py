@@ -3,7 +3,7 @@
 import os
 import uuid
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
@@ -49,6 +49,7 @@ class LLMRequest(BaseModel):
     model_container: ModelContainer
     stream: bool = False
     synthesis: bool| None = False
+    deadline_ms: Optional[int] = None
 
     max_tokens: List[int] = Field(
         default=[1024, 1024], min_length=2, max_length=2
@@ -90,6 +91,7 @@ def to_toolchain_request(stage: ToolchainModelStage, stage_id: str) -> Tuple[LLM
         synthesis=synthesis,
         max_tokens=max_tokens,
         temperature=temperature,
+        deadline_ms=stage.deadline_ms,
     )
 
     return request, endpoint_url
@@ -25,6 +25,7 @@ class ToolchainModelStage(BaseModel):
     prompt_tool_spec: ToolchainPromptSpec
     prompt_synthesis_spec: Optional[ToolchainPromptSpec] = None
     synthesis: bool | None = False
+    deadline_ms: Optional[int] = None  # end-to-end budget enforced by the gateway
 
 
 class ToolchainTestCase(BaseModel):
@@ -10,6 +10,15 @@ from models.stage_http_output import (
     StageInfo,
 )
 
+DEFAULT_TIMEOUT = 90.0
+DEADLINE_GRACE = 5.0  # the gateway enforces the deadline; leave room for its timeout response
+
+
+def _client_timeout(request: LLMRequest) -> float:
+    if request.deadline_ms is None:
+        return DEFAULT_TIMEOUT
+    return request.deadline_ms / 1000 + DEADLINE_GRACE
+
 
 async def execute_toolchain_stage(
     request: LLMRequest,
@@ -22,7 +31,7 @@ async def execute_toolchain_stage(
     if request.stream:
 
         async def sse_line_stream() -> AsyncGenerator[str, None]:
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with httpx.AsyncClient(timeout=_client_timeout(request)) as client:
                 async with client.stream(
                     "POST", endpoint_override, json=request.model_dump()
                 ) as resp:
@@ -32,7 +41,7 @@ async def execute_toolchain_stage(
 
         return sse_line_stream()
 
-    async with httpx.AsyncClient(timeout=90.0) as client:
+    async with httpx.AsyncClient(timeout=_client_timeout(request)) as client:
         return await _non_streaming_stage(client, request, endpoint_override)
 
 